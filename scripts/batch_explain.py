@@ -1,11 +1,12 @@
 import argparse
 import pandas as pd
 import joblib
-from src.explain.explainer import ModelExplainer
-from src.utils.config import load_config
+from excrypto.explain.explainer import ModelExplainer
+from excrypto.explain.store import ShapStore
+from excrypto.utils.config import load_cfg
 
-def main(window, config_path):
-    config = load_config(config_path)
+def main(window, config_path, workers, chunk_rows, plot_rows, symbol, store, full, budget, rel_tol):
+    config = load_cfg(config_path)
     df = pd.read_csv(config["features_path"], index_col="open_time", parse_dates=True)
     df = df.dropna()
 
@@ -13,13 +14,35 @@ def main(window, config_path):
         df = df.tail(window)
 
     model = joblib.load(config["model_path"])
-    explainer = ModelExplainer(model, config["features"])
-    explainer.explain_global(df)
+    symbol = symbol or config.get("symbol")
+    if full or budget is not None:
+        explainer = ModelExplainer(model, config["features"], model_path=config["model_path"])
+        explainer.explain_global(df, workers=workers, chunk_rows=chunk_rows, plot_rows=plot_rows, symbol=symbol,
+                                 budget=budget, rel_tol=rel_tol)
+        return
+
+    # only rows newer than the store's high-water mark are explained
+    stats = ShapStore(store).append(model, df, config["features"], model_path=config["model_path"],
+                                    symbol=symbol, workers=workers, chunk_rows=chunk_rows)
+    print(f"✅ Appended SHAP values for {stats['rows_new']} new rows to {store} "
+          f"({stats['rows_skipped']} already explained, {stats['seconds']}s)")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("--window", type=int, help="Number of most recent rows to explain")
+    parser.add_argument("--window", type=int, help="Number of most recent rows to consider")
     parser.add_argument("--config", default="config/config.yaml", help="Path to config file")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (-1 = all cores)")
+    parser.add_argument("--chunk-rows", type=int, default=4096, help="Rows per SHAP chunk / parquet part")
+    parser.add_argument("--plot-rows", type=int, default=5000, help="Random rows used for the --full summary plots")
+    parser.add_argument("--symbol", help="Symbol key for rows without a 'symbol' column")
+    parser.add_argument("--store", default="plots/shap_store", help="Incremental SHAP store directory")
+    parser.add_argument("--full", action="store_true",
+                        help="Recompute every row into plots/shap_values/ plus summary plots instead")
+    parser.add_argument("--budget", type=float,
+                        help="Global importance from a stratified sample within this many seconds (with CIs)")
+    parser.add_argument("--rel-tol", type=float, default=0.05,
+                        help="Stop sampling once every CI half-width is within this fraction of its estimate")
     args = parser.parse_args()
 
-    main(args.window, args.config)
+    main(args.window, args.config, args.workers, args.chunk_rows, args.plot_rows, args.symbol,
+         args.store, args.full, args.budget, args.rel_tol)
@@ -0,0 +1,71 @@
+"""
+Batched SHAP engine vs the old one-shot generic explainer.
+
+    python scripts/bench_explain.py --rows 20000,200000 --workers 1,4
+
+Per row count: seconds of `shap.Explainer(model)(X)` on the whole frame (skipped above
+--legacy-max rows) and of explain_frame (TreeExplainer fast path, chunked, parquet output)
+per worker count, plus the max absolute difference between the two.
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import shap
+from sklearn.ensemble import RandomForestClassifier
+
+from excrypto.explain.engine import explain_frame, positive_class, read_shap
+
+FEATURES = [f"f{i}" for i in range(12)]
+
+
+def _ints(s: str) -> list[int]:
+    return [int(x) for x in s.split(",") if x.strip()]
+
+
+def _frame(n: int) -> tuple[pd.DataFrame, np.ndarray]:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(n, len(FEATURES))), columns=FEATURES)
+    df.insert(0, "timestamp", pd.date_range("2024-01-01", periods=n, freq="min", tz="UTC"))
+    df.insert(1, "symbol", "BTC/USDT")
+    y = (df["f0"] + 0.5 * df["f1"] - df["f2"] + rng.normal(0, 0.5, n) > 0).astype(int).to_numpy()
+    return df, y
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rows", type=_ints, default=[20_000, 200_000])
+    ap.add_argument("--workers", type=_ints, default=[1, 2])
+    ap.add_argument("--chunk-rows", type=int, default=4096)
+    ap.add_argument("--trees", type=int, default=100)
+    ap.add_argument("--legacy-max", type=int, default=50_000, help="largest frame run through shap.Explainer")
+    args = ap.parse_args()
+
+    train, y = _frame(20_000)
+    model = RandomForestClassifier(n_estimators=args.trees, max_depth=8, n_jobs=-1, random_state=0)
+    model.fit(train[FEATURES], y)
+
+    print(f"{'rows':>9} {'mode':>12} {'seconds':>9} {'rows/s':>10} {'max|diff|':>10}")
+    for n in args.rows:
+        df, _ = _frame(n)
+        legacy = None
+        if n <= args.legacy_max:
+            t0 = time.perf_counter()
+            legacy, _ = positive_class(shap.Explainer(model)(df[FEATURES]), None)
+            dt = time.perf_counter() - t0
+            print(f"{n:>9} {'legacy':>12} {dt:>9.2f} {n / dt:>10.0f} {'':>10}")
+        for w in args.workers:
+            with tempfile.TemporaryDirectory() as tmp:
+                run = explain_frame(model, df, FEATURES, Path(tmp) / "shap", chunk_rows=args.chunk_rows, workers=w)
+                diff = ""
+                if legacy is not None:
+                    got = read_shap(run.root)[FEATURES].to_numpy()  # single symbol: already in row order
+                    diff = f"{np.abs(got - legacy).max():.1e}"
+            print(f"{n:>9} {f'engine w={w}':>12} {run.seconds:>9.2f} {n / run.seconds:>10.0f} {diff:>10}")
+
+
+if __name__ == "__main__":
+    main()
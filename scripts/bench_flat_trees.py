@@ -0,0 +1,68 @@
+"""
+Latency of the flattened tree evaluator against the library predict_proba.
+
+    python scripts/bench_flat_trees.py --batches 1,100,100000 --kinds rf,lgbm
+
+Per batch size: median seconds per call (over --repeats), rows/s, and the max absolute
+difference between the two predict_proba outputs.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+from excrypto.ml.flat_trees import flatten_model
+from excrypto.ml.models_lgbm import LGBMNativeClassifier
+
+
+def _ints(s: str) -> list[int]:
+    return [int(x) for x in s.split(",") if x.strip()]
+
+
+def _median_seconds(fn, X, repeats: int) -> float:
+    ts = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn(X)
+        ts.append(time.perf_counter() - t0)
+    return float(np.median(ts))
+
+
+def _fit(kind: str, X: pd.DataFrame, y: np.ndarray, trees: int):
+    if kind == "rf":
+        return RandomForestClassifier(n_estimators=trees, max_depth=12, n_jobs=1, random_state=0).fit(X, y)
+    if kind == "lgbm":
+        return LGBMNativeClassifier.make(num_boost_round=trees, num_threads=1).fit(X, y)
+    raise ValueError(kind)
+
+
+def main(batches: list[int], kinds: list[str], trees: int, n_features: int, train_rows: int, repeats: int):
+    rng = np.random.default_rng(0)
+    cols = [f"f{i}" for i in range(n_features)]
+    X_train = pd.DataFrame(rng.normal(size=(train_rows, n_features)), columns=cols)
+    y = (X_train["f0"] + 0.5 * X_train["f1"] + rng.normal(0, 1, train_rows) > 0).astype(int).to_numpy()
+    print(f"{'kind':>6}{'batch':>9}{'lib_s':>12}{'flat_s':>12}{'speedup':>9}{'flat_rows/s':>14}{'max_diff':>11}")
+    for kind in kinds:
+        model = _fit(kind, X_train, y, trees)
+        flat = flatten_model(model)
+        for b in batches:
+            X = pd.DataFrame(rng.normal(size=(b, n_features)), columns=cols)
+            reps = repeats if b < 10_000 else max(1, repeats // 10)
+            t_lib = _median_seconds(model.predict_proba, X, reps)
+            t_flat = _median_seconds(flat.predict_proba, X, reps)
+            diff = float(np.abs(model.predict_proba(X) - flat.predict_proba(X)).max())
+            print(f"{kind:>6}{b:>9}{t_lib:>12.6f}{t_flat:>12.6f}{t_lib / t_flat:>8.1f}x{b / t_flat:>14.0f}{diff:>11.1e}")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--batches", type=_ints, default=[1, 100, 100_000])
+    ap.add_argument("--kinds", type=lambda s: s.split(","), default=["rf", "lgbm"])
+    ap.add_argument("--trees", type=int, default=100)
+    ap.add_argument("--features", type=int, default=20)
+    ap.add_argument("--train-rows", type=int, default=20_000)
+    ap.add_argument("--repeats", type=int, default=50)
+    a = ap.parse_args()
+    main(a.batches, a.kinds, a.trees, a.features, a.train_rows, a.repeats)
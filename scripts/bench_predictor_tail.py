@@ -0,0 +1,83 @@
+"""
+Latest-bar feature latency of CryptoPredictor, tail mode vs full history.
+
+    python scripts/bench_predictor_tail.py --history 10000,100000,1000000
+
+Per history length: median seconds of load_latest_features (read + featurize) in each mode
+and the max absolute difference between the two feature rows.
+"""
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import yaml
+from sklearn.linear_model import LogisticRegression
+
+from excrypto.inference import CryptoPredictor
+
+SPECS = [
+    {"name": "log_returns", "input_cols": ["close"], "output_col": "ret_log"},
+    {"name": "rolling_volatility", "input_cols": ["ret_log"], "output_col": "vol_30", "params": {"window": 30}},
+    {"name": "rsi", "input_cols": ["close"], "output_col": "rsi_14", "params": {"window": 14}},
+    {"name": "macd", "input_cols": ["close"], "output_col": "macd_hist"},
+]
+FEATURES = [s["output_col"] for s in SPECS]
+
+
+def _ints(s: str) -> list[int]:
+    return [int(x) for x in s.split(",") if x.strip()]
+
+
+def _median_seconds(pred: CryptoPredictor, repeats: int) -> tuple[float, pd.DataFrame]:
+    ts, X = [], None
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        X = pred.load_latest_features()
+        ts.append(time.perf_counter() - t0)
+    return float(np.median(ts)), X
+
+
+def _predictor(root: Path, n: int) -> CryptoPredictor:
+    rng = np.random.default_rng(0)
+    pd.DataFrame({
+        "open_time": pd.date_range("2020-01-01", periods=n, freq="min"),
+        "close": 100 + np.cumsum(rng.normal(0, 0.1, n)),
+    }).to_csv(root / "prices.csv", index=False)
+    model = LogisticRegression().fit(rng.normal(size=(50, len(FEATURES))), rng.integers(0, 2, 50))
+    joblib.dump(model, root / "model.joblib")
+    (root / "model_meta.json").write_text(json.dumps({"features": FEATURES}))
+    cfg = {
+        "model_path": str(root / "model.joblib"),
+        "data_path": str(root / "prices.csv"),
+        "features": {"specs": SPECS},
+        "logging": {"log_path": str(root / "inference_log.jsonl"), "explain": False},
+    }
+    (root / "predict.yaml").write_text(yaml.safe_dump(cfg))
+    return CryptoPredictor(config_path=str(root / "predict.yaml"))
+
+
+def main(history: list[int], repeats: int):
+    print(f"{'history':>10}{'rows_read':>11}{'tail_s':>11}{'full_s':>11}{'speedup':>10}{'max_diff':>11}")
+    for n in history:
+        with tempfile.TemporaryDirectory() as d:
+            pred = _predictor(Path(d), n)
+            pred.tail = True
+            t_tail, X_tail = _median_seconds(pred, repeats)
+            rows = pred.last_feature_stats["rows_read"]
+            pred.tail = False
+            t_full, X_full = _median_seconds(pred, max(1, repeats // 5))
+            diff = float(np.abs(X_tail.to_numpy() - X_full.to_numpy()).max())
+            print(f"{n:>10}{rows:>11}{t_tail:>11.5f}{t_full:>11.5f}{t_full / t_tail:>9.1f}x{diff:>11.1e}")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--history", default="10000,100000,1000000", help="comma-separated history lengths")
+    ap.add_argument("--repeats", type=int, default=20)
+    a = ap.parse_args()
+    main(_ints(a.history), a.repeats)
@@ -0,0 +1,67 @@
+"""
+Benchmark the vectorized triple-barrier labeler over a horizon x length grid.
+
+    python scripts/bench_triple_barrier.py --lengths 10000,100000,500000 --horizons 6,24,96,288
+
+Use --with-loop to also time the per-bar Python reference (slow for long series).
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from excrypto.labels.labelers import triple_barrier
+
+
+def loop_reference(price: pd.Series, horizon: int, up_mult=2.0, dn_mult=2.0, vol_window=50) -> np.ndarray:
+    p = price.astype(float)
+    vol = np.log(p).diff().rolling(vol_window, min_periods=max(5, vol_window // 5)).std(ddof=0).ffill().fillna(0.0)
+    p_arr, v_arr = p.to_numpy(), vol.to_numpy()
+    out = np.zeros(len(p_arr), dtype=int)
+    for i in range(max(0, len(p_arr) - horizon)):
+        up, dn = p_arr[i] * np.exp(up_mult * v_arr[i]), p_arr[i] * np.exp(-dn_mult * v_arr[i])
+        path = p_arr[i + 1 : i + horizon + 1]
+        hu, hd = path >= up, path <= dn
+        iu = int(np.argmax(hu)) if hu.any() else None
+        idn = int(np.argmax(hd)) if hd.any() else None
+        if iu is not None and idn is not None:
+            out[i] = 1 if iu < idn else -1
+        elif iu is not None or idn is not None:
+            out[i] = 1 if iu is not None else -1
+        else:
+            out[i] = int(np.sign(np.log(p_arr[i + horizon]) - np.log(p_arr[i])))
+    return out
+
+
+def _ints(s: str) -> list[int]:
+    return [int(x) for x in s.split(",") if x.strip()]
+
+
+def main(lengths: list[int], horizons: list[int], with_loop: bool):
+    rng = np.random.default_rng(0)
+    print(f"{'length':>10}{'horizon':>9}{'vector_s':>10}{'loop_s':>9}{'speedup':>9}")
+    for n in lengths:
+        price = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 1e-3, n))))
+        for h in horizons:
+            t0 = time.perf_counter()
+            vec = triple_barrier(price, horizon=h).to_numpy()
+            t_vec = time.perf_counter() - t0
+            if with_loop:
+                t0 = time.perf_counter()
+                ref = loop_reference(price, h)
+                t_loop = time.perf_counter() - t0
+                assert np.array_equal(vec, ref), f"mismatch at n={n} h={h}"
+                print(f"{n:>10}{h:>9}{t_vec:>10.3f}{t_loop:>9.3f}{t_loop / t_vec:>8.1f}x")
+            else:
+                print(f"{n:>10}{h:>9}{t_vec:>10.3f}{'-':>9}{'-':>9}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lengths", default="10000,100000", help="Comma-separated series lengths")
+    parser.add_argument("--horizons", default="6,24,96,288", help="Comma-separated horizons")
+    parser.add_argument("--with-loop", action="store_true", help="Also time (and check) the per-bar loop")
+    args = parser.parse_args()
+
+    main(_ints(args.lengths), _ints(args.horizons), args.with_loop)
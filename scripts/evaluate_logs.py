@@ -1,13 +1,12 @@
-import json
 import pandas as pd
 import matplotlib.pyplot as plt
 import os
 from src.eval.evaluator import Evaluator
+from excrypto.inference.outcomes import read_outcomes
 
 def load_logs(path="logs/inference_log.jsonl"):
-    with open(path, "r") as f:
-        lines = [json.loads(line) for line in f]
-    return pd.DataFrame(lines)
+    # every rotated/compacted segment, oldest first, with reconciled actuals joined on
+    return read_outcomes(path)
 
 if __name__ == "__main__":
     df = load_logs()
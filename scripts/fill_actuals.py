@@ -1,41 +1,16 @@
 import json
 import pandas as pd
-from datetime import datetime
+
+from excrypto.inference.outcomes import reconcile
 
 LOG_PATH = "logs/inference_log.jsonl"
 FEATURES_PATH = "data/features.csv"
 
-def load_logs(path=LOG_PATH):
-    with open(path, "r") as f:
-        return [json.loads(line) for line in f]
-
-def save_logs(logs, path=LOG_PATH):
-    with open(path, "w") as f:
-        for entry in logs:
-            f.write(json.dumps(entry) + "\n")
-
-def match_actuals(logs, df):
-    df = df.copy()
-    df["target"] = (df["close"].shift(-1) > df["close"]).astype(int)
-    df = df.dropna()
-
-    for log in logs:
-        if log.get("actual") is not None:
-            continue  # skip already filled
-
-        ts = pd.to_datetime(log["timestamp"])
-        closest = df.index[df.index.get_loc(ts, method="nearest")]
-
-        if abs((ts - closest).total_seconds()) > 3600:
-            continue  # skip if too far
-
-        log["actual"] = int(df.loc[closest, "target"])
-
-    return logs
-
 if __name__ == "__main__":
-    df = pd.read_csv(FEATURES_PATH, index_col="open_time", parse_dates=True)
-    logs = load_logs()
-    logs = match_actuals(logs, df)
-    save_logs(logs)
-    print("✅ Filled actual values in inference logs.")
+    # one merge_asof for all pending predictions; the log is never rewritten, outcomes and
+    # running metrics go to logs/inference_log.outcomes/ (see excrypto.inference.outcomes)
+    df = pd.read_csv(FEATURES_PATH, parse_dates=["open_time"])
+    summary = reconcile(LOG_PATH, df, tolerance="1h", direction="nearest")
+    print(f"✅ Resolved {summary['resolved']} predictions ({summary['pending']} pending, "
+          f"{summary['expired']} expired).")
+    print(json.dumps({k: v for k, v in summary.items() if k != "calibration"}, indent=2))
@@ -0,0 +1,103 @@
+"""
+Load generator for `excrypto serve`: N concurrent keep-alive clients posting /predict.
+
+    excrypto serve --model runs/<snapshot>/ml/latest_manifest.json &
+    python scripts/loadgen_serve.py --concurrency 1,8,64 --requests 2000
+
+Per concurrency level: client-side p50/p99 latency and requests/s, then the server's own
+/metrics (batches, mean rows per batch, server-side p50/p99). Feature names come from
+--features, or random rows are built for the columns the server reports missing.
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+
+async def _request(reader, writer, method: str, path: str, payload=None) -> tuple[int, dict]:
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: x\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    n = 0
+    while True:
+        h = await reader.readline()
+        if h in (b"\r\n", b""):
+            break
+        k, _, v = h.decode().partition(":")
+        if k.lower() == "content-length":
+            n = int(v)
+    return status, json.loads(await reader.readexactly(n))
+
+
+async def _client(host, port, rows_fn, n_requests, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(n_requests):
+            t0 = time.perf_counter()
+            status, out = await _request(reader, writer, "POST", "/predict", {"rows": rows_fn()})
+            if status != 200:
+                raise RuntimeError(out)
+            latencies.append(time.perf_counter() - t0)
+    finally:
+        writer.close()
+
+
+async def _discover_features(host, port) -> list[str]:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        _, out = await _request(reader, writer, "POST", "/predict", {"rows": [{}]})
+    finally:
+        writer.close()
+    msg = out.get("error", "")
+    return json.loads(msg.split("missing features: ", 1)[1].replace("'", '"')) if "missing features" in msg else []
+
+
+async def _metrics(host, port) -> dict:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        return (await _request(reader, writer, "GET", "/metrics"))[1]
+    finally:
+        writer.close()
+
+
+async def main(host: str, port: int, concurrency: list[int], requests: int, rows: int, features: list[str]):
+    features = features or await _discover_features(host, port)
+    rng = np.random.default_rng(0)
+
+    def rows_fn():
+        return [dict(zip(features, rng.normal(size=len(features)).tolist())) for _ in range(rows)]
+
+    print(f"{'conc':>6}{'requests':>10}{'p50_ms':>9}{'p99_ms':>9}{'rps':>10}"
+          f"{'srv_batches':>13}{'rows/batch':>12}{'srv_p99_ms':>12}")
+    for c in concurrency:
+        before = await _metrics(host, port)
+        lat: list[float] = []
+        per = max(1, requests // c)
+        t0 = time.perf_counter()
+        await asyncio.gather(*[_client(host, port, rows_fn, per, lat) for _ in range(c)])
+        wall = time.perf_counter() - t0
+        after = await _metrics(host, port)
+        batches = after["batches"] - before["batches"]
+        srv_rows = after["rows"] - before["rows"]
+        a = np.asarray(lat) * 1e3
+        print(f"{c:>6}{len(lat):>10}{np.percentile(a, 50):>9.2f}{np.percentile(a, 99):>9.2f}{len(lat) / wall:>10.0f}"
+              f"{batches:>13}{srv_rows / max(batches, 1):>12.1f}{after['p99_ms']:>12.2f}")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--concurrency", default="1,8,64", help="comma-separated client counts")
+    ap.add_argument("--requests", type=int, default=2000, help="requests per concurrency level")
+    ap.add_argument("--rows", type=int, default=1, help="rows per request")
+    ap.add_argument("--features", default="", help="comma-separated feature names (default: ask the server)")
+    a = ap.parse_args()
+    asyncio.run(main(a.host, a.port, [int(x) for x in a.concurrency.split(",") if x.strip()],
+                     a.requests, a.rows, [x for x in a.features.split(",") if x.strip()]))
@@ -2,18 +2,21 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import os
 
-def plot_shap_trends(csv_path="plots/shap_values.csv", out_path="plots/shap_trends.png"):
-    df = pd.read_csv(csv_path, index_col=0, parse_dates=True)
+from excrypto.explain.store import ShapStore
+
+def plot_shap_trends(store_dir="plots/shap_store", out_path="plots/shap_trends.png", freq="day",
+                     rolling=None, start=None, end=None, symbols=None):
+    """Mean |SHAP| per feature per hour/day/week, read from the store's pre-aggregated tables."""
+    df = ShapStore(store_dir).importance(freq, start=start, end=end, symbols=symbols, rolling=rolling)
 
     plt.figure(figsize=(10, 6))
     for col in df.columns:
         plt.plot(df.index, df[col], label=col)
 
-    plt.axhline(0, color="gray", linestyle="--", linewidth=1)
     plt.legend(loc="upper right")
-    plt.title("SHAP Value Trends Over Time")
+    plt.title(f"Mean |SHAP| per {freq}" + (f" (rolling {rolling})" if rolling else ""))
     plt.xlabel("Timestamp")
-    plt.ylabel("SHAP Value")
+    plt.ylabel("Mean |SHAP|")
     plt.tight_layout()
 
     os.makedirs(os.path.dirname(out_path), exist_ok=True)
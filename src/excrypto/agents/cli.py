@@ -24,6 +24,7 @@ def daily(
     labels_cfg:   Annotated[Path | None, typer.Option("--labels-cfg",   exists=True, dir_okay=False)] = None,
     ml_train_cfg: Annotated[Path | None, typer.Option("--ml-train-cfg", exists=True, dir_okay=False)] = None,
     runs_root:    Annotated[Path, typer.Option("--runs-root")] = Path("runs"),
+    incremental:  Annotated[bool, typer.Option("--incremental", help="Warm-start from the previous snapshot's model")] = False,
 ):
     run_daily(
         snapshot or None,
@@ -35,6 +36,7 @@ def daily(
         labels_cfg=labels_cfg,
         ml_train_cfg=ml_train_cfg,
         runs_root=runs_root,
+        incremental=incremental,
     )
 
 @app.command("range")
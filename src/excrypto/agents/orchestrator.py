@@ -38,6 +38,7 @@ class Plan:
     labels_kind: str
     ml_config: Path | None
     ml_threshold: float
+    workers: int
 
 
 def _load_plan(config_path: Path) -> Plan:
@@ -59,6 +60,7 @@ def _load_plan(config_path: Path) -> Plan:
 
     runs_root = Path(cfg.get("runs_root", "runs"))
     nan_policy = str(cfg.get("nan_policy", "drop_any"))
+    workers = int(cfg.get("workers", 1))
 
     features_config = cfg.get("features", {}).get("config")
     labels_section = cfg.get("labels", {})
@@ -83,6 +85,7 @@ def _load_plan(config_path: Path) -> Plan:
         labels_kind=labels_kind,
         ml_config=Path(ml_config) if ml_config else None,
         ml_threshold=ml_threshold,
+        workers=workers,
     )
 
 
@@ -139,6 +142,7 @@ def run_plan(config_path: Path) -> None:
         "--timeframe", plan.timeframe,
         "--runs-root", str(plan.runs_root),
         "--nan-policy", plan.nan_policy,
+        "--workers", str(plan.workers),
     ]
     if plan.features_config:
         feat_cmd += ["--config", str(plan.features_config)]
@@ -154,6 +158,7 @@ def run_plan(config_path: Path) -> None:
         "--runs-root", str(plan.runs_root),
         "--nan-policy", plan.nan_policy,
         "--kind", plan.labels_kind,
+        "--workers", str(plan.workers),
     ]
     if plan.labels_config:
         lbl_cmd += ["--config", str(plan.labels_config)]
@@ -167,6 +172,7 @@ def run_plan(config_path: Path) -> None:
         "--exchange", plan.exchange,
         "--timeframe", plan.timeframe,
         "--runs-root", str(plan.runs_root),
+        "--fold-workers", str(plan.workers),
     ]
     if plan.ml_config:
         train_cmd += ["--config", str(plan.ml_config)]
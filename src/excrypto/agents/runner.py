@@ -57,6 +57,19 @@ def _latest_model_manifest(runs_root: Path, snapshot: str, timeframe: str, syms:
             best, best_key = (man if man else None), key
     return best
 
+def _previous_ml_manifest(runs_root: Path, snapshot: str, timeframe: str, syms: List[str]) -> Path | None:
+    """Latest ML model manifest of the most recent earlier snapshot (parent for incremental retrains)."""
+    uni = RunPaths(snapshot, "ml", tuple(syms), timeframe, params=None, runs_root=runs_root).universe
+    if not runs_root.exists():
+        return None
+    for snap in sorted((d.name for d in runs_root.iterdir() if d.is_dir() and d.name < snapshot), reverse=True):
+        ptr = runs_root / snap / "ml" / timeframe / uni / "latest_manifest.json"
+        if ptr.exists():
+            man = Path(json.loads(ptr.read_text())["paths"]["manifest"])
+            if man.exists():
+                return man
+    return None
+
 def _make_temp_ml_cfg(ml_train_cfg: Path, snapshot: str, timeframe: str, syms: list[str]) -> Path:
     cfg = load_cfg(ml_train_cfg)
     cfg.setdefault("dataset", {})
@@ -82,8 +95,12 @@ def run_daily(
     labels_cfg: Path | None = None,
     ml_train_cfg: Path | None = None,
     runs_root: Path = Path("runs"),
+    incremental: bool = False,
 ):
-    """Daily agent: snapshot → baselines → (optional) features/labels → ML train+predict."""
+    """
+    Daily agent: snapshot → baselines → (optional) features/labels → ML train+predict.
+    incremental=True warm-starts from the previous snapshot's model when there is one.
+    """
     snap = snapshot or datetime.now(timezone.utc).strftime("%Y-%m-%d")
     syms = _parse_symbols(symbols)
     mom_params = mom_params or {"fast": "20", "slow": "60"}
@@ -136,7 +153,12 @@ def run_daily(
         ds = mlcfg.get("dataset", {})
         if (ds.get("snapshot") != snap) or (ds.get("timeframe") != "1m") or (ds.get("symbols") != syms):
             print("[agent] warning: ml train config dataset != agent args")
-        sh(["excrypto","ml","train","--config", str(ml_train_cfg)])
+        train_cmd = ["excrypto","ml","train","--config", str(ml_train_cfg)]
+        parent = _previous_ml_manifest(runs_root, snap, "1m", syms) if incremental else None
+        if parent is not None:
+            print(f"[agent] incremental retrain from {parent}")
+            train_cmd += ["--parent", str(parent)]
+        sh(train_cmd)
 
         # predict (use latest manifest under the run root)
         model = mlcfg.get("model","rf")
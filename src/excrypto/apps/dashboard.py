@@ -40,13 +40,16 @@ st.image("plots/latest_shap_explanation.png")
 st.subheader("📈 Accuracy Trend")
 st.image("plots/accuracy_trend.png")
 
-# SHAP value trends over time
-st.subheader("📉 SHAP Value Trends")
+# SHAP importance trends over time (pre-aggregated by the SHAP store)
+st.subheader("📉 SHAP Importance Trends")
 
-shap_csv_path = "plots/shap_values.csv"
-if os.path.exists(shap_csv_path):
-    df_shap = pd.read_csv(shap_csv_path, index_col=0, parse_dates=True)
-    st.line_chart(df_shap)
+shap_store = "plots/shap_store"
+if os.path.exists(os.path.join(shap_store, "state.json")):
+    from excrypto.explain.store import ShapStore
+    store = ShapStore(shap_store)
+    freq = st.selectbox("Bucket", ["hour", "day", "week"], index=1)
+    st.line_chart(store.importance(freq))
+    st.bar_chart(store.global_importance())
 else:
     st.warning("No SHAP values found. Run batch explanation to generate them.")
 
@@ -1,31 +1,67 @@
 # src/excrypto/cli.py
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
 import typer
-from excrypto.data.cli import app as data_app
-from excrypto.training.cli import app as training_app
-from excrypto.inference.cli import app as inference_app
-from excrypto.baseline.cli import app as baseline_app
-from excrypto.backtest.cli import app as backtest_app
-from excrypto.risk.cli import app as risk_app
-from excrypto.agents.cli import app as agents_app
-from excrypto.features.cli import app as feature_app
-from excrypto.labels.cli import app as labels_app
-from excrypto.ml.cli import app as ml_app
-from excrypto.viz.cli import app as viz_app
-#from excrypto.runner.cli import app as runner_app
-
-app = typer.Typer(help="Explainable Crypto AI")
-app.add_typer(data_app, name="data")
-app.add_typer(training_app, name="train")
-app.add_typer(inference_app, name="predict")
-app.add_typer(baseline_app, name="baseline")
-app.add_typer(backtest_app, name="backtest")
-app.add_typer(risk_app, name="risk")
-app.add_typer(agents_app, name="agents")
-app.add_typer(feature_app, name='features')
-app.add_typer(labels_app, name='labels')
-app.add_typer(ml_app, name='ml')
-app.add_typer(viz_app, name='viz')
-#app.add_typer(runner_app, name="run")
+from typer.core import TyperCommand, TyperGroup
+
+# name -> (module defining `app`, one-line help). Sub-apps are imported only when their
+# command runs: `excrypto --help` or `excrypto data ...` never pays for lightgbm/sklearn/shap.
+SUBCOMMANDS: dict[str, tuple[str, str]] = {
+    "data": ("excrypto.data.cli", "Data pipeline: raw snapshots + helpers"),
+    "train": ("excrypto.training.cli", "Model training"),
+    "predict": ("excrypto.inference.cli", "Inference / prediction"),
+    "baseline": ("excrypto.baseline.cli", "Baselines: generate signals + manifest"),
+    "backtest": ("excrypto.backtest.cli", "Backtest engine (prices + signals → PnL)"),
+    "risk": ("excrypto.risk.cli", "Risk reports from PnL series"),
+    "agents": ("excrypto.agents.cli", "Agentic workflows"),
+    "features": ("excrypto.features.cli", "Feature builds from snapshot panels"),
+    "labels": ("excrypto.labels.cli", "Labels: fixed-horizon and triple-barrier"),
+    "ml": ("excrypto.ml.cli", "ML: train/predict"),
+    "viz": ("excrypto.viz.cli", "Visualization helpers"),
+    "serve": ("excrypto.serve.cli", "Long-lived local scoring service"),
+    # "run": ("excrypto.runner.cli", "..."),
+}
+
+
+def load_subcommand(name: str) -> TyperGroup:
+    module, _ = SUBCOMMANDS[name]
+    sub = importlib.import_module(module).app
+    cmd = typer.main.get_group(sub)
+    cmd.name = name
+    return cmd
+
+
+class LazyGroup(TyperGroup):
+    """
+    Root group whose sub-apps are placeholders until resolved. Help listings only need the
+    name and help line; resolve_command (invocation, shell completion) swaps in the real group.
+    """
+
+    def list_commands(self, ctx: Any) -> list[str]:
+        return [*super().list_commands(ctx), *(n for n in SUBCOMMANDS if n not in self.commands)]
+
+    def get_command(self, ctx: Any, cmd_name: str) -> Any:
+        cmd = super().get_command(ctx, cmd_name)
+        if cmd is None and cmd_name in SUBCOMMANDS:
+            return TyperCommand(cmd_name, help=SUBCOMMANDS[cmd_name][1])
+        return cmd
+
+    def resolve_command(self, ctx: Any, args: list[str]):
+        if args and args[0] in SUBCOMMANDS and args[0] not in self.commands:
+            self.add_command(load_subcommand(args[0]), args[0])
+        return super().resolve_command(ctx, args)
+
+
+app = typer.Typer(help="Explainable Crypto AI", cls=LazyGroup)
+
+
+@app.callback()
+def main() -> None:
+    pass
+
 
 if __name__ == "__main__":
     app()
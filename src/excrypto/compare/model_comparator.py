@@ -1,24 +1,88 @@
+from pathlib import Path
+
 import pandas as pd
-from joblib import load
-from src.eval.evaluator import Evaluator
+from excrypto.eval.evaluator import Evaluator
+from excrypto.ml.registry import get_registry
+from excrypto.ml.resolve import load_manifest
 
 class ModelComparator:
-    def __init__(self, model_paths: dict, features: list, df: pd.DataFrame):
+    def __init__(self, model_paths: dict, features: list, df: pd.DataFrame, runs_root: Path = Path("runs")):
+        """
+        model_paths: name -> model file, ML manifest or latest_manifest.json pointer
+        """
         self.model_paths = model_paths
         self.features = features
         self.df = df.dropna()
+        self.runs_root = Path(runs_root)
         self.evaluator = Evaluator(output_path=None)  # disable per-model file saving
+        self.load_seconds: dict[str, float] = {}
 
     def evaluate(self):
         results = {}
         X = self.df[self.features]
         y = self.df["target"]
 
+        registry = get_registry()
         for name, path in self.model_paths.items():
-            model = load(path)
+            loaded = registry.resolve(path, runs_root=self.runs_root)
+            self.load_seconds[name] = loaded.load_seconds
+            model = loaded.model
             preds = model.predict(X)
             probs = model.predict_proba(X)[:, 1] if hasattr(model, "predict_proba") else None
             metrics = self.evaluator.evaluate(y, preds, y_prob=probs)
             results[name] = metrics
 
         return pd.DataFrame(results).T  # models as rows
+
+
+def _oof_path(manifest: dict, runs_root: Path) -> Path:
+    p = (manifest.get("paths") or {}).get("oof_scores")
+    if not p:
+        raise FileNotFoundError("ML manifest has no paths.oof_scores (trained before OOF scores were kept)")
+    p = Path(p)
+    return p if p.is_absolute() or p.exists() else runs_root / p
+
+
+def compare_oof(
+    manifests: dict,
+    runs_root: Path = Path("runs"),
+    threshold: float | None = None,
+    common_rows: bool = True,
+) -> pd.DataFrame:
+    """
+    Compare trained ML runs on their stored out-of-fold scores instead of re-predicting.
+
+    manifests: name -> ML manifest (or latest_manifest.json pointer). threshold=None uses each
+    run's training-time selection (train.threshold_selection), else 0.5. With common_rows,
+    every model is scored on the (timestamp, symbol) rows all of them have OOF scores for.
+    """
+    evaluator = Evaluator(output_path=None)
+    runs_root = Path(runs_root)
+    frames, thresholds = {}, {}
+    for name, ref in manifests.items():
+        man = load_manifest(Path(ref))
+        if "kind" not in man and (man.get("paths") or {}).get("manifest"):
+            man = load_manifest(Path(man["paths"]["manifest"]))
+        sel = (man.get("train") or {}).get("threshold_selection") or {}
+        thresholds[name] = float(threshold if threshold is not None else sel.get("selected", 0.5))
+        frames[name] = pd.read_parquet(_oof_path(man, runs_root), columns=["timestamp", "symbol", "score", "label"])
+
+    if common_rows and frames:
+        common = None
+        for df in frames.values():
+            keys = pd.MultiIndex.from_frame(df[["timestamp", "symbol"]])
+            common = keys if common is None else common.intersection(keys)
+        frames = {
+            name: df[pd.MultiIndex.from_frame(df[["timestamp", "symbol"]]).isin(common)]
+            for name, df in frames.items()
+        }
+
+    results = {}
+    for name, df in frames.items():
+        y_pred = (df["score"] >= thresholds[name]).astype(int)
+        results[name] = {
+            **evaluator.evaluate(df["label"], y_pred, y_prob=df["score"]),
+            "threshold": thresholds[name],
+            "n_rows": len(df),
+        }
+    return pd.DataFrame(results).T  # models as rows
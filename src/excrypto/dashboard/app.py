@@ -31,7 +31,7 @@ st.subheader("Runs root")
 st.code(str(runs_root.resolve()), language="text")
 
 # Small sanity check
-snapshots = sorted([p.name for p in runs_root.iterdir() if p.is_dir()])
+snapshots = sorted([p.name for p in runs_root.iterdir() if p.is_dir() and not p.name.startswith("_")])
 st.write("Snapshots found:", len(snapshots))
 if snapshots:
     st.write("Latest snapshot:", snapshots[-1])
@@ -14,7 +14,7 @@ def read_json(path: Path) -> dict[str, Any]:
 def list_snapshots(runs_root: Path) -> list[str]:
     if not runs_root.exists():
         return []
-    snaps = [p.name for p in runs_root.iterdir() if p.is_dir()]
+    snaps = [p.name for p in runs_root.iterdir() if p.is_dir() and not p.name.startswith("_")]
     snaps.sort()
     return snaps
 
@@ -2,9 +2,6 @@
 import typer
 from pathlib import Path
 
-from excrypto.data.snapshot import build_snapshot, SnapshotConfig
-from excrypto.data.panel import build_and_write_panel
-
 app = typer.Typer(help="Data pipeline: raw snapshots + helpers")
 
 
@@ -19,6 +16,8 @@ def snapshot(
     funding_limit: int = typer.Option(1000),
     data_root: str = typer.Option("data/raw"),
 ):
+    from excrypto.data.snapshot import build_snapshot, SnapshotConfig  # ccxt: only for this command
+
     syms = tuple(s.strip() for s in symbols.split(",") if s.strip())
     if not syms:
         raise typer.BadParameter("--symbols must contain at least one symbol")
@@ -44,6 +43,8 @@ def panel(
     timeframe: str = typer.Option("1h"),
     runs_root: Path = typer.Option(Path("runs")),
 ):
+    from excrypto.data.panel import build_and_write_panel
+
     syms = [s.strip() for s in symbols.split(",") if s.strip()]
     if not syms:
         raise typer.BadParameter("--symbols must contain at least one symbol")
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Iterable, List, Optional, Tuple, Union
+from typing import Any, Iterable, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -7,20 +7,17 @@ import pandas as pd
 
 # ---------------------------- helpers ---------------------------- #
 
-def _ensure_dt_index(df: pd.DataFrame, ts_col: str = "timestamp") -> pd.DataFrame:
-    """Ensure df is indexed by a tz-aware DatetimeIndex (UTC recommended)."""
+def _sorted_dt_index(df: pd.DataFrame, ts_col: str = "timestamp") -> pd.DatetimeIndex:
+    """Sorted tz-aware time axis of df: its DatetimeIndex, or `ts_col` parsed as UTC (no copy of the data)."""
     if isinstance(df.index, pd.DatetimeIndex):
         if df.index.tz is None:
             raise ValueError("DatetimeIndex must be timezone-aware (e.g., UTC).")
-        return df.sort_index()
+        return df.index.sort_values()
 
     if ts_col not in df.columns:
         raise ValueError(f"DataFrame must have a DatetimeIndex or a '{ts_col}' column.")
 
-    ts = pd.to_datetime(df[ts_col], utc=True)
-    out = df.copy()
-    out.index = ts
-    return out.sort_index()
+    return pd.DatetimeIndex(pd.to_datetime(df[ts_col], utc=True)).sort_values()
 
 
 def _to_tdelta(x: Union[str, int, float, pd.Timedelta]) -> pd.Timedelta:
@@ -32,12 +29,12 @@ def _to_tdelta(x: Union[str, int, float, pd.Timedelta]) -> pd.Timedelta:
     return pd.to_timedelta(x)
 
 
-def _time_slice_index(idx: pd.DatetimeIndex, start: pd.Timestamp, end: pd.Timestamp) -> np.ndarray:
-    """Return integer positions inside [start, end] inclusive."""
+def _time_slice_range(idx: pd.DatetimeIndex, start: pd.Timestamp, end: pd.Timestamp) -> Tuple[int, int]:
+    """Return the half-open position range [left, right) of idx inside [start, end] inclusive."""
     # idx is sorted DatetimeIndex
     left = idx.searchsorted(start, side="left")
     right = idx.searchsorted(end, side="right")  # exclusive
-    return np.arange(left, right, dtype=int)
+    return int(left), int(right)
 
 
 # ---------------------------- data classes ---------------------------- #
@@ -48,12 +45,114 @@ class TimeWindow:
     end: pd.Timestamp
 
 
+@dataclass(frozen=True)
+class IndexRanges:
+    """
+    Compact set of row positions stored as sorted, disjoint half-open [start, stop) ranges.
+
+    Folds on a time-sorted index are a handful of contiguous blocks, so this replaces
+    O(n) index arrays with O(#blocks) ints. Positions are materialized only on request.
+    """
+    bounds: Tuple[Tuple[int, int], ...] = ()
+
+    @classmethod
+    def from_bounds(cls, pairs: Iterable[Tuple[int, int]]) -> "IndexRanges":
+        """Normalize: drop empty ranges, sort, merge touching/overlapping ones."""
+        merged: List[List[int]] = []
+        for a, b in sorted((int(a), int(b)) for a, b in pairs if int(b) > int(a)):
+            if merged and a <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], b)
+            else:
+                merged.append([a, b])
+        return cls(tuple((a, b) for a, b in merged))
+
+    @property
+    def size(self) -> int:
+        return sum(b - a for a, b in self.bounds)
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def first(self) -> int:
+        return self.bounds[0][0]
+
+    @property
+    def last(self) -> int:
+        return self.bounds[-1][1] - 1
+
+    def to_indices(self) -> np.ndarray:
+        if not self.bounds:
+            return np.empty(0, dtype=int)
+        return np.concatenate([np.arange(a, b, dtype=int) for a, b in self.bounds])
+
+    def difference(self, other: "IndexRanges") -> "IndexRanges":
+        out: List[Tuple[int, int]] = []
+        for a, b in self.bounds:
+            cur = a
+            for c, d in other.bounds:
+                if d <= cur or c >= b:
+                    continue
+                if c > cur:
+                    out.append((cur, c))
+                cur = max(cur, d)
+            if cur < b:
+                out.append((cur, b))
+        return IndexRanges.from_bounds(out)
+
+    def intersects(self, other: "IndexRanges") -> bool:
+        return any(a < d and c < b for a, b in self.bounds for c, d in other.bounds)
+
+    def take(self, obj: Any) -> Any:
+        """Row-select a DataFrame/Series/ndarray; a single range is a plain slice (no index array)."""
+        if len(self.bounds) == 1:
+            a, b = self.bounds[0]
+            return obj.iloc[a:b] if hasattr(obj, "iloc") else obj[a:b]
+        idx = self.to_indices()
+        return obj.iloc[idx] if hasattr(obj, "iloc") else obj[idx]
+
+    def to_list(self) -> List[List[int]]:
+        """JSON-friendly form, e.g. for manifests."""
+        return [[a, b] for a, b in self.bounds]
+
+    @classmethod
+    def from_list(cls, pairs: Iterable[Iterable[int]]) -> "IndexRanges":
+        return cls.from_bounds(tuple(p) for p in pairs)  # type: ignore[misc]
+
+
 @dataclass(frozen=True)
 class SplitFold:
     train: TimeWindow
     valid: TimeWindow
-    train_idx: np.ndarray
-    valid_idx: np.ndarray
+    train_ranges: IndexRanges
+    valid_ranges: IndexRanges
+
+    # index arrays are produced lazily (and not cached) so holding many folds stays O(#ranges)
+    @property
+    def train_idx(self) -> np.ndarray:
+        return self.train_ranges.to_indices()
+
+    @property
+    def valid_idx(self) -> np.ndarray:
+        return self.valid_ranges.to_indices()
+
+    def to_dict(self) -> dict:
+        return {
+            "train": {"start": str(self.train.start), "end": str(self.train.end),
+                      "ranges": self.train_ranges.to_list()},
+            "valid": {"start": str(self.valid.start), "end": str(self.valid.end),
+                      "ranges": self.valid_ranges.to_list()},
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "SplitFold":
+        tr, va = d["train"], d["valid"]
+        return cls(
+            train=TimeWindow(pd.Timestamp(tr["start"]), pd.Timestamp(tr["end"])),
+            valid=TimeWindow(pd.Timestamp(va["start"]), pd.Timestamp(va["end"])),
+            train_ranges=IndexRanges.from_list(tr["ranges"]),
+            valid_ranges=IndexRanges.from_list(va["ranges"]),
+        )
 
 
 # ---------------------------- core API ---------------------------- #
@@ -83,8 +182,7 @@ def build_rolling_splits(
     -------
     List[SplitFold]
     """
-    df = _ensure_dt_index(df, ts_col=ts_col)
-    idx = df.index
+    idx = _sorted_dt_index(df, ts_col=ts_col)
 
     train_td = _to_tdelta(train)
     valid_td = _to_tdelta(valid)
@@ -113,26 +211,27 @@ def build_rolling_splits(
         post_valid_embargo_start = cur_valid_end
         post_valid_embargo_end = cur_valid_end + embargo_td
 
-        # Index positions
-        train_pos = _time_slice_index(idx, raw_train_start, raw_train_end)
-        valid_pos = _time_slice_index(idx, cur_valid_start, cur_valid_end)
+        # Position ranges
+        train_rng = IndexRanges.from_bounds([_time_slice_range(idx, raw_train_start, raw_train_end)])
+        valid_rng = IndexRanges.from_bounds([_time_slice_range(idx, cur_valid_start, cur_valid_end)])
 
         # Remove post-valid embargo from the right side of train, if it overlaps (rare on time axis)
         if embargo_td > pd.Timedelta(0):
-            post_embargo_pos = _time_slice_index(idx, post_valid_embargo_start, post_valid_embargo_end)
+            post_embargo_rng = IndexRanges.from_bounds(
+                [_time_slice_range(idx, post_valid_embargo_start, post_valid_embargo_end)]
+            )
             # train set must exclude any overlap with post-valid embargo
-            if post_embargo_pos.size:
-                train_pos = np.setdiff1d(train_pos, post_embargo_pos, assume_unique=False)
+            train_rng = train_rng.difference(post_embargo_rng)
 
         # sanity / min sizes
-        if train_pos.size >= min_obs and valid_pos.size >= min_obs:
+        if train_rng.size >= min_obs and valid_rng.size >= min_obs:
             fold = SplitFold(
-                train=TimeWindow(train_pos.size and idx[train_pos[0]] or raw_train_start,
-                                 train_pos.size and idx[train_pos[-1]] or raw_train_end),
-                valid=TimeWindow(valid_pos.size and idx[valid_pos[0]] or cur_valid_start,
-                                 valid_pos.size and idx[valid_pos[-1]] or cur_valid_end),
-                train_idx=train_pos,
-                valid_idx=valid_pos,
+                train=TimeWindow(train_rng.size and idx[train_rng.first] or raw_train_start,
+                                 train_rng.size and idx[train_rng.last] or raw_train_end),
+                valid=TimeWindow(valid_rng.size and idx[valid_rng.first] or cur_valid_start,
+                                 valid_rng.size and idx[valid_rng.last] or cur_valid_end),
+                train_ranges=train_rng,
+                valid_ranges=valid_rng,
             )
             folds.append(fold)
 
@@ -152,41 +251,42 @@ def make_purged_kfold_indices(
     """
     Time-ordered **purged K-Fold** on contiguous blocks of the index.
     Each fold's validation block is embargoed on both sides from the training set.
+    Folds hold IndexRanges (at most two train blocks, one valid block), built with searchsorted.
     """
-    df = _ensure_dt_index(df, ts_col=ts_col)
-    idx = df.index
+    idx = _sorted_dt_index(df, ts_col=ts_col)
+    n = len(idx)
 
     if n_splits < 2:
         raise ValueError("n_splits must be >= 2")
 
     # Cut the time index into contiguous blocks
-    cuts = np.linspace(0, len(idx), n_splits + 1, dtype=int)
+    cuts = np.linspace(0, n, n_splits + 1, dtype=int)
     embargo_td = _to_tdelta(embargo)
 
     folds: List[SplitFold] = []
     for k in range(n_splits):
-        v_start_pos, v_end_pos = cuts[k], cuts[k + 1]
-        valid_idx = np.arange(v_start_pos, v_end_pos, dtype=int)
+        v_start_pos, v_end_pos = int(cuts[k]), int(cuts[k + 1])
+        valid_rng = IndexRanges.from_bounds([(v_start_pos, v_end_pos)])
 
-        v_start_ts = idx[valid_idx[0]]
-        v_end_ts = idx[valid_idx[-1]]
+        v_start_ts = idx[v_start_pos]
+        v_end_ts = idx[v_end_pos - 1]
 
-        # Embargo zones around validation
+        # Embargo zones around validation; idx is sorted, so each side is a prefix/suffix
         left_cut_ts = v_start_ts - embargo_td
         right_cut_ts = v_end_ts + embargo_td
 
-        all_idx = np.arange(len(idx), dtype=int)
-        left_train = all_idx[idx <= left_cut_ts]
-        right_train = all_idx[idx >= right_cut_ts]
-        train_idx = np.concatenate([left_train, right_train])
+        train_rng = IndexRanges.from_bounds([
+            (0, idx.searchsorted(left_cut_ts, side="right")),   # idx <= left_cut_ts
+            (idx.searchsorted(right_cut_ts, side="left"), n),   # idx >= right_cut_ts
+        ])
 
         folds.append(
             SplitFold(
-                train=TimeWindow(idx[train_idx[0]], idx[train_idx[-1]]) if train_idx.size else
+                train=TimeWindow(idx[train_rng.first], idx[train_rng.last]) if train_rng.size else
                       TimeWindow(idx[0], idx[0]),
                 valid=TimeWindow(v_start_ts, v_end_ts),
-                train_idx=train_idx,
-                valid_idx=valid_idx,
+                train_ranges=train_rng,
+                valid_ranges=valid_rng,
             )
         )
     return folds
@@ -197,8 +297,7 @@ def make_purged_kfold_indices(
 def assert_no_overlap(folds: Iterable[SplitFold]) -> None:
     """Raise if any fold has overlapping train/valid indices."""
     for i, f in enumerate(folds):
-        inter = np.intersect1d(f.train_idx, f.valid_idx)
-        if inter.size:
+        if f.train_ranges.intersects(f.valid_ranges):
             raise ValueError(f"Fold {i} has overlap between train and valid indices.")
 
 
@@ -21,6 +21,8 @@ class Evaluator:
         return metrics
 
     def _save(self, metrics):
+        if self.output_path is None:
+            return
         os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
         with open(self.output_path, "w") as f:
             json.dump(metrics, f, indent=2)
@@ -0,0 +1,351 @@
+# src/excrypto/explain/engine.py
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Sequence
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from excrypto.utils.parallel import resolve_workers, thread_budget
+
+KEY_COLS = ("timestamp", "symbol")
+
+_TREE_MODELS = (
+    "RandomForestClassifier", "ExtraTreesClassifier", "DecisionTreeClassifier",
+    "GradientBoostingClassifier", "HistGradientBoostingClassifier",
+    "RandomForestRegressor", "ExtraTreesRegressor", "DecisionTreeRegressor",
+    "LGBMClassifier", "LGBMRegressor", "Booster", "XGBClassifier",
+)
+
+
+def unwrap_model(model: Any) -> Any:
+    """The estimator SHAP understands: SKLearnClassifier.model / LGBMNativeClassifier.booster."""
+    if type(model).__name__ == "LGBMNativeClassifier":
+        return model.booster
+    if type(model).__name__ == "SKLearnClassifier":
+        return model.model
+    return model
+
+
+def is_tree_model(model: Any) -> bool:
+    return type(unwrap_model(model)).__name__ in _TREE_MODELS
+
+
+def _build_explainer(model: Any, background: pd.DataFrame | None = None) -> Any:
+    import shap
+
+    est = unwrap_model(model)
+    if is_tree_model(est):
+        # path-dependent TreeSHAP: exact, polynomial time, no background data needed
+        return shap.TreeExplainer(est)
+    if background is None:
+        # shap picks an algorithm from the model alone (e.g. linear models)
+        return shap.Explainer(est)
+    fn = est.predict_proba if hasattr(est, "predict_proba") else est.predict
+    return shap.Explainer(fn, background)
+
+
+@dataclass
+class ExplainerCache:
+    """
+    LRU of SHAP explainers keyed by model identity (a model file's path + mtime, or the
+    in-memory object), so repeated explain calls on the same model build the explainer once.
+    """
+    max_explainers: int = 4
+    _cache: OrderedDict = field(default_factory=OrderedDict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    hits: int = 0
+    misses: int = 0
+
+    @staticmethod
+    def key_for(model: Any, model_path: str | Path | None = None) -> tuple:
+        if model_path is not None:
+            p = Path(model_path).resolve()
+            return ("path", str(p), p.stat().st_mtime_ns)
+        return ("obj", id(unwrap_model(model)))
+
+    def get(self, model: Any, *, model_path: str | Path | None = None,
+            background: pd.DataFrame | None = None) -> Any:
+        key = self.key_for(model, model_path)
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None and hit[0] is unwrap_model(model):
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return hit[1]
+        explainer = _build_explainer(model, background)
+        with self._lock:
+            self.misses += 1
+            # keep a reference to the model so an id() key cannot be reused by another object
+            self._cache[key] = (unwrap_model(model), explainer)
+            while len(self._cache) > self.max_explainers:
+                self._cache.popitem(last=False)
+        return explainer
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+_CACHE = ExplainerCache()
+
+
+def get_explainer_cache() -> ExplainerCache:
+    """Process-wide explainer cache (ModelExplainer, batch engine workers)."""
+    return _CACHE
+
+
+def positive_class(values: Any, expected: Any) -> tuple[np.ndarray, float]:
+    """(n, n_features) SHAP values and base value of the positive (last) class / raw output."""
+    if hasattr(values, "values"):  # shap.Explanation
+        values, expected = values.values, values.base_values
+    if isinstance(values, list):
+        values = values[-1]
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 3:
+        values = values[:, :, -1]
+    expected = np.asarray(expected, dtype=float).reshape(-1)
+    return values, float(expected[-1]) if expected.size else float("nan")
+
+
+def shap_chunk(explainer: Any, X: pd.DataFrame) -> tuple[np.ndarray, float]:
+    import shap
+
+    if isinstance(explainer, shap.TreeExplainer):
+        return positive_class(explainer.shap_values(X, check_additivity=False), explainer.expected_value)
+    return positive_class(explainer(X), None)
+
+
+# per-process explainer for pool workers (set by _init_worker)
+_WORKER: dict[str, Any] = {}
+
+
+def _init_worker(model_ref: str | bytes, n_threads: int) -> None:
+    from threadpoolctl import threadpool_limits
+
+    if isinstance(model_ref, bytes):
+        import io
+        model, path = joblib.load(io.BytesIO(model_ref)), None
+    else:
+        from excrypto.ml.registry import get_registry
+        model, path = get_registry().load(model_ref).model, model_ref
+    threadpool_limits(limits=n_threads)
+    _WORKER["explainer"] = get_explainer_cache().get(model, model_path=path)
+
+
+def _explain_chunk(X: np.ndarray, columns: list[str]) -> tuple[np.ndarray, float]:
+    return shap_chunk(_WORKER["explainer"], pd.DataFrame(X, columns=columns, copy=False))
+
+
+def _keys(df: pd.DataFrame, symbol: str | None) -> pd.DataFrame:
+    """(timestamp, symbol) per row from columns, or a DatetimeIndex + a fixed symbol."""
+    if "timestamp" in df.columns:
+        ts = pd.to_datetime(df["timestamp"])
+    elif isinstance(df.index, pd.DatetimeIndex):
+        ts = pd.Series(df.index, index=df.index)
+    else:
+        raise ValueError("rows need a 'timestamp' column or a DatetimeIndex")
+    sym = df["symbol"].astype(str) if "symbol" in df.columns else pd.Series(symbol or "", index=df.index)
+    return pd.DataFrame({"timestamp": ts.to_numpy(), "symbol": sym.to_numpy()})
+
+
+@dataclass(frozen=True)
+class ShapRun:
+    root: Path
+    rows: int
+    chunks: int
+    files: int
+    explainer: str
+    expected_value: float
+    seconds: float
+    sample: pd.DataFrame | None = field(default=None, repr=False)  # SHAP values of a random row sample (plots)
+    sample_data: pd.DataFrame | None = field(default=None, repr=False)
+
+
+def _write_parts(root: Path, keys: pd.DataFrame, values: np.ndarray, features: list[str], chunk: int) -> int:
+    """One parquet file per date partition of a chunk: <root>/date=YYYY-MM-DD/part-NNNNNN.parquet."""
+    out = pd.concat([keys.reset_index(drop=True),
+                     pd.DataFrame(values, columns=features)], axis=1)
+    day = pd.to_datetime(out["timestamp"], utc=True).dt.strftime("%Y-%m-%d")
+    n = 0
+    for d, part in out.groupby(day.to_numpy(), sort=True):
+        pdir = root / f"date={d}"
+        pdir.mkdir(parents=True, exist_ok=True)
+        part.sort_values(list(KEY_COLS), kind="mergesort").to_parquet(
+            pdir / f"part-{chunk:06d}.parquet", index=False)
+        n += 1
+    return n
+
+
+def effective_workers(model: Any, n_rows: int, chunk_rows: int, workers: int) -> int:
+    """Processes iter_shap actually uses: resolved `workers`, at most one per chunk, 1 for generic models."""
+    n_chunks = -(-n_rows // chunk_rows)
+    n = min(resolve_workers(workers), max(1, n_chunks))
+    # generic explainers carry a background frame; keep them in-process
+    return n if n <= 1 or is_tree_model(model) else 1
+
+
+def iter_shap(
+    model: Any,
+    X: pd.DataFrame,
+    *,
+    model_path: str | Path | None = None,
+    chunk_rows: int = 4096,
+    workers: int = 1,
+    background: pd.DataFrame | None = None,
+) -> Iterator[tuple[int, np.ndarray, float]]:
+    """
+    (start row, positive-class SHAP values, base value) per `chunk_rows` chunk of `X`, in order.
+
+    Tree models (RF/ET/GBM/LightGBM) use the TreeExplainer fast path; anything else needs a
+    `background` sample for the model-agnostic explainer. Chunks run serially or over a process
+    pool (`workers`, tree models only) with at most 2 chunks per worker in flight; each worker
+    builds its explainer once. Closing the generator early cancels chunks not yet started.
+    """
+    columns = list(X.columns)
+    starts = list(range(0, len(X), chunk_rows))
+    n_workers = effective_workers(model, len(X), chunk_rows, workers)
+
+    if n_workers <= 1:
+        explainer = get_explainer_cache().get(model, model_path=model_path, background=background)
+        for start in starts:
+            yield (start, *shap_chunk(explainer, X.iloc[start:start + chunk_rows]))
+        return
+
+    if model_path is not None:
+        ref: str | bytes = str(model_path)
+    else:
+        import io
+        buf = io.BytesIO()
+        joblib.dump(model, buf)
+        ref = buf.getvalue()
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                             initargs=(ref, thread_budget(n_workers))) as pool:
+        pending: deque = deque()
+        Xa = X.to_numpy()
+        try:
+            for start in starts:
+                pending.append((start, pool.submit(_explain_chunk, Xa[start:start + chunk_rows], columns)))
+                if len(pending) >= 2 * n_workers:
+                    s, fut = pending.popleft()
+                    yield (s, *fut.result())
+            while pending:
+                s, fut = pending.popleft()
+                yield (s, *fut.result())
+        finally:
+            # a consumer that stops early (budget, convergence) should not wait for queued chunks
+            for _, fut in pending:
+                fut.cancel()
+
+
+def explain_frame(
+    model: Any,
+    df: pd.DataFrame,
+    features: Sequence[str],
+    out_dir: str | Path,
+    *,
+    model_path: str | Path | None = None,
+    chunk_rows: int = 4096,
+    workers: int = 1,
+    symbol: str | None = None,
+    background: pd.DataFrame | None = None,
+    sample_rows: int = 0,
+    seed: int = 0,
+) -> ShapRun:
+    """
+    Stream SHAP values of every row of `df` (positive class) to a parquet dataset partitioned by
+    date, one row per (timestamp, symbol) with one column per feature, plus `_meta.json`.
+
+    Chunking, the tree fast path and the process pool are those of `iter_shap`. `sample_rows` > 0
+    also returns the values of a fixed random row sample for plotting.
+    """
+    features = list(features)
+    root = Path(out_dir)
+    root.mkdir(parents=True, exist_ok=True)
+    for old in list(root.glob("date=*/part-*.parquet")):
+        old.unlink()
+
+    keys = _keys(df, symbol)
+    X = df[features]
+    n = len(X)
+    sample_idx = (np.sort(np.random.default_rng(seed).choice(n, size=min(n, sample_rows), replace=False))
+                  if sample_rows else np.array([], dtype=int))
+    samples: list[np.ndarray] = []
+    t0 = time.perf_counter()
+    files, chunks, expected = 0, 0, float("nan")
+
+    for start, vals, expected in iter_shap(model, X, model_path=model_path, chunk_rows=chunk_rows,
+                                           workers=workers, background=background):
+        files += _write_parts(root, keys.iloc[start:start + len(vals)], vals, features, chunks)
+        chunks += 1
+        if sample_idx.size:
+            sel = sample_idx[(sample_idx >= start) & (sample_idx < start + len(vals))] - start
+            samples.append(vals[sel])
+
+    seconds = round(time.perf_counter() - t0, 3)
+    kind = "tree" if is_tree_model(model) else "generic"
+    meta = {
+        "kind": "shap_values",
+        "schema_version": 1,
+        "model_path": str(model_path) if model_path else None,
+        "explainer": kind,
+        "expected_value": expected,
+        "features": features,
+        "key_cols": list(KEY_COLS),
+        "partitioning": "date",
+        "rows": n,
+        "chunk_rows": chunk_rows,
+        "workers": effective_workers(model, n, chunk_rows, workers),
+        "seconds": seconds,
+    }
+    (root / "_meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    sample = sample_data = None
+    if sample_idx.size:
+        sample = pd.DataFrame(np.concatenate(samples), columns=features, index=df.index[sample_idx])
+        sample_data = X.iloc[sample_idx]
+    return ShapRun(root=root, rows=n, chunks=chunks, files=files, explainer=kind,
+                   expected_value=expected, seconds=seconds, sample=sample, sample_data=sample_data)
+
+
+def read_shap(
+    root: str | Path,
+    *,
+    start: str | pd.Timestamp | None = None,
+    end: str | pd.Timestamp | None = None,
+    symbols: Sequence[str] | None = None,
+    columns: Sequence[str] | None = None,
+) -> pd.DataFrame:
+    """SHAP rows of a date range / symbol subset, reading only the matching date partitions."""
+    root = Path(root)
+    lo = pd.Timestamp(start).strftime("%Y-%m-%d") if start is not None else None
+    hi = pd.Timestamp(end).strftime("%Y-%m-%d") if end is not None else None
+    files = []
+    for pdir in sorted(root.glob("date=*")):
+        d = pdir.name.split("=", 1)[1]
+        if (lo is None or d >= lo) and (hi is None or d <= hi):
+            files.extend(sorted(pdir.glob("part-*.parquet")))
+    cols = None if columns is None else list(dict.fromkeys([*KEY_COLS, *columns]))
+    if not files:
+        return pd.DataFrame(columns=cols or list(KEY_COLS))
+    df = pd.concat([pd.read_parquet(f, columns=cols) for f in files], ignore_index=True)
+    tz = getattr(df["timestamp"].dt, "tz", None)
+
+    def _bound(x):
+        t = pd.Timestamp(x)
+        return t.tz_localize(tz) if tz is not None and t.tz is None else t
+
+    if start is not None:
+        df = df[df["timestamp"] >= _bound(start)]
+    if end is not None:
+        df = df[df["timestamp"] <= _bound(end)]
+    if symbols is not None:
+        df = df[df["symbol"].isin(list(symbols))]
+    return df.sort_values(["timestamp", "symbol"], kind="mergesort").reset_index(drop=True)
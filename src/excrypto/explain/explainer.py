@@ -1,40 +1,100 @@
 import shap
 import matplotlib.pyplot as plt
+import json
 import os
+import numpy as np
 import pandas as pd
 
+from excrypto.explain.engine import explain_frame, get_explainer_cache, shap_chunk
+from excrypto.explain.sampling import estimate_importance
+
+
 class ModelExplainer:
-    def __init__(self, model, features):
+    def __init__(self, model, features, model_path=None, background=None):
         self.model = model
         self.features = features
-        self.explainer = shap.Explainer(model)
+        self.model_path = model_path
+        # one explainer per model (TreeExplainer for RF/LightGBM), shared across instances
+        self.explainer = get_explainer_cache().get(model, model_path=model_path, background=background)
+
+    def _explanation(self, X):
+        values, base = shap_chunk(self.explainer, X[self.features])
+        return shap.Explanation(values=values, base_values=np.full(len(values), base),
+                                data=X[self.features].to_numpy(), feature_names=list(self.features))
 
     def explain_instance(self, X, output_path="plots/latest_shap_explanation.png"):
-        shap_values = self.explainer(X)
+        shap_values = self._explanation(X)
         shap.plots.bar(shap_values, show=False)
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         plt.savefig(output_path, bbox_inches="tight")
         plt.clf()
         print(f"✅ Saved SHAP bar plot to {output_path}")
 
-    def explain_global(self, df, out_dir="plots"):
-        X = df[self.features]
-        shap_values = self.explainer(X)
+    def explain_global(self, df, out_dir="plots", *, workers=1, chunk_rows=4096, plot_rows=5000, symbol=None,
+                       budget=None, rel_tol=0.05, confidence=0.95):
+        """
+        SHAP values of every row of `df`, streamed in chunks (optionally over a process pool)
+        to `<out_dir>/shap_values/` (parquet, partitioned by date, keyed by timestamp/symbol).
+        The summary plots use a fixed random sample of `plot_rows` rows.
+
+        With `budget` (seconds), explain a sample stratified by symbol and day instead, until the
+        mean |SHAP| intervals are within `rel_tol` or the budget runs out (see estimate_importance).
+        """
+        if budget is not None:
+            return self._explain_global_sampled(df, out_dir, workers=workers, symbol=symbol, budget=budget,
+                                                rel_tol=rel_tol, confidence=confidence, plot_rows=plot_rows)
+        run = explain_frame(
+            self.model, df, self.features, os.path.join(out_dir, "shap_values"),
+            model_path=self.model_path, chunk_rows=chunk_rows, workers=workers,
+            symbol=symbol, sample_rows=plot_rows,
+        )
         os.makedirs(out_dir, exist_ok=True)
+        # no sample (plot_rows=0 or an empty frame): values only, no plots
+        if run.sample is not None and len(run.sample):
+            shap_values = shap.Explanation(
+                values=run.sample.to_numpy(), base_values=np.full(len(run.sample), run.expected_value),
+                data=run.sample_data.to_numpy(), feature_names=list(self.features),
+            )
 
-        shap.summary_plot(shap_values, X, show=False)
-        plt.savefig(f"{out_dir}/shap_summary.png", bbox_inches="tight")
-        plt.clf()
+            shap.summary_plot(shap_values, run.sample_data, show=False)
+            plt.savefig(f"{out_dir}/shap_summary.png", bbox_inches="tight")
+            plt.clf()
 
-        shap.plots.bar(shap_values, show=False)
-        plt.savefig(f"{out_dir}/shap_bar.png", bbox_inches="tight")
-        plt.clf()
+            shap.plots.bar(shap_values, show=False)
+            plt.savefig(f"{out_dir}/shap_bar.png", bbox_inches="tight")
+            plt.clf()
+
+            print(f"✅ Saved global SHAP plots to {out_dir}")
+        print(f"✅ Saved SHAP values for {run.rows} rows to {run.root} ({run.explainer} explainer, {run.seconds}s)")
+        return run
 
-        print(f"✅ Saved global SHAP plots to {out_dir}")
+    def _explain_global_sampled(self, df, out_dir, *, workers, symbol, budget, rel_tol, confidence, plot_rows):
+        est = estimate_importance(
+            self.model, df, self.features, model_path=self.model_path, symbol=symbol,
+            time_budget=budget, rel_tol=rel_tol, confidence=confidence, workers=workers,
+        )
+        os.makedirs(out_dir, exist_ok=True)
+        imp = est.importance
+        imp.to_csv(f"{out_dir}/shap_importance.csv")
+        with open(f"{out_dir}/shap_importance.json", "w", encoding="utf-8") as f:
+            json.dump(est.summary(), f, indent=2)
 
-        # Save SHAP values to CSV
-        shap_df = pd.DataFrame(shap_values.values, columns=self.features, index=X.index)
-        shap_df.to_csv(f"{out_dir}/shap_values.csv")
-        print(f"✅ Saved SHAP values to {out_dir}/shap_values.csv")
+        order = imp.iloc[::-1]
+        err = np.vstack([order["mean_abs_shap"] - order["ci_low"], order["ci_high"] - order["mean_abs_shap"]])
+        plt.figure(figsize=(8, max(3, 0.4 * len(order))))
+        plt.barh(order.index, order["mean_abs_shap"], xerr=err, capsize=3)
+        plt.xlabel(f"mean |SHAP| ({confidence:.0%} CI)")
+        plt.title(f"{est.rows_explained:,} of {est.rows_total:,} rows ({est.stop_reason})")
+        plt.savefig(f"{out_dir}/shap_bar.png", bbox_inches="tight")
+        plt.clf()
 
+        # plot_rows=0: importance and its intervals only, no summary plot
+        sample, data = est.sample.iloc[:plot_rows], est.sample_data.iloc[:plot_rows]
+        if len(sample):
+            shap.summary_plot(sample.to_numpy(), data, show=False)
+            plt.savefig(f"{out_dir}/shap_summary.png", bbox_inches="tight")
+            plt.clf()
 
+        print(f"✅ Saved sampled global SHAP importance to {out_dir} "
+              f"({est.rows_explained}/{est.rows_total} rows, {est.stop_reason}, {est.seconds}s)")
+        return est
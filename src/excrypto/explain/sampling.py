@@ -0,0 +1,181 @@
+# src/excrypto/explain/sampling.py
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Sequence
+
+import numpy as np
+import pandas as pd
+
+from excrypto.explain.engine import _keys, iter_shap
+from excrypto.explain.store import bucket_of
+
+
+@dataclass(frozen=True)
+class ImportanceEstimate:
+    """
+    Mean |SHAP| per feature from a stratified row sample, with bootstrap confidence intervals.
+
+    `importance` has one row per feature (descending): mean_abs_shap, ci_low, ci_high,
+    half_width. `stop_reason` is "converged" (every interval within tolerance), "budget"
+    (time ran out) or "exhausted" (every row explained: the values are exact).
+    """
+    importance: pd.DataFrame
+    rows_explained: int
+    rows_total: int
+    strata: int
+    rounds: int
+    seconds: float
+    stop_reason: str
+    confidence: float
+    sample: pd.DataFrame = field(repr=False)  # SHAP values of the explained rows (plots)
+    sample_data: pd.DataFrame = field(repr=False)
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "rows_explained": self.rows_explained,
+            "rows_total": self.rows_total,
+            "strata": self.strata,
+            "rounds": self.rounds,
+            "seconds": self.seconds,
+            "stop_reason": self.stop_reason,
+            "confidence": self.confidence,
+            "importance": self.importance.reset_index().to_dict(orient="records"),
+        }
+
+
+def stratified_order(strata: np.ndarray, seed: int = 0) -> np.ndarray:
+    """
+    Row order whose every prefix holds each stratum in proportion to its size: the r-th random
+    row of a stratum of n_s rows gets key (r + u) / n_s, u ~ U(0, 1), and rows go by key.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(strata)
+    perm = rng.permutation(n)
+    s = pd.Series(strata[perm])
+    rank = s.groupby(s.to_numpy()).cumcount().to_numpy()
+    size = s.map(s.value_counts()).to_numpy()
+    key = np.empty(n)
+    key[perm] = (rank + rng.uniform(size=n)) / size
+    return np.argsort(key, kind="stable")
+
+
+def _post_weights(sid: np.ndarray, stratum_size: np.ndarray) -> np.ndarray:
+    """Per sampled row: stratum size / rows sampled from that stratum."""
+    return stratum_size[sid] / np.bincount(sid, minlength=len(stratum_size))[sid]
+
+
+def _interval(A: np.ndarray, w: np.ndarray, rng: np.random.Generator, n_boot: int,
+              confidence: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Weighted mean of |SHAP| rows `A` and its percentile interval over Poisson-bootstrap replicates."""
+    est = (w @ A) / w.sum()
+    bw = rng.poisson(1.0, size=(n_boot, len(A))) * w
+    with np.errstate(invalid="ignore", divide="ignore"):
+        boot = (bw @ A) / bw.sum(axis=1, keepdims=True)
+    alpha = (1.0 - confidence) / 2.0
+    lo, hi = np.nanquantile(boot, [alpha, 1.0 - alpha], axis=0)
+    return est, lo, hi
+
+
+def estimate_importance(
+    model: Any,
+    df: pd.DataFrame,
+    features: Sequence[str],
+    *,
+    model_path: str | Path | None = None,
+    symbol: str | None = None,
+    time_bucket: str = "day",
+    time_budget: float = 30.0,
+    rel_tol: float = 0.05,
+    abs_tol: float | None = None,
+    confidence: float = 0.95,
+    batch_rows: int = 2048,
+    min_rows: int = 1000,
+    n_boot: int = 200,
+    workers: int = 1,
+    background: pd.DataFrame | None = None,
+    seed: int = 0,
+) -> ImportanceEstimate:
+    """
+    Global mean |SHAP| per feature without explaining every row.
+
+    Rows are stratified by (symbol, `time_bucket` of the timestamp) and explained in
+    `batch_rows` batches along `stratified_order`, so the sample stays proportional across strata
+    as it grows. Estimates are post-stratified (each row weighs n_stratum / sampled_stratum).
+    After each batch past `min_rows`, `n_boot` Poisson-bootstrap replicates give percentile
+    intervals. Sampling stops when every feature's half-width is within
+    max(rel_tol * estimate, abs_tol) — abs_tol defaults to rel_tol * 1% of the top feature, so
+    near-zero features do not hold the run open — or when the next batch would overrun
+    `time_budget` seconds. The bootstrap ignores strata, so intervals are slightly conservative.
+    """
+    if df.empty:
+        raise ValueError("no rows to explain")
+    t0 = time.perf_counter()
+    features = list(features)
+    keys = _keys(df, symbol)
+    strata = pd.MultiIndex.from_arrays([keys["symbol"], bucket_of(keys["timestamp"], time_bucket)])
+    strata_id = pd.factorize(strata)[0]
+    order = stratified_order(strata_id, seed=seed)
+    n_total = len(order)
+    stratum_size = np.bincount(strata_id)
+    X = df[features].iloc[order]
+    sid = strata_id[order]
+
+    rng = np.random.default_rng(seed + 1)
+    vals: list[np.ndarray] = []
+    n_done, rounds, stop_reason = 0, 0, "exhausted"
+    shap_iter = iter_shap(model, X, model_path=model_path, chunk_rows=batch_rows,
+                          workers=workers, background=background)
+    try:
+        while True:
+            t_batch = time.perf_counter()
+            nxt = next(shap_iter, None)
+            if nxt is None:
+                break
+            vals.append(nxt[1])
+            n_done += len(nxt[1])
+            rounds += 1
+            if n_done >= n_total:
+                break
+            if n_done >= min_rows:
+                A = np.abs(np.concatenate(vals))
+                est, lo, hi = _interval(A, _post_weights(sid[:n_done], stratum_size), rng, n_boot, confidence)
+                tol = np.maximum(rel_tol * est, rel_tol * 0.01 * est.max() if abs_tol is None else abs_tol)
+                if np.all((hi - lo) / 2.0 <= tol):
+                    stop_reason = "converged"
+                    break
+            if time.perf_counter() - t0 + (time.perf_counter() - t_batch) > time_budget:
+                stop_reason = "budget"
+                break
+    finally:
+        shap_iter.close()
+
+    V = np.concatenate(vals)
+    if stop_reason == "exhausted":
+        est = np.abs(V).mean(axis=0)  # every row: exact
+        lo = hi = est
+    elif stop_reason == "budget":
+        est, lo, hi = _interval(np.abs(V), _post_weights(sid[:n_done], stratum_size), rng, n_boot, confidence)
+
+    importance = pd.DataFrame({
+        "mean_abs_shap": est,
+        "ci_low": lo,
+        "ci_high": hi,
+        "half_width": (hi - lo) / 2.0,
+    }, index=pd.Index(features, name="feature")).sort_values("mean_abs_shap", ascending=False)
+
+    rows = order[:n_done]
+    return ImportanceEstimate(
+        importance=importance,
+        rows_explained=n_done,
+        rows_total=n_total,
+        strata=len(stratum_size),
+        rounds=rounds,
+        seconds=round(time.perf_counter() - t0, 3),
+        stop_reason=stop_reason,
+        confidence=confidence,
+        sample=pd.DataFrame(V, columns=features, index=df.index[rows]),
+        sample_data=df[features].iloc[rows],
+    )
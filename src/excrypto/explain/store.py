@@ -0,0 +1,261 @@
+# src/excrypto/explain/store.py
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Sequence
+
+import numpy as np
+import pandas as pd
+
+from excrypto.explain.engine import _keys, _write_parts, iter_shap, read_shap
+
+# aggregate granularities; buckets are UTC, weeks start on Monday
+FREQS = ("hour", "day", "week")
+
+
+def _utc_naive(ts: pd.Series) -> pd.Series:
+    ts = pd.to_datetime(ts)
+    return ts.dt.tz_convert("UTC").dt.tz_localize(None) if ts.dt.tz is not None else ts
+
+
+def _bound(x: str | pd.Timestamp) -> pd.Timestamp:
+    t = pd.Timestamp(x)
+    return t.tz_convert("UTC").tz_localize(None) if t.tz is not None else t
+
+
+def bucket_of(ts: pd.Series, freq: str) -> pd.Series:
+    """Start of the hour/day/week (UTC) each timestamp falls in."""
+    ts = _utc_naive(ts)
+    if freq == "hour":
+        return ts.dt.floor("h")
+    day = ts.dt.floor("D")
+    if freq == "day":
+        return day
+    if freq == "week":
+        return day - pd.to_timedelta(day.dt.weekday, unit="D")
+    raise ValueError(f"freq must be one of {FREQS}, got {freq!r}")
+
+
+def _model_ref(model_path: str | Path | None, model_id: str | None) -> dict[str, Any]:
+    """Identity of the explained model: explicit id and/or resolved file path + mtime."""
+    if model_path is None and model_id is None:
+        raise ValueError("ShapStore.append needs a model_path or a model_id for an in-memory model")
+    ref: dict[str, Any] = {"id": model_id, "path": None, "mtime_ns": None}
+    if model_path is not None:
+        p = Path(model_path).resolve()
+        ref.update(path=str(p), mtime_ns=p.stat().st_mtime_ns)
+    return ref
+
+
+def _partial_agg(keys: pd.DataFrame, values: np.ndarray, features: list[str], freq: str) -> pd.DataFrame:
+    """Per (bucket, symbol): row count `n` and sum of |SHAP| per feature."""
+    a = pd.DataFrame(np.abs(values), columns=features)
+    a.insert(0, "bucket", bucket_of(keys["timestamp"], freq).to_numpy())
+    a.insert(1, "symbol", keys["symbol"].to_numpy())
+    a.insert(2, "n", 1)
+    return a.groupby(["bucket", "symbol"], sort=False).sum().reset_index()
+
+
+def _merge_agg(parts: list[pd.DataFrame]) -> pd.DataFrame:
+    return (pd.concat(parts, ignore_index=True)
+            .groupby(["bucket", "symbol"], sort=True).sum().reset_index())
+
+
+@dataclass
+class ShapStore:
+    """
+    Persistent SHAP values of one model, grown by `append` with only the rows not explained yet.
+
+    Layout under `root`:
+      values/date=YYYY-MM-DD/part-NNNNNN.parquet   raw SHAP per (timestamp, symbol), as explain_frame
+      agg_<freq>.<gen>.parquet                     per (bucket, symbol): n + sum |SHAP| per feature
+      state.json                                   features, model, per-symbol high-water, counters
+
+    The aggregates hold sums, so each append folds its rows in without rereading raw values and
+    `importance` turns them into mean |SHAP| (optionally over a rolling window) from tables with
+    one row per bucket and symbol. state.json is replaced last and names the current aggregate
+    generation and part counter; files of an append that died before that are dropped on the next.
+    """
+    root: Path
+
+    def __post_init__(self) -> None:
+        self.root = Path(self.root)
+
+    @property
+    def values_dir(self) -> Path:
+        return self.root / "values"
+
+    def state(self) -> dict[str, Any]:
+        p = self.root / "state.json"
+        if p.exists():
+            return json.loads(p.read_text(encoding="utf-8"))
+        return {"schema_version": 1, "features": None, "model": None, "high_water": {},
+                "parts": 0, "gen": 0, "rows": 0, "expected_value": None}
+
+    def _save_state(self, st: dict[str, Any]) -> None:
+        tmp = self.root / "state.json.tmp"
+        tmp.write_text(json.dumps(st, indent=2), encoding="utf-8")
+        tmp.replace(self.root / "state.json")
+
+    def _agg_path(self, freq: str, gen: int) -> Path:
+        return self.root / f"agg_{freq}.{gen:06d}.parquet"
+
+    def _drop_uncommitted(self, st: dict[str, Any]) -> None:
+        for p in self.values_dir.glob("date=*/part-*.parquet"):
+            if int(p.stem.split("-")[1]) >= st["parts"]:
+                p.unlink()
+        for p in self.root.glob("agg_*.parquet"):
+            if int(p.suffixes[0][1:]) != st["gen"]:
+                p.unlink()
+
+    def append(
+        self,
+        model: Any,
+        df: pd.DataFrame,
+        features: Sequence[str],
+        *,
+        model_path: str | Path | None = None,
+        model_id: str | None = None,
+        symbol: str | None = None,
+        chunk_rows: int = 4096,
+        workers: int = 1,
+        background: pd.DataFrame | None = None,
+    ) -> dict[str, Any]:
+        """
+        Explain the rows of `df` newer than the store's high-water mark of their symbol and fold
+        them into the raw values and the hour/day/week aggregates. Rows at or before the mark
+        (already explained, or late arrivals) are skipped.
+
+        The model is identified by `model_id` and/or `model_path` (with the file's mtime, so a
+        model retrained to the same path counts as new); an in-memory model needs `model_id`.
+        Appending with a different model than the store holds raises ValueError.
+        """
+        t0 = time.perf_counter()
+        features = list(features)
+        self.root.mkdir(parents=True, exist_ok=True)
+        st = self.state()
+        if st["features"] is not None and st["features"] != features:
+            raise ValueError(f"store {self.root} holds features {st['features']}, got {features}")
+        model_ref = _model_ref(model_path, model_id)
+        if st["model"] is not None and st["model"] != model_ref:
+            raise ValueError(f"store {self.root} holds SHAP values of model {st['model']}; "
+                             f"use a new store for {model_ref}")
+        self._drop_uncommitted(st)
+
+        keys = _keys(df, symbol)
+        ts = _utc_naive(keys["timestamp"])
+        hw = pd.to_datetime(keys["symbol"].map(st["high_water"]))
+        new = (hw.isna() | (ts > hw)).to_numpy()
+        keys = keys[new].reset_index(drop=True)
+        X = df.loc[new, features].reset_index(drop=True)
+        dup = keys.duplicated(["timestamp", "symbol"], keep="last").to_numpy()
+        keys, X = keys[~dup].reset_index(drop=True), X[~dup].reset_index(drop=True)
+        stats = {"rows_new": len(X), "rows_skipped": int(len(df) - len(X)), "files": 0}
+        if X.empty:
+            stats["seconds"] = round(time.perf_counter() - t0, 3)
+            return stats
+
+        partial: dict[str, list[pd.DataFrame]] = {f: [] for f in FREQS}
+        part, expected = st["parts"], st["expected_value"]
+        for start, vals, expected in iter_shap(model, X, model_path=model_path, chunk_rows=chunk_rows,
+                                               workers=workers, background=background):
+            k = keys.iloc[start:start + len(vals)]
+            stats["files"] += _write_parts(self.values_dir, k, vals, features, part)
+            part += 1
+            for f in FREQS:
+                partial[f].append(_partial_agg(k, vals, features, f))
+
+        gen = st["gen"] + 1
+        for f in FREQS:
+            old = self._agg_path(f, st["gen"])
+            merged = _merge_agg(([pd.read_parquet(old)] if old.exists() else []) + partial[f])
+            merged.to_parquet(self._agg_path(f, gen), index=False)
+
+        last = pd.Series(_utc_naive(keys["timestamp"]).to_numpy()).groupby(keys["symbol"].to_numpy()).max()
+        st.update({
+            "features": features,
+            "model": model_ref,
+            "high_water": {**st["high_water"], **{s: t.isoformat() for s, t in last.items()}},
+            "parts": part,
+            "gen": gen,
+            "rows": st["rows"] + len(X),
+            "expected_value": expected,
+        })
+        self._save_state(st)
+        for f in FREQS:
+            self._agg_path(f, gen - 1).unlink(missing_ok=True)
+        stats["seconds"] = round(time.perf_counter() - t0, 3)
+        return stats
+
+    def aggregates(
+        self,
+        freq: str = "day",
+        *,
+        start: str | pd.Timestamp | None = None,
+        end: str | pd.Timestamp | None = None,
+        symbols: Sequence[str] | None = None,
+    ) -> pd.DataFrame:
+        """Raw (bucket, symbol, n, sum |SHAP| per feature) rows of buckets overlapping [start, end]."""
+        if freq not in FREQS:
+            raise ValueError(f"freq must be one of {FREQS}, got {freq!r}")
+        st = self.state()
+        p = self._agg_path(freq, st["gen"])
+        if not p.exists():
+            return pd.DataFrame(columns=["bucket", "symbol", "n", *(st["features"] or [])])
+        agg = pd.read_parquet(p)
+        if start is not None:
+            agg = agg[agg["bucket"] >= bucket_of(pd.Series([_bound(start)]), freq)[0]]
+        if end is not None:
+            agg = agg[agg["bucket"] <= _bound(end)]
+        if symbols is not None:
+            agg = agg[agg["symbol"].isin(list(symbols))]
+        return agg.reset_index(drop=True)
+
+    def importance(
+        self,
+        freq: str = "day",
+        *,
+        start: str | pd.Timestamp | None = None,
+        end: str | pd.Timestamp | None = None,
+        symbols: Sequence[str] | None = None,
+        rolling: str | None = None,
+        by_symbol: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Mean |SHAP| per feature per bucket (index), pooled over `symbols` unless `by_symbol`
+        (then indexed by (symbol, bucket)). `rolling` is a pandas offset (e.g. "7D") over which
+        sums and counts are accumulated before dividing, so sparse buckets weigh by their rows.
+        """
+        agg = self.aggregates(freq, start=start, end=end, symbols=symbols)
+        feats = [c for c in agg.columns if c not in ("bucket", "symbol", "n")]
+        if by_symbol:
+            g = agg.set_index(["symbol", "bucket"]).sort_index()
+            if rolling:
+                g = pd.concat({s: grp.droplevel("symbol").rolling(rolling).sum()
+                               for s, grp in g.groupby(level="symbol")}, names=["symbol", "bucket"])
+        else:
+            g = agg.groupby("bucket")[["n", *feats]].sum()
+            if rolling:
+                g = g.rolling(rolling).sum()
+        return g[feats].div(g["n"], axis=0)
+
+    def global_importance(
+        self,
+        *,
+        start: str | pd.Timestamp | None = None,
+        end: str | pd.Timestamp | None = None,
+        symbols: Sequence[str] | None = None,
+    ) -> pd.Series:
+        """Mean |SHAP| per feature over all rows of hourly buckets in [start, end], descending."""
+        agg = self.aggregates("hour", start=start, end=end, symbols=symbols)
+        feats = [c for c in agg.columns if c not in ("bucket", "symbol", "n")]
+        n = agg["n"].sum()
+        out = agg[feats].sum() / n if n else pd.Series(np.nan, index=feats)
+        return out.astype(float).sort_values(ascending=False)
+
+    def values(self, **kwargs: Any) -> pd.DataFrame:
+        """Raw SHAP rows; same filters as read_shap (start, end, symbols, columns)."""
+        return read_shap(self.values_dir, **kwargs)
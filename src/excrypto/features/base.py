@@ -25,6 +25,11 @@ class Feature(ABC):
     def fit_transform(self, df: pd.DataFrame) -> pd.Series:
         return self.fit(df).transform(df)
 
+    @property
+    def lookback(self) -> int:
+        """Rows before a row that its value depends on (0 = computed from the row alone)."""
+        return 0
+
     def check_ready(self) -> None:
         if self.requires_fit and not self.fitted_:
             raise RuntimeError(f"{self.__class__.__name__} must be fit() before transform().")
@@ -10,6 +10,7 @@ import json
 import pandas as pd
 
 from excrypto.features.pipeline import FeaturePipeline
+from excrypto.utils.parallel import apply_by_group
 from excrypto.utils.paths import RunPaths
 from excrypto.ml.resolve import write_latest_pointer
 
@@ -52,6 +53,7 @@ def build_features_frame(
     group_col: str = "symbol",
     nan_policy: NanPolicy = "keep",
     return_with_input_cols: bool = True,
+    workers: int = 1,
 ) -> pd.DataFrame:
     """
     Pure builder: takes an in-memory panel and returns a DataFrame with feature columns.
@@ -62,29 +64,28 @@ def build_features_frame(
 
     Notes:
       - We do NOT call pipeline.fit() here to avoid leakage-by-default.
+      - workers > 1 fans symbols out over a process pool (see utils.parallel.apply_by_group);
+        output is identical to the serial path.
     """
     specs_list = list(specs)
     pipe = FeaturePipeline(specs_list).build()
+    panel = panel.reset_index(drop=True)
 
     if group_col in panel.columns:
-        # Per-symbol feature generation
-        feats = (
-            panel.groupby(group_col, group_keys=False)
-            .apply(lambda g: pipe.transform(g))
-            .reset_index(drop=True)
-        )
+        # Per-symbol feature generation; groups keep positional labels so we can restore row order
+        feats = apply_by_group(panel, pipe.transform, group_col=group_col, workers=workers)
     else:
-        feats = pipe.transform(panel).reset_index(drop=True)
+        feats = pipe.transform(panel)
 
     # Align with original row order
-    feats = feats.reset_index(drop=True)
+    feats = feats.sort_index().reset_index(drop=True)
 
     if nan_policy == "drop_any":
         mask = ~feats.isna().any(axis=1)
         feats = feats.loc[mask].reset_index(drop=True)
-        base = panel.reset_index(drop=True).loc[mask].reset_index(drop=True)
+        base = panel.loc[mask].reset_index(drop=True)
     else:
-        base = panel.reset_index(drop=True)
+        base = panel
 
     if return_with_input_cols:
         # Append feature cols onto the original panel (no overwrites)
@@ -190,6 +191,7 @@ def build_and_write_features(
     group_col: str = "symbol",
     nan_policy: NanPolicy = "keep",
     extra_manifest: dict[str, Any] | None = None,
+    workers: int = 1,
 ) -> FeaturesArtifact:
     """
     One-stop API for CLI/orchestrator:
@@ -201,6 +203,7 @@ def build_and_write_features(
         group_col=group_col,
         nan_policy=nan_policy,
         return_with_input_cols=True,
+        workers=workers,
     )
     return write_features_artifact(
         runpaths,
@@ -42,6 +42,7 @@ def build(
     config: Path | None = typer.Option(None, exists=True, dir_okay=False, help="YAML/JSON feature spec config."),
     runs_root: Path = typer.Option(Path("runs"), help="Artifact root directory."),
     nan_policy: str = typer.Option("keep", help="NaN handling: keep | drop_any"),
+    workers: int = typer.Option(1, help="Process-pool size for per-symbol builds (1 = serial, -1 = all cores)."),
 ) -> None:
     """
     Build features for a snapshot + symbol universe.
@@ -93,6 +94,7 @@ def build(
             "exchange": exchange,
             "input_panel": str(panel_path),
         },
+        workers=workers,
     )
 
     typer.echo(json.dumps(
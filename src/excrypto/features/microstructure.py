@@ -15,6 +15,11 @@ class RollMeasure(StatelessFeature):
     window: int = 50
     min_periods: int = 20
 
+    @property
+    def lookback(self) -> int:
+        # diff + shift(1) + window
+        return int(self.window) + 1
+
     def transform(self, df: pd.DataFrame) -> pd.Series:
         m = _as_series(df, list(self.input_cols)[0]).astype(float)
         dm = m.diff()
@@ -32,6 +37,10 @@ class VPINApprox(StatelessFeature):
     """
     bucket: int = 50  # rolling window size
 
+    @property
+    def lookback(self) -> int:
+        return int(self.bucket) - 1
+
     def transform(self, df: pd.DataFrame) -> pd.Series:
         cols = list(self.input_cols)
         r = _as_series(df, cols[0]).astype(float)
@@ -45,6 +45,30 @@ class FeaturePipeline:
             curr[f.output_col] = s        # <- make new output available downstream
         return pd.DataFrame(out, index=df.index)
 
+    def lookback(self) -> int:
+        """
+        Trailing rows before the last one that the last row's features depend on. Chained
+        features add up: a 30-row volatility of 1-row log returns needs 29 + 1 earlier rows.
+        """
+        if not self.features:
+            self.build()
+        need: Dict[str, int] = {}
+        for f in self.features:
+            upstream = max((need.get(c, 0) for c in f.input_cols), default=0)
+            need[f.output_col] = f.lookback + upstream
+        return max(need.values(), default=0)
+
+    def transform_last(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Features of the last row of `df`, computed over only its last lookback() + 1 rows, so
+        the cost does not grow with history. Same values as transform(df).iloc[[-1]] (up to
+        EWM truncation, see features.ta.EWM_TAIL_TOL).
+        """
+        if not self.features:
+            self.build()
+        if any(f.requires_fit for f in self.features):
+            raise ValueError("transform_last needs stateless features; fitted features see all history")
+        return self.transform(df.iloc[-(self.lookback() + 1):]).iloc[[-1]]
 
     def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
         return self.fit(df).transform(df)
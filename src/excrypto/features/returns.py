@@ -10,6 +10,10 @@ class SimpleReturns(StatelessFeature):
     """
     Simple returns: r_t = (P_t / P_{t-1}) - 1
     """
+    @property
+    def lookback(self) -> int:
+        return 1
+
     def transform(self, df: pd.DataFrame) -> pd.Series:
         price = _as_series(df, list(self.input_cols)[0]).astype(float)
         ret = price.pct_change()
@@ -20,6 +24,10 @@ class LogReturns(StatelessFeature):
     """
     Log returns: ln(P_t) - ln(P_{t-1})
     """
+    @property
+    def lookback(self) -> int:
+        return 1
+
     def transform(self, df: pd.DataFrame) -> pd.Series:
         price = _as_series(df, list(self.input_cols)[0]).astype(float)
         logp = np.log(price.replace(0, pd.NA))
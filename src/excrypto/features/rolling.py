@@ -11,6 +11,10 @@ class _RollingBase(StatelessFeature):
     window: int = 20
     min_periods: int = 5
 
+    @property
+    def lookback(self) -> int:
+        return int(self.window) - 1
+
 @register_feature("rolling_mean")
 class RollingMean(_RollingBase):
     def transform(self, df: pd.DataFrame) -> pd.Series:
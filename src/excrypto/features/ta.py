@@ -1,16 +1,31 @@
 from __future__ import annotations
+import math
 import pandas as pd
 from dataclasses import dataclass
 from .base import StatelessFeature
 from .registry import register_feature
 from .utils import _as_series
 
+# EWMs have unbounded memory; a tail of n rows weighs the history it drops by (1 - alpha)^n
+EWM_TAIL_TOL = 1e-12
+
+
+def _ewm_lookback(span: int, tol: float = EWM_TAIL_TOL) -> int:
+    decay = 1.0 - 2.0 / (span + 1.0)
+    return int(math.ceil(math.log(tol) / math.log(decay))) if decay > 0 else 0
+
+
 @register_feature("rsi")
 @dataclass
 class RSI(StatelessFeature):
     window: int = 14
     min_periods: int = 5
 
+    @property
+    def lookback(self) -> int:
+        # diff + window
+        return int(self.window)
+
     def transform(self, df: pd.DataFrame) -> pd.Series:
         price = _as_series(df, list(self.input_cols)[0]).astype(float)
         delta = price.diff()
@@ -29,6 +44,11 @@ class MACD(StatelessFeature):
     slow: int = 26
     signal: int = 9
 
+    @property
+    def lookback(self) -> int:
+        """Approximate: the tail's EMAs match full history to ~EWM_TAIL_TOL of the price scale."""
+        return _ewm_lookback(max(self.fast, self.slow)) + _ewm_lookback(self.signal)
+
     def transform(self, df: pd.DataFrame) -> pd.Series:
         price = _as_series(df, list(self.input_cols)[0]).astype(float)
         ema_fast = price.ewm(span=self.fast, adjust=False).mean()
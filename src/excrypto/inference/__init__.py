@@ -1 +1,14 @@
-from .predictor import CryptoPredictor
\ No newline at end of file
+from excrypto.utils.lazy import lazy_exports
+
+# the predictor pulls in shap/matplotlib (via explain); `excrypto.inference.cli` should not
+__getattr__, __all__ = lazy_exports(__name__, {
+    "CryptoPredictor": ".predictor",
+    "PredictionLogWriter": ".prediction_log",
+    "read_prediction_log": ".prediction_log",
+    "compact_segments": ".prediction_log",
+    "list_segments": ".prediction_log",
+    "RunningOutcomes": ".outcomes",
+    "attach_outcomes": ".outcomes",
+    "reconcile": ".outcomes",
+    "read_outcomes": ".outcomes",
+})
@@ -0,0 +1,286 @@
+# src/excrypto/inference/outcomes.py
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from excrypto.inference.prediction_log import _read_jsonl, list_segments
+
+
+@dataclass
+class RunningOutcomes:
+    """
+    Cumulative accuracy / hit-rate / calibration of resolved predictions, updated batch by
+    batch (never recomputed from the whole log). Calibration uses `n_bins` equal-width bins
+    of P(up).
+    """
+    n_bins: int = 10
+    n: int = 0
+    correct: int = 0
+    positives: int = 0
+    pred_up: int = 0
+    hits_up: int = 0
+    pred_down: int = 0
+    hits_down: int = 0
+    n_scored: int = 0
+    brier_sum: float = 0.0
+    logloss_sum: float = 0.0
+    bin_n: list[int] = field(default_factory=list)
+    bin_p: list[float] = field(default_factory=list)
+    bin_y: list[float] = field(default_factory=list)
+    expired: int = 0
+
+    def __post_init__(self) -> None:
+        if not self.bin_n:
+            self.bin_n = [0] * self.n_bins
+            self.bin_p = [0.0] * self.n_bins
+            self.bin_y = [0.0] * self.n_bins
+
+    def update(self, y: np.ndarray, pred: np.ndarray, p_up: np.ndarray) -> None:
+        y = np.asarray(y, dtype=int)
+        pred = np.asarray(pred, dtype=int)
+        p = np.asarray(p_up, dtype=float)
+        self.n += len(y)
+        self.correct += int((y == pred).sum())
+        self.positives += int(y.sum())
+        self.pred_up += int((pred == 1).sum())
+        self.hits_up += int(((pred == 1) & (y == 1)).sum())
+        self.pred_down += int((pred == 0).sum())
+        self.hits_down += int(((pred == 0) & (y == 0)).sum())
+        ok = np.isfinite(p)
+        if ok.any():
+            p, yy = np.clip(p[ok], 0.0, 1.0), y[ok]
+            self.n_scored += int(ok.sum())
+            self.brier_sum += float(((p - yy) ** 2).sum())
+            pc = np.clip(p, 1e-15, 1 - 1e-15)
+            self.logloss_sum += float(-(yy * np.log(pc) + (1 - yy) * np.log(1 - pc)).sum())
+            b = np.minimum((p * self.n_bins).astype(int), self.n_bins - 1)
+            self.bin_n = (np.asarray(self.bin_n) + np.bincount(b, minlength=self.n_bins)).tolist()
+            self.bin_p = (np.asarray(self.bin_p) + np.bincount(b, weights=p, minlength=self.n_bins)).tolist()
+            self.bin_y = (np.asarray(self.bin_y) + np.bincount(b, weights=yy, minlength=self.n_bins)).tolist()
+
+    def summary(self) -> dict[str, Any]:
+        def ratio(a, b):
+            return round(a / b, 6) if b else None
+
+        bins = [
+            {"lo": i / self.n_bins, "hi": (i + 1) / self.n_bins, "n": n,
+             "mean_p": ratio(sp, n), "freq_up": ratio(sy, n)}
+            for i, (n, sp, sy) in enumerate(zip(self.bin_n, self.bin_p, self.bin_y))
+        ]
+        ece = sum(abs(sp - sy) for sp, sy in zip(self.bin_p, self.bin_y)) / self.n_scored if self.n_scored else None
+        return {
+            "n": self.n,
+            "expired": self.expired,
+            "accuracy": ratio(self.correct, self.n),
+            "base_rate_up": ratio(self.positives, self.n),
+            "hit_rate_up": ratio(self.hits_up, self.pred_up),
+            "hit_rate_down": ratio(self.hits_down, self.pred_down),
+            "brier": ratio(self.brier_sum, self.n_scored),
+            "log_loss": ratio(self.logloss_sum, self.n_scored),
+            "ece": round(ece, 6) if ece is not None else None,
+            "calibration": bins,
+        }
+
+
+def _naive_utc(s: pd.Series) -> pd.Series:
+    s = pd.to_datetime(s, format="ISO8601") if s.dtype == object else pd.to_datetime(s)
+    if getattr(s.dt, "tz", None) is not None:
+        s = s.dt.tz_convert("UTC").dt.tz_localize(None)
+    return s.astype("datetime64[ns]")
+
+
+def p_up_of(log: pd.DataFrame) -> np.ndarray:
+    """P(up) per record: `score` (serve) or the predicted class's `probability` (predictor)."""
+    if "score" in log.columns:
+        p = pd.to_numeric(log["score"], errors="coerce").to_numpy(dtype=float)
+        if np.isfinite(p).all():
+            return p
+    else:
+        p = np.full(len(log), np.nan)
+    if "probability" in log.columns and "prediction" in log.columns:
+        q = pd.to_numeric(log["probability"], errors="coerce").to_numpy(dtype=float)
+        pred = pd.to_numeric(log["prediction"], errors="coerce").to_numpy(dtype=float)
+        p = np.where(np.isfinite(p), p, np.where(pred == 1, q, 1.0 - q))
+    return p
+
+
+def attach_outcomes(
+    log: pd.DataFrame,
+    prices: pd.DataFrame,
+    *,
+    tolerance: str | pd.Timedelta = "1h",
+    direction: str = "nearest",
+    horizon: int = 1,
+    time_col: str = "timestamp",
+    price_time_col: str = "open_time",
+    price_col: str = "close",
+    symbol_col: str = "symbol",
+) -> pd.DataFrame:
+    """
+    One merge_asof of every log row onto the price bars: the matched bar (within `tolerance`)
+    and `actual` = 1 if the close `horizon` bars later is higher. `actual` is NaN when no bar
+    matched or the later close does not exist yet. Timestamps are compared as naive UTC.
+    """
+    px = prices.reset_index() if price_time_col not in prices.columns else prices
+    by = symbol_col if symbol_col in log.columns and symbol_col in px.columns else None
+    px = px[[price_time_col, price_col] + ([by] if by else [])].copy()
+    px["_bar"] = _naive_utc(px[price_time_col])
+    px = px.sort_values(([by] if by else []) + ["_bar"], kind="mergesort")
+    close = px[price_col].astype(float)
+    future = close.groupby(px[by]).shift(-horizon) if by else close.shift(-horizon)
+    px["_actual"] = np.where(future.notna(), (future > close).astype(float), np.nan)
+
+    left = log.copy()
+    left["_ts"] = _naive_utc(left[time_col])
+    left["_pos"] = np.arange(len(left))
+    left = left.sort_values("_ts", kind="mergesort")
+    merged = pd.merge_asof(
+        left, px[["_bar", "_actual"] + ([by] if by else [])].sort_values("_bar", kind="mergesort"),
+        left_on="_ts", right_on="_bar", by=by,
+        tolerance=pd.Timedelta(tolerance), direction=direction,
+    )
+    merged = merged.sort_values("_pos", kind="mergesort").set_index(log.index)
+    out = log.copy()
+    out["bar_time"] = merged["_bar"].to_numpy()
+    out["actual"] = merged["_actual"].to_numpy()
+    return out
+
+
+def outcomes_dir(log_path: str | Path) -> Path:
+    log_path = Path(log_path)
+    return log_path.with_name(log_path.stem + ".outcomes")
+
+
+def _read_from(log_path: Path, start_seq: int) -> pd.DataFrame:
+    """Log rows with seq >= start_seq (seq = write order); compacted segments below it are skipped unread."""
+    import pyarrow.parquet as pq
+
+    frames, offset = [], 0
+    for p in list_segments(log_path):
+        if p.suffix == ".parquet":
+            n = int(pq.ParquetFile(p).metadata.num_rows)
+            if offset + n <= start_seq:
+                offset += n
+                continue
+            df = pd.read_parquet(p)
+        else:
+            df = pd.DataFrame(_read_jsonl(p))
+        df.index = pd.RangeIndex(offset, offset + len(df), name="seq")
+        frames.append(df.iloc[max(0, start_seq - offset):])
+        offset += len(df)
+    if not frames:
+        return pd.DataFrame(index=pd.RangeIndex(0, 0, name="seq"))
+    return pd.concat(frames)
+
+
+def _load_state(d: Path, n_bins: int) -> dict[str, Any]:
+    p = d / "state.json"
+    if p.exists():
+        st = json.loads(p.read_text(encoding="utf-8"))
+        st["agg"] = RunningOutcomes(**st["agg"])
+        return st
+    return {"low_water": 0, "resolved_above": [], "parts": 0, "agg": RunningOutcomes(n_bins=n_bins)}
+
+
+def _save_state(d: Path, st: dict[str, Any]) -> None:
+    out = {**st, "agg": asdict(st["agg"]), "summary": st["agg"].summary()}
+    tmp = d / "state.json.tmp"
+    tmp.write_text(json.dumps(out, indent=2), encoding="utf-8")
+    tmp.replace(d / "state.json")
+
+
+def reconcile(
+    log_path: str | Path,
+    prices: pd.DataFrame,
+    *,
+    tolerance: str = "1h",
+    direction: str = "nearest",
+    horizon: int = 1,
+    n_bins: int = 10,
+    price_time_col: str = "open_time",
+    price_col: str = "close",
+) -> dict[str, Any]:
+    """
+    Attach outcomes to every pending prediction of a (segmented) prediction log.
+
+    Only segments at or after the low-water mark (the oldest still-pending seq) are read.
+    Newly resolved rows are written to one new `part-NNNNNN.parquet` next to the log
+    (`<stem>.outcomes/`) and folded into the running aggregates in `state.json`. The log itself
+    is never rewritten. A pending row whose match window lies entirely before the last price
+    bar can never resolve and is recorded as expired.
+    """
+    log_path = Path(log_path)
+    d = outcomes_dir(log_path)
+    d.mkdir(parents=True, exist_ok=True)
+    st = _load_state(d, n_bins)
+    t0 = time.perf_counter()
+
+    log = _read_from(log_path, st["low_water"])
+    done = set(st["resolved_above"])
+    pending = log[~log.index.isin(done)]
+    if pending.empty:
+        return {"scanned": 0, "resolved": 0, "expired": 0, "pending": 0, **st["agg"].summary()}
+
+    res = attach_outcomes(pending, prices, tolerance=tolerance, direction=direction, horizon=horizon,
+                          price_time_col=price_time_col, price_col=price_col)
+    ts = _naive_utc(res["timestamp"])
+    px_ts = _naive_utc((prices.reset_index() if price_time_col not in prices.columns else prices)[price_time_col])
+    last_bar = px_ts.max()
+    resolved = res["actual"].notna().to_numpy()
+    # no bar within tolerance and the panel is already past the window -> will never match
+    expired = (res["bar_time"].isna() & (ts + pd.Timedelta(tolerance) < last_bar)).to_numpy()
+
+    new = res[resolved | expired]
+    if len(new):
+        part = pd.DataFrame({
+            "seq": new.index.to_numpy(),
+            "status": np.where(new["actual"].notna(), "resolved", "expired"),
+            "actual": new["actual"].to_numpy(),
+            "bar_time": new["bar_time"].to_numpy(),
+            "p_up": p_up_of(new),
+            "reconciled_at": pd.Timestamp.now(tz="UTC").isoformat(),
+        })
+        st["parts"] += 1
+        tmp = d / f"part-{st['parts']:06d}.parquet.tmp"
+        part.to_parquet(tmp, index=False)
+        tmp.replace(d / f"part-{st['parts']:06d}.parquet")
+
+        ok = res[resolved]
+        st["agg"].update(ok["actual"].to_numpy(), pd.to_numeric(ok["prediction"]).to_numpy(), p_up_of(ok))
+        st["agg"].expired += int(expired.sum())
+
+    still = pending.index[~(resolved | expired)]
+    handled = done | set(new.index.tolist())
+    low = int(still.min()) if len(still) else int(log.index.max()) + 1
+    st["low_water"] = max(st["low_water"], low)
+    st["resolved_above"] = sorted(s for s in handled if s >= st["low_water"])
+    _save_state(d, st)
+    return {
+        "scanned": int(len(log)),
+        "resolved": int(resolved.sum()),
+        "expired": int(expired.sum()),
+        "pending": int(len(still)),
+        "seconds": round(time.perf_counter() - t0, 4),
+        **st["agg"].summary(),
+    }
+
+
+def read_outcomes(log_path: str | Path) -> pd.DataFrame:
+    """The whole prediction log with `actual` / `status` / `bar_time` from every outcome part."""
+    from excrypto.inference.prediction_log import read_prediction_log
+
+    log = read_prediction_log(log_path)
+    log.index.name = "seq"
+    parts = sorted(outcomes_dir(log_path).glob("part-*.parquet"))
+    if not parts:
+        return log
+    oc = pd.concat([pd.read_parquet(p) for p in parts]).drop_duplicates("seq", keep="last").set_index("seq")
+    log = log.drop(columns=[c for c in ("actual", "status", "bar_time") if c in log.columns])
+    return log.join(oc[["status", "actual", "bar_time"]], how="left")
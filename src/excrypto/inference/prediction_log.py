@@ -0,0 +1,205 @@
+# src/excrypto/inference/prediction_log.py
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Literal
+
+import pandas as pd
+
+try:  # cross-process rotation lock; POSIX only, in-process locking elsewhere
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+FsyncPolicy = Literal["always", "batch", "rotate", "never"]
+
+
+def _segment_re(path: Path) -> re.Pattern:
+    return re.compile(re.escape(path.stem) + r"\.(\d{6})\.(jsonl|parquet)$")
+
+
+def list_segments(log_path: str | Path) -> list[Path]:
+    """
+    Every segment of a prediction log, oldest first: sealed segments `<stem>.NNNNNN.parquet`
+    (compacted) or `.jsonl`, then the active `<stem>.jsonl` itself.
+    """
+    log_path = Path(log_path)
+    pat = _segment_re(log_path)
+    sealed: dict[int, Path] = {}
+    if log_path.parent.exists():
+        for p in log_path.parent.iterdir():
+            m = pat.match(p.name)
+            # a parquet segment wins over a jsonl left behind by an interrupted compaction
+            if m and (int(m.group(1)) not in sealed or m.group(2) == "parquet"):
+                sealed[int(m.group(1))] = p
+    out = [sealed[k] for k in sorted(sealed)]
+    if log_path.exists():
+        out.append(log_path)
+    return out
+
+
+def _read_jsonl(path: Path) -> list[dict[str, Any]]:
+    rows = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rows.append(json.loads(line))
+            except json.JSONDecodeError:
+                # a torn last line from a crash mid-write; everything before it is intact
+                continue
+    return rows
+
+
+def read_prediction_log(log_path: str | Path, columns: list[str] | None = None) -> pd.DataFrame:
+    """All records of a (possibly rotated and compacted) prediction log, in write order."""
+    frames = []
+    for p in list_segments(log_path):
+        if p.suffix == ".parquet":
+            df = pd.read_parquet(p, columns=columns)
+        else:
+            df = pd.DataFrame(_read_jsonl(p))
+            if columns is not None:
+                df = df.reindex(columns=columns)
+        if not df.empty:
+            frames.append(df)
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)
+
+
+def compact_segments(log_path: str | Path, *, keep: int = 1) -> list[Path]:
+    """
+    Rewrite sealed jsonl segments as parquet, except the newest `keep` (a writer in another
+    process may still hold the segment it just rotated). Returns the parquet files written.
+    """
+    log_path = Path(log_path)
+    sealed = [p for p in list_segments(log_path) if p != log_path]
+    todo = [p for p in sealed[:max(0, len(sealed) - keep)] if p.suffix == ".jsonl"]
+    written = []
+    for p in todo:
+        df = pd.DataFrame(_read_jsonl(p))
+        out = p.with_suffix(".parquet")
+        tmp = out.with_suffix(".parquet.tmp")
+        df.to_parquet(tmp, index=False)
+        tmp.replace(out)
+        p.unlink()
+        written.append(out)
+    return written
+
+
+@dataclass
+class PredictionLogWriter:
+    """
+    Append-only JSONL prediction log with size-based rotation.
+
+    Records are buffered and written `flush_every` at a time (or once the oldest is
+    `flush_seconds` old) with a single O_APPEND write, so concurrent writers never interleave
+    or overwrite lines. fsync: "always" after every record, "batch" after every flush,
+    "rotate" only when a segment is sealed, "never" leaves it to the OS.
+
+    When the active file passes `rotate_bytes` it is renamed to `<stem>.NNNNNN.jsonl` and a
+    fresh one is started; with `compact_keep` set, older sealed segments are then compacted to
+    parquet (see compact_segments). Read everything back with read_prediction_log.
+    """
+    path: Path
+    flush_every: int = 64
+    flush_seconds: float | None = 5.0
+    fsync: FsyncPolicy = "batch"
+    rotate_bytes: int | None = 16 << 20
+    compact_keep: int | None = 1
+    _buf: list[str] = field(default_factory=list, repr=False)
+    _first_ts: float | None = field(default=None, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    records_written: int = 0
+
+    def __post_init__(self) -> None:
+        self.path = Path(self.path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.fsync not in ("always", "batch", "rotate", "never"):
+            raise ValueError(f"Unknown fsync policy '{self.fsync}'")
+
+    def append(self, record: dict[str, Any]) -> None:
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            if not self._buf:
+                self._first_ts = time.monotonic()
+            self._buf.append(line)
+            due = (
+                self.fsync == "always"
+                or len(self._buf) >= self.flush_every
+                or (self.flush_seconds is not None and time.monotonic() - self._first_ts >= self.flush_seconds)
+            )
+            if due:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "PredictionLogWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _flush_locked(self) -> None:
+        if not self._buf:
+            return
+        data = "".join(self._buf).encode("utf-8")
+        # open per batch: a rotation by another process never leaves us writing to a sealed file
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+            if self.fsync in ("always", "batch"):
+                os.fsync(fd)
+            size = os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+        self.records_written += len(self._buf)
+        self._buf.clear()
+        self._first_ts = None
+        if self.rotate_bytes is not None and size >= self.rotate_bytes:
+            self._rotate()
+
+    @contextmanager
+    def _rotation_lock(self) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        with open(self.path.with_name(self.path.name + ".lock"), "a") as lf:
+            fcntl.flock(lf, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lf, fcntl.LOCK_UN)
+
+    def _rotate(self) -> None:
+        with self._rotation_lock():
+            # another writer may have rotated between our write and the lock
+            if not self.path.exists() or self.path.stat().st_size < self.rotate_bytes:
+                return
+            sealed = [p for p in list_segments(self.path) if p != self.path]
+            seq = int(_segment_re(self.path).match(sealed[-1].name).group(1)) + 1 if sealed else 1
+            target = self.path.with_name(f"{self.path.stem}.{seq:06d}.jsonl")
+            if self.fsync != "never":
+                fd = os.open(self.path, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            os.replace(self.path, target)
+            if self.compact_keep is not None:
+                compact_segments(self.path, keep=self.compact_keep)
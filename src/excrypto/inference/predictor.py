@@ -1,10 +1,60 @@
 from pathlib import Path
-import json, joblib
+import io
+import json
+import time
 import pandas as pd
 from datetime import datetime
 
 from excrypto.utils import load_cfg, load_latest_model
 from excrypto.explain.explainer import ModelExplainer
+from excrypto.features import FeaturePipeline
+from excrypto.inference.prediction_log import PredictionLogWriter
+from excrypto.ml.registry import get_registry
+
+
+def _read_csv_tail(path: Path, n_rows: int, *, parse_dates=None, block: int = 1 << 16) -> pd.DataFrame:
+    """Header + last n_rows lines of a CSV, read backwards from EOF in `block`-byte steps."""
+    with open(path, "rb") as f:
+        header = f.readline()
+        start = f.tell()
+        end = f.seek(0, io.SEEK_END)
+        pos, tail = end, b""
+        # n_rows + 1 newlines guarantees n_rows complete lines (the first piece may be partial)
+        while pos > start and tail.count(b"\n") <= n_rows:
+            step = min(block, pos - start)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+    lines = tail.splitlines(keepends=True)
+    if pos > start:
+        lines = lines[1:]
+    body = b"".join(lines[-n_rows:]) if n_rows > 0 else b""
+    return pd.read_csv(io.BytesIO(header + body), parse_dates=parse_dates)
+
+
+def _read_parquet_tail(path: Path, n_rows: int) -> pd.DataFrame:
+    """Last n_rows of a parquet file, reading only the trailing row groups."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    pf = pq.ParquetFile(path)
+    groups, have = [], 0
+    for i in reversed(range(pf.num_row_groups)):
+        groups.insert(0, i)
+        have += pf.metadata.row_group(i).num_rows
+        if have >= n_rows:
+            break
+    table = pf.read_row_groups(groups) if groups else pf.schema_arrow.empty_table()
+    return table.slice(max(0, table.num_rows - n_rows)).to_pandas()
+
+
+def read_tail(path: str | Path, n_rows: int, *, time_col: str = "open_time") -> pd.DataFrame:
+    """The trailing n_rows of a CSV or parquet price file without reading the rest of it."""
+    path = Path(path)
+    if path.suffix == ".parquet":
+        return _read_parquet_tail(path, n_rows)
+    return _read_csv_tail(path, n_rows, parse_dates=[time_col])
+
 
 class CryptoPredictor:
     def __init__(self, config_path="config/predict.yaml"):
@@ -17,42 +67,91 @@ class CryptoPredictor:
             raise ValueError("Model metadata missing 'features'. "
                             "Ensure the trainer saved features in the _meta.json.")
 
-        # allow other pipeline knobs from config but enforce feature list from metadata
-        feat_cfg = {**self.config.get("features", {})}
-        feat_cfg["features"] = list(feat_list)
+        # pipeline specs from config (or the model's metadata); model columns from metadata
+        feat_cfg = self.config.get("features", {}) or {}
+        specs = feat_cfg.get("specs") or self.metadata.get("feature_specs") or []
+        self.pipe = FeaturePipeline(specs).build()
+        self.features = list(feat_list)
 
-        self.pipe = FeaturePipeline(FeatureConfig(**feat_cfg))
-        self.features = self.pipe.cfg.features
+        # tail mode: read and featurize only the rows the last prediction depends on
+        self.tail = bool(feat_cfg.get("tail", True))
+        self.time_col = feat_cfg.get("time_col", "open_time")
+        self.last_feature_stats: dict = {}
 
-        # logging
-        log_path = (self.config.get("logging", {}) or {}).get("log_path", "logs/inference_log.jsonl")
-        self.log_path = Path(log_path)
-        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        # logging: append-only, rotated segments (see inference.prediction_log)
+        log_cfg = self.config.get("logging", {}) or {}
+        self.log_path = Path(log_cfg.get("log_path", "logs/inference_log.jsonl"))
+        self.log = PredictionLogWriter(
+            self.log_path,
+            # one-shot CLI runs write a single record; long-lived callers should batch
+            flush_every=int(log_cfg.get("flush_every", 1)),
+            flush_seconds=log_cfg.get("flush_seconds", 5.0),
+            fsync=log_cfg.get("fsync", "batch"),
+            rotate_bytes=log_cfg.get("rotate_bytes", 16 << 20),
+            compact_keep=log_cfg.get("compact_keep", 1),
+        )
 
         # optional: allow disabling explain via config
-        self.do_explain = (self.config.get("logging", {}) or {}).get("explain", True)
+        self.do_explain = log_cfg.get("explain", True)
 
     def load_model(self):
         model_path = self.config.get("model_path")
         if model_path:
             print(f"📦 Loading model from config path: {model_path}")
-            model = joblib.load(model_path)
+            # a model file, an ML manifest or a latest_manifest.json pointer
+            loaded = get_registry().resolve(model_path, runs_root=Path(self.config.get("runs_root", "runs")))
             # minimal metadata if file-only provided; trainer should have saved features in meta
-            meta = {"model_path": model_path}
+            meta = {"model_path": str(loaded.path), "load_seconds": loaded.load_seconds}
+            if loaded.feature_cols:
+                meta["features"] = loaded.feature_cols
             # try to load sibling _meta.json to fetch features
-            meta_path = Path(model_path).with_name(Path(model_path).stem + "_meta.json")
+            meta_path = loaded.path.with_name(loaded.path.stem + "_meta.json")
             if meta_path.exists():
                 meta.update(json.loads(meta_path.read_text(encoding="utf-8")))
-            return model, meta
+            return loaded.model, meta
         print("📦 Loading latest available model...")
         return load_latest_model()  # expected to return (model, metadata)
 
+    def _read_all(self) -> pd.DataFrame:
+        path = Path(self.config["data_path"])
+        if path.suffix == ".parquet":
+            return pd.read_parquet(path)
+        return pd.read_csv(path, parse_dates=[self.time_col])
+
+    @staticmethod
+    def _join(df: pd.DataFrame, feats: pd.DataFrame) -> pd.DataFrame:
+        # raw columns (e.g. sentiment_score) can be model inputs next to pipeline outputs
+        return pd.concat([df.loc[feats.index].drop(columns=feats.columns, errors="ignore"), feats], axis=1)
+
     def load_latest_features(self):
-        df = pd.read_csv(self.config["data_path"], parse_dates=["open_time"])
-        X, _ = self.pipe.transform(df, compute_label=False)
-        if X.empty:
-            raise ValueError("No valid feature rows after preprocessing.")
-        return X.iloc[[-1]]
+        """
+        Feature row of the last bar with every feature present. In tail mode only the pipeline's
+        lookback() + 1 trailing rows are read and featurized, so latency is flat in history length;
+        when the latest bar has a missing feature it falls back to full mode, which scores the
+        last complete row as before.
+        """
+        t0 = time.perf_counter()
+        tail = self.tail and not any(f.requires_fit for f in self.pipe.features)
+        fallback = False
+        if tail:
+            df = read_tail(self.config["data_path"], self.pipe.lookback() + 1, time_col=self.time_col)
+            X = self._join(df, self.pipe.transform_last(df))[self.features]
+            if X.empty or X.isna().any(axis=None):
+                tail, fallback = False, True
+        if not tail:
+            df = self._read_all()
+            X = self._join(df, self.pipe.transform(df))[self.features].dropna()
+            if X.empty:
+                raise ValueError("No valid feature rows after preprocessing.")
+            X = X.iloc[[-1]]
+        X = X.astype(float)
+        self.last_feature_stats = {
+            "mode": "tail" if tail else "full",
+            "tail_fallback": fallback,
+            "rows_read": int(len(df)),
+            "seconds": round(time.perf_counter() - t0, 6),
+        }
+        return X
 
     def predict(self, X):
         pred = int(self.model.predict(X)[0])
@@ -82,11 +181,10 @@ class CryptoPredictor:
             "prediction": pred,
             "probability": proba,
             "sentiment_score": sentiment,
+            "feature_stats": self.last_feature_stats,
             "actual": None,
         }
-        # append JSONL
-        self.log_path.write_text(
-            (self.log_path.read_text(encoding="utf-8") if self.log_path.exists() else "")
-            + json.dumps(log_entry) + "\n",
-            encoding="utf-8",
-        )
+        self.log.append(log_entry)
+
+    def close(self):
+        self.log.close()
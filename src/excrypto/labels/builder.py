@@ -2,19 +2,30 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 from typing import Any, Literal
 
 import hashlib
+import itertools
 import json
+import numpy as np
 import pandas as pd
 
 from excrypto.utils.paths import RunPaths
-from excrypto.labels.labelers import fixed_horizon_return, triple_barrier
+from excrypto.labels.labelers import (
+    barrier_vol,
+    classify_returns,
+    forward_log_returns,
+    triple_barrier_from_arrays,
+)
+from excrypto.utils.parallel import apply_by_group
 from excrypto.ml.resolve import write_latest_pointer
 
 
 NanPolicy = Literal["keep", "drop_any"]
+# one canonical label dict, or a list of them (grid / multi-label build)
+CanonSpec = dict[str, Any] | list[dict[str, Any]]
 
 
 @dataclass(frozen=True)
@@ -26,6 +37,7 @@ class LabelsArtifact:
     n_rows_out: int
     label_col: str
     params_hash: str
+    label_cols: tuple[str, ...] = ()
 
 
 def _hash_obj(obj: dict[str, Any]) -> str:
@@ -85,63 +97,213 @@ def canonical_label_params(kind: str, params: dict[str, Any]) -> dict[str, Any]:
 def label_col_name(canon: dict[str, Any]) -> str:
     if canon["kind"] == "fixed_horizon_return":
         h = canon["horizon"]
-        return f"fh_lbl_{h}" if canon["as_class"] else f"fh_ret_{h}"
+        if not canon["as_class"]:
+            return f"fh_ret_{h}"
+        # thr only shows up when non-zero so existing fh_lbl_<h> names stay stable
+        return f"fh_lbl_{h}" if canon["thr"] == 0.0 else f"fh_lbl_{h}_t{canon['thr']}"
     if canon["kind"] == "triple_barrier":
         return f"tb_lbl_h{canon['horizon']}_u{canon['up_mult']}_d{canon['dn_mult']}_w{canon['vol_window']}"
     raise ValueError(f"Unknown canonical kind '{canon['kind']}'")
 
 
+def expand_label_grid(grid: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Expand a labels `grid:` config into canonical label params.
+
+    Each entry is a regular label config (must include `kind`) whose values may be lists;
+    list-valued keys are swept as a cartesian product, e.g.
+
+      grid:
+        - { kind: fh, horizon: [6, 24, 96, 288], thr: [0.0, 0.002] }
+        - { kind: tb, horizon: [24, 96], up_mult: [1.0, 2.0], dn_mult: [1.0, 2.0] }
+
+    Exact duplicates are dropped; two different params mapping to one label column raise.
+    """
+    canons: list[dict[str, Any]] = []
+    seen: dict[str, dict[str, Any]] = {}
+    for entry in grid:
+        entry = dict(entry)
+        if "kind" not in entry:
+            raise ValueError(f"label grid entry missing 'kind': {entry}")
+        kind = str(entry.pop("kind"))
+        keys = list(entry)
+        values = [v if isinstance(v, list) else [v] for v in entry.values()]
+        for combo in itertools.product(*values):
+            canon = canonical_label_params(kind, dict(zip(keys, combo)))
+            col = label_col_name(canon)
+            if col in seen:
+                if seen[col] != canon:
+                    raise ValueError(f"Label grid maps different params to the same column '{col}'")
+                continue
+            seen[col] = canon
+            canons.append(canon)
+    if not canons:
+        raise ValueError("Label grid is empty.")
+    return canons
+
+
+def _as_canon_list(canon: CanonSpec) -> list[dict[str, Any]]:
+    return [canon] if isinstance(canon, dict) else list(canon)
+
+
+def _label_group(
+    g: pd.DataFrame,
+    *,
+    canons: list[dict[str, Any]],
+    lbl_cols: list[str],
+    group_col: str,
+    time_col: str,
+) -> pd.DataFrame:
+    """
+    Label one symbol's rows for every requested label (module-level so it can be shipped to
+    worker processes). Log prices, the forward-return matrix and barrier vol are computed once
+    per group and shared across label columns.
+    """
+    g = g.sort_values(time_col)
+
+    prices: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+    for pc in dict.fromkeys(c["price_col"] for c in canons):
+        p_arr = g[pc].astype(float).to_numpy()
+        prices[pc] = (p_arr, np.log(p_arr))
+
+    # one forward log-return matrix per price col, over all distinct fh horizons
+    fwd: dict[str, tuple[np.ndarray, dict[int, int]]] = {}
+    for pc in prices:
+        hs = sorted({int(c["horizon"]) for c in canons
+                     if c["kind"] == "fixed_horizon_return" and c["price_col"] == pc})
+        if hs:
+            fwd[pc] = (forward_log_returns(prices[pc][1], hs), {h: j for j, h in enumerate(hs)})
+
+    vols: dict[tuple[Any, ...], np.ndarray] = {}
+    cols: dict[str, np.ndarray] = {}
+    for canon, col in zip(canons, lbl_cols):
+        pc = canon["price_col"]
+        p_arr, logp = prices[pc]
+        if canon["kind"] == "fixed_horizon_return":
+            mat, pos = fwd[pc]
+            f = mat[:, pos[int(canon["horizon"])]]
+            cols[col] = classify_returns(f, float(canon["thr"])) if canon["as_class"] else f
+        else:
+            vkey = (pc, int(canon["vol_window"]), canon.get("min_periods", None))
+            if vkey not in vols:
+                vols[vkey] = barrier_vol(logp, vkey[1], vkey[2])
+            cols[col] = triple_barrier_from_arrays(
+                p_arr,
+                logp,
+                vols[vkey],
+                horizon=int(canon["horizon"]),
+                up_mult=float(canon["up_mult"]),
+                dn_mult=float(canon["dn_mult"]),
+                tail_value=int(canon.get("tail_value", 0)),
+            )
+
+    out = g[[time_col, group_col]].copy()
+    return pd.concat([out, pd.DataFrame(cols, index=g.index)], axis=1)
+
+
+def _fh_labels_panel(
+    panel: pd.DataFrame,
+    canons: list[dict[str, Any]],
+    lbl_cols: list[str],
+    *,
+    group_col: str,
+    time_col: str,
+) -> pd.DataFrame:
+    """
+    Fixed-horizon labels for the whole panel without groupby.apply.
+
+    Sorts once by (symbol, time), derives group end offsets, and takes the forward shift as
+    `row + h` masked where it would cross into the next symbol. Row order of the result
+    follows groupby.apply: original panel order when every symbol's rows are already in time
+    order, otherwise (symbol, time) order. Rows with a null symbol are dropped, as groupby does.
+    Assumes (symbol, time) keys are unique.
+    """
+    codes, _ = pd.factorize(panel[group_col], sort=True)
+    order = np.lexsort((panel[time_col].values, codes))
+    order = order[codes[order] >= 0]
+    sc = codes[order]
+    m = len(order)
+
+    # exclusive end offset (in sorted space) of each row's symbol block
+    starts = np.flatnonzero(np.r_[True, sc[1:] != sc[:-1]]) if m else np.array([], dtype=int)
+    ends = np.r_[starts[1:], m]
+    group_end = np.repeat(ends, np.diff(np.r_[starts, m]))
+    rows = np.arange(m)
+
+    cols: dict[str, np.ndarray] = {}
+    for pc in dict.fromkeys(c["price_col"] for c in canons):
+        logp = np.log(panel[pc].astype(float).to_numpy()[order])
+        for canon, col in zip(canons, lbl_cols):
+            if canon["price_col"] != pc:
+                continue
+            h = int(canon["horizon"])
+            if h <= 0:
+                raise ValueError("horizon must be > 0")
+            fwd = np.full(m, np.nan, dtype=float)
+            ok = rows + h < group_end
+            fwd[ok] = logp[rows[ok] + h] - logp[rows[ok]]
+            cols[col] = classify_returns(fwd, float(canon["thr"])) if canon["as_class"] else fwd
+
+    # groupby.apply returns transform-like results in original order
+    same_group = sc[1:] == sc[:-1]
+    if np.all(np.diff(order)[same_group] > 0):
+        back = np.argsort(order, kind="stable")
+        order = order[back]
+        cols = {k: v[back] for k, v in cols.items()}
+
+    out = panel[[time_col, group_col]].iloc[order].reset_index(drop=True)
+    return pd.concat([out, pd.DataFrame({c: cols[c] for c in lbl_cols})], axis=1)
+
+
 def build_labels_frame(
     panel: pd.DataFrame,
     *,
-    canon: dict[str, Any],
+    canon: CanonSpec,
     group_col: str = "symbol",
     time_col: str = "timestamp",
     nan_policy: NanPolicy = "keep",
+    workers: int = 1,
 ) -> pd.DataFrame:
     """
-    Returns a DataFrame with [time_col, group_col, label_col] (and keeps row order where possible).
+    Returns a DataFrame with [time_col, group_col, label_col...] (and keeps row order where possible).
+
+    `canon` is one canonical label dict, or a list of them (see expand_label_grid) to build
+    many label columns in a single pass over the panel.
+
+    Fixed-horizon-only requests take a panel-level vectorized path (`_fh_labels_panel`);
+    anything involving triple barrier goes per symbol, and workers > 1 labels symbols in a
+    process pool (see utils.parallel.apply_by_group). Both give identical output to the
+    per-symbol serial path.
     """
+    canons = _as_canon_list(canon)
     for col in (time_col, group_col):
         if col not in panel.columns:
             raise ValueError(f"panel missing required column '{col}'")
 
-    price_col = canon["price_col"]
-    if price_col not in panel.columns:
-        raise ValueError(f"panel missing price column '{price_col}'")
-
-    lbl_col = label_col_name(canon)
-
-    def _label_one(g: pd.DataFrame) -> pd.DataFrame:
-        g = g.sort_values(time_col)
-        price = g[price_col]
-        if canon["kind"] == "fixed_horizon_return":
-            s = fixed_horizon_return(
-                price,
-                horizon=int(canon["horizon"]),
-                as_class=bool(canon["as_class"]),
-                thr=float(canon["thr"]),
-                name=lbl_col,
-            )
-        else:
-            s = triple_barrier(
-                price,
-                horizon=int(canon["horizon"]),
-                up_mult=float(canon["up_mult"]),
-                dn_mult=float(canon["dn_mult"]),
-                vol_window=int(canon["vol_window"]),
-                min_periods=canon.get("min_periods", None),
-                tail_value=int(canon.get("tail_value", 0)),
-                name=lbl_col,
-            )
-        out = g[[time_col, group_col]].copy()
-        out[lbl_col] = s.to_numpy()
-        return out
-
-    labels = panel.groupby(group_col, group_keys=False).apply(_label_one).reset_index(drop=True)
+    price_cols = list(dict.fromkeys(c["price_col"] for c in canons))
+    for price_col in price_cols:
+        if price_col not in panel.columns:
+            raise ValueError(f"panel missing price column '{price_col}'")
+
+    lbl_cols = [label_col_name(c) for c in canons]
+    if len(set(lbl_cols)) != len(lbl_cols):
+        raise ValueError(f"Duplicate label columns requested: {lbl_cols}")
+
+    if all(c["kind"] == "fixed_horizon_return" for c in canons):
+        # pure index arithmetic over the whole panel; no per-symbol Python work to parallelize
+        labels = _fh_labels_panel(panel, canons, lbl_cols, group_col=group_col, time_col=time_col)
+    else:
+        label_one = partial(
+            _label_group, canons=canons, lbl_cols=lbl_cols, group_col=group_col, time_col=time_col
+        )
+        # only ship the columns labelers need to the workers
+        cols = list(dict.fromkeys([time_col, group_col, *price_cols]))
+        labels = apply_by_group(
+            panel[cols].reset_index(drop=True), label_one, group_col=group_col, workers=workers
+        ).reset_index(drop=True)
 
     if nan_policy == "drop_any":
-        labels = labels.dropna(subset=[lbl_col]).reset_index(drop=True)
+        labels = labels.dropna(subset=lbl_cols).reset_index(drop=True)
 
     return labels
 
@@ -150,15 +312,22 @@ def write_labels_artifact(
     runpaths: RunPaths,
     labels: pd.DataFrame,
     *,
-    canon: dict[str, Any],
+    canon: CanonSpec,
     extra_manifest: dict[str, Any] | None = None,
     ensure_report_dir: bool = False,
 ) -> LabelsArtifact:
+    """
+    Multi-label (grid) artifacts keep `label` pointing at the first column for single-label
+    consumers and list every column with its canonical params under `labels`.
+    """
     runpaths.ensure(report=ensure_report_dir)
 
-    lbl_col = label_col_name(canon)
-    if lbl_col not in labels.columns:
-        raise ValueError(f"labels output missing expected label column '{lbl_col}'")
+    canons = _as_canon_list(canon)
+    lbl_cols = [label_col_name(c) for c in canons]
+    missing = [c for c in lbl_cols if c not in labels.columns]
+    if missing:
+        raise ValueError(f"labels output missing expected label columns {missing}")
+    lbl_col = lbl_cols[0]
 
     # Write labels.parquet
     _atomic_write_parquet(labels, runpaths.labels)
@@ -167,7 +336,7 @@ def write_labels_artifact(
     # here it's just the labels frame.
     _atomic_write_parquet(labels, runpaths.panel)
 
-    params_hash = _hash_obj(canon)
+    params_hash = _hash_obj(canons[0]) if isinstance(canon, dict) else _hash_obj({"grid": canons})
 
     manifest: dict[str, Any] = {
         "kind": "labels",
@@ -180,9 +349,13 @@ def write_labels_artifact(
         "params": runpaths.params,
         "label": {
             "label_col": lbl_col,
-            "canon": canon,
-            "params_hash": params_hash,
+            "canon": canons[0],
+            "params_hash": _hash_obj(canons[0]),
         },
+        "labels": [
+            {"label_col": col, "canon": c, "params_hash": _hash_obj(c)}
+            for col, c in zip(lbl_cols, canons)
+        ],
         "paths": {
             "labels": str(runpaths.labels),
             "panel": str(runpaths.panel),
@@ -194,6 +367,8 @@ def write_labels_artifact(
             "max": str(labels["timestamp"].max()) if "timestamp" in labels.columns else None,
         },
     }
+    if not isinstance(canon, dict):
+        manifest["grid"] = {"n_labels": len(canons), "params_hash": params_hash}
     if extra_manifest:
         manifest.update(extra_manifest)
 
@@ -217,18 +392,20 @@ def write_labels_artifact(
         n_rows_out=int(labels.shape[0]),
         label_col=lbl_col,
         params_hash=params_hash,
+        label_cols=tuple(lbl_cols),
     )
 
 
 def build_and_write_labels(
     panel: pd.DataFrame,
     *,
-    canon: dict[str, Any],
+    canon: CanonSpec,
     runpaths: RunPaths,
     group_col: str = "symbol",
     time_col: str = "timestamp",
     nan_policy: NanPolicy = "keep",
     extra_manifest: dict[str, Any] | None = None,
+    workers: int = 1,
 ) -> LabelsArtifact:
     labels = build_labels_frame(
         panel,
@@ -236,6 +413,7 @@ def build_and_write_labels(
         group_col=group_col,
         time_col=time_col,
         nan_policy=nan_policy,
+        workers=workers,
     )
     return write_labels_artifact(
         runpaths,
@@ -10,7 +10,7 @@ import typer
 
 from excrypto.utils.config import cfg_hash, load_cfg
 from excrypto.utils.paths import RunPaths
-from excrypto.labels.builder import build_and_write_labels, canonical_label_params
+from excrypto.labels.builder import build_and_write_labels, canonical_label_params, expand_label_grid
 
 app = typer.Typer(add_completion=False)
 
@@ -29,6 +29,7 @@ def build(
     config: Path | None = typer.Option(None, exists=True, dir_okay=False, help="YAML/JSON label config."),
     runs_root: Path = typer.Option(Path("runs"), help="Artifact root directory."),
     nan_policy: str = typer.Option("keep", help="NaN handling: keep | drop_any"),
+    workers: int = typer.Option(1, help="Process-pool size for per-symbol builds (1 = serial, -1 = all cores)."),
     # common FH params (also usable as overrides)
     horizon: int = typer.Option(24, help="Forward horizon in bars."),
     thr: float = typer.Option(0.0, help="FH classification threshold (log-return)."),
@@ -41,6 +42,9 @@ def build(
     """
     Build labels for a snapshot + symbol universe.
     Thin CLI wrapper: load -> call builder -> print paths.
+
+    If the config has a `grid:` list, every swept label is built in one pass into a single
+    multi-label artifact (CLI param overrides are ignored in that mode).
     """
     syms = _parse_symbols(symbols)
 
@@ -75,7 +79,10 @@ def build(
     # Only keep non-None overrides
     merged = {**base_params, **{k: v for k, v in overrides.items() if v is not None}}
 
-    canon = canonical_label_params(kind if config is None else merged.get("kind", kind), merged)
+    if "grid" in base_params:
+        canon = expand_label_grid(base_params["grid"])
+    else:
+        canon = canonical_label_params(kind if config is None else merged.get("kind", kind), merged)
 
     lbl_paths = RunPaths(
         snapshot=snapshot,
@@ -92,6 +99,7 @@ def build(
         runpaths=lbl_paths,
         nan_policy="drop_any" if nan_policy == "drop_any" else "keep",
         extra_manifest={"exchange": exchange, "input_panel": str(panel_path)},
+        workers=workers,
     )
 
     typer.echo(
@@ -101,6 +109,7 @@ def build(
                 "panel": str(artifact.panel_path),
                 "manifest": str(artifact.manifest_path),
                 "label_col": artifact.label_col,
+                "label_cols": list(artifact.label_cols),
                 "params_hash": artifact.params_hash,
             },
             indent=2,
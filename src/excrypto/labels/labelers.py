@@ -26,19 +26,15 @@ def fixed_horizon_return(
     if horizon <= 0:
         raise ValueError("horizon must be > 0")
 
-    p = price.astype(float)
-    logp = np.log(p)
-    fwd = logp.shift(-horizon) - logp
+    logp = np.log(price.astype(float).to_numpy())
+    fwd = forward_log_returns(logp, [horizon])[:, 0]
 
     if not as_class:
         out_name = name or f"fh_ret_{horizon}"
-        return fwd.rename(out_name)
+        return pd.Series(fwd, index=price.index, name=out_name)
 
-    # Classification: keep unlabeled tail as 0 (common for pipelines that later drop/ignore)
-    arr = fwd.to_numpy()
-    labels = np.where(arr > thr, 1, np.where(arr < -thr, -1, 0)).astype(int)
     out_name = name or f"fh_lbl_{horizon}"
-    return pd.Series(labels, index=price.index, name=out_name)
+    return pd.Series(classify_returns(fwd, thr), index=price.index, name=out_name)
 
 
 def triple_barrier(
@@ -60,58 +56,125 @@ def triple_barrier(
     - Removes unused variables and makes edge cases explicit.
     - Avoids backfilling volatility (which can leak future info). Uses ffill then fills remaining with 0.
     - Clearly defines how the last `horizon` rows are handled (tail_value).
+    - First-touch search is vectorized over blocks of start bars (see `_first_touch`), so cost
+      is NumPy work rather than one Python iteration per bar.
     """
     if horizon <= 0:
         raise ValueError("horizon must be > 0")
     if vol_window <= 1:
         raise ValueError("vol_window must be > 1")
 
-    p = price.astype(float)
-    logret = np.log(p).diff()
+    p_arr = price.astype(float).to_numpy()
+    logp = np.log(p_arr)
+    vol = barrier_vol(logp, vol_window, min_periods)
 
-    mp = min_periods if min_periods is not None else max(5, vol_window // 5)
-    vol = (
-        logret.rolling(vol_window, min_periods=mp)
-        .std(ddof=0)
-        .ffill()               # do NOT bfill (future leakage)
-        .fillna(0.0)
+    out = triple_barrier_from_arrays(
+        p_arr, logp, vol, horizon=horizon, up_mult=up_mult, dn_mult=dn_mult, tail_value=tail_value
     )
+    out_name = name or f"tb_lbl_h{horizon}_u{up_mult}_d{dn_mult}_w{vol_window}"
+    return pd.Series(out, index=price.index, name=out_name)
 
-    p_arr = p.to_numpy()
-    v_arr = vol.to_numpy()
-    n = len(p_arr)
 
-    out = np.full(n, tail_value, dtype=int)
-    last_start = n - horizon
-    if last_start <= 0:
-        # Not enough data to label anything
-        out_name = name or f"tb_lbl_h{horizon}_u{up_mult}_d{dn_mult}_w{vol_window}"
-        return pd.Series(out, index=price.index, name=out_name)
+# ---------------------------- array kernels ---------------------------- #
+# Shared by the single-label functions above and by multi-label (grid) builds, which compute
+# log prices / vol / forward returns once and reuse them across label columns.
 
-    for i in range(last_start):
-        p0 = p_arr[i]
-        vi = v_arr[i]
+def forward_log_returns(logp: np.ndarray, horizons: list[int]) -> np.ndarray:
+    """(n, len(horizons)) matrix of logp[t+h] - logp[t]; the last h rows of each column are NaN."""
+    n = len(logp)
+    out = np.full((n, len(horizons)), np.nan, dtype=float)
+    for j, h in enumerate(horizons):
+        if h <= 0:
+            raise ValueError("horizon must be > 0")
+        if h < n:
+            out[: n - h, j] = logp[h:] - logp[: n - h]
+    return out
 
-        up = p0 * np.exp(up_mult * vi)
-        dn = p0 * np.exp(-dn_mult * vi)
 
-        path = p_arr[i + 1 : i + horizon + 1]
+def classify_returns(fwd: np.ndarray, thr: float) -> np.ndarray:
+    """1 if fwd > thr, -1 if fwd < -thr, else 0 (NaN tail -> 0)."""
+    return np.where(fwd > thr, 1, np.where(fwd < -thr, -1, 0)).astype(int)
 
-        hit_up_mask = path >= up
-        hit_dn_mask = path <= dn
 
-        hit_up_idx = int(np.argmax(hit_up_mask)) if hit_up_mask.any() else None
-        hit_dn_idx = int(np.argmax(hit_dn_mask)) if hit_dn_mask.any() else None
+def barrier_vol(logp: np.ndarray, vol_window: int, min_periods: int | None = None) -> np.ndarray:
+    """Rolling std of log-returns; ffill, never bfill (future leakage), remaining NaN -> 0."""
+    if vol_window <= 1:
+        raise ValueError("vol_window must be > 1")
+    mp = min_periods if min_periods is not None else max(5, vol_window // 5)
+    logret = pd.Series(logp).diff()
+    return logret.rolling(vol_window, min_periods=mp).std(ddof=0).ffill().fillna(0.0).to_numpy()
 
-        if hit_up_idx is not None and hit_dn_idx is not None:
-            out[i] = 1 if hit_up_idx < hit_dn_idx else -1
-        elif hit_up_idx is not None:
-            out[i] = 1
-        elif hit_dn_idx is not None:
-            out[i] = -1
-        else:
-            # No barrier hit: fall back to sign of horizon return
-            out[i] = int(np.sign(np.log(p_arr[i + horizon]) - np.log(p0)))
 
-    out_name = name or f"tb_lbl_h{horizon}_u{up_mult}_d{dn_mult}_w{vol_window}"
-    return pd.Series(out, index=price.index, name=out_name)
+def triple_barrier_from_arrays(
+    p_arr: np.ndarray,
+    logp: np.ndarray,
+    vol: np.ndarray,
+    *,
+    horizon: int,
+    up_mult: float,
+    dn_mult: float,
+    tail_value: int = 0,
+) -> np.ndarray:
+    """Triple-barrier labels from precomputed prices, log prices and barrier vol."""
+    n = len(p_arr)
+    out = np.full(n, tail_value, dtype=int)
+    last_start = n - horizon
+    if last_start <= 0:
+        # Not enough data to label anything
+        return out
+
+    p0 = p_arr[:last_start]
+    vi = vol[:last_start]
+    up = p0 * np.exp(up_mult * vi)
+    dn = p0 * np.exp(-dn_mult * vi)
+
+    # first-touch offsets into path = p[i+1 : i+horizon+1]; `horizon` means "no hit"
+    hit_up_idx, hit_dn_idx = _first_touch(p_arr, up, dn, horizon)
+
+    lbl = np.where(hit_up_idx < hit_dn_idx, 1, -1)  # ties (both hit at the same bar) -> -1
+    no_hit = (hit_up_idx == horizon) & (hit_dn_idx == horizon)
+    if no_hit.any():
+        # No barrier hit: fall back to sign of horizon return
+        i = np.flatnonzero(no_hit)
+        fallback = np.sign(logp[i + horizon] - logp[i])
+        if np.isnan(fallback).any():
+            raise ValueError("cannot convert float NaN to integer (NaN price in triple_barrier path)")
+        lbl[i] = fallback.astype(int)
+    out[:last_start] = lbl
+    return out
+
+
+# Max elements of the (rows x horizon) comparison block materialized at once (~4 MB of bools).
+_TB_BLOCK_ELEMS = 1 << 22
+
+
+def _first_touch(
+    p_arr: np.ndarray,
+    up: np.ndarray,
+    dn: np.ndarray,
+    horizon: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    For each start i < len(up), the first offset k in [0, horizon) with
+    p[i+1+k] >= up[i] (resp. <= dn[i]), or `horizon` if the barrier is never touched.
+
+    Works on zero-copy sliding-window views of the forward path, processed in row blocks
+    so the boolean scratch stays bounded (~_TB_BLOCK_ELEMS) regardless of n and horizon.
+    """
+    m = len(up)
+    windows = np.lib.stride_tricks.sliding_window_view(p_arr[1:], horizon)[:m]
+    hit_up_idx = np.empty(m, dtype=np.int64)
+    hit_dn_idx = np.empty(m, dtype=np.int64)
+
+    step = max(1, _TB_BLOCK_ELEMS // horizon)
+    for a in range(0, m, step):
+        b = min(a + step, m)
+        w = windows[a:b]
+        for barrier, out, cmp in ((up, hit_up_idx, np.greater_equal), (dn, hit_dn_idx, np.less_equal)):
+            hit = cmp(w, barrier[a:b, None])
+            first = hit.argmax(axis=1)
+            # argmax == 0 is ambiguous (hit at first step vs no hit) -> disambiguate explicitly
+            first[~hit[np.arange(b - a), first]] = horizon
+            out[a:b] = first
+
+    return hit_up_idx, hit_dn_idx
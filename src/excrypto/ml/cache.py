@@ -0,0 +1,167 @@
+# src/excrypto/ml/cache.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from excrypto.ml.datasets import XYData
+from excrypto.ml.resolve import now_utc
+
+DEFAULT_MAX_BYTES = 4 * 1024**3
+
+
+def _file_hash(path: Path) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()[:16]
+
+
+def xy_cache_key(features_manifest: Path, labels_manifest: Path, *, label_col: str, dropna: bool) -> dict[str, Any]:
+    """
+    Identity of a training table. Manifests are hashed by content, so rebuilding an artifact
+    (new created_at / paths / params) always misses; changing only model params always hits.
+    """
+    parts = {
+        "features_manifest": _file_hash(features_manifest),
+        "labels_manifest": _file_hash(labels_manifest),
+        "label_col": label_col,
+        "nan_policy": "drop_any" if dropna else "keep",
+    }
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return {"id": hashlib.md5(payload).hexdigest()[:16], **parts}
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    id: str
+    path: Path
+    meta: dict[str, Any]
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.meta.get("nbytes", 0))
+
+    @property
+    def last_used(self) -> float:
+        return float(self.meta.get("last_used", 0.0))
+
+
+class XYCache:
+    """
+    On-disk cache of joined training tables (see `load_xy`):
+
+      <root>/<id>/X.npy          C-contiguous feature matrix, opened with mmap_mode="r"
+      <root>/<id>/y.npy
+      <root>/<id>/keys.parquet   (timestamp, symbol)
+      <root>/<id>/meta.json      key parts, feature/label columns, shape, size, last_used
+
+    Entries are written to a temp dir and renamed into place, so readers never see a
+    partial entry. `gc` evicts least-recently-used entries until the cache fits `max_bytes`.
+    """
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+
+    @classmethod
+    def for_runs_root(cls, runs_root: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> "XYCache":
+        return cls(Path(runs_root) / "_cache" / "xy", max_bytes=max_bytes)
+
+    def _meta_path(self, entry_id: str) -> Path:
+        return self.root / entry_id / "meta.json"
+
+    def _touch(self, entry_id: str, meta: dict[str, Any]) -> None:
+        meta = {**meta, "last_used": time.time()}
+        p = self._meta_path(entry_id)
+        tmp = p.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(meta, indent=2, sort_keys=True))
+        tmp.replace(p)
+
+    def get(self, key: dict[str, Any]) -> XYData | None:
+        d = self.root / key["id"]
+        try:
+            meta = json.loads(self._meta_path(key["id"]).read_text())
+            X = np.load(d / "X.npy", mmap_mode="r")
+            y = np.load(d / "y.npy", allow_pickle=False)
+            keys = pd.read_parquet(d / "keys.parquet")
+        except (FileNotFoundError, ValueError, json.JSONDecodeError):
+            return None
+        self._touch(key["id"], meta)
+        return XYData(
+            X=X,
+            y=y,
+            keys=keys,
+            label_col=meta["label_col"],
+            feature_cols=tuple(meta["feature_cols"]),
+            join="cache",
+        )
+
+    def put(self, key: dict[str, Any], xy: XYData, *, sources: dict[str, str] | None = None) -> CacheEntry:
+        self.root.mkdir(parents=True, exist_ok=True)
+        final = self.root / key["id"]
+        tmp = self.root / f".{key['id']}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir()
+        try:
+            np.save(tmp / "X.npy", np.ascontiguousarray(xy.X))
+            np.save(tmp / "y.npy", np.asarray(xy.y))
+            xy.keys.to_parquet(tmp / "keys.parquet", index=False)
+            meta = {
+                "key": key,
+                "sources": sources or {},
+                "label_col": xy.label_col,
+                "feature_cols": list(xy.feature_cols),
+                "shape": list(xy.X.shape),
+                "nbytes": sum(f.stat().st_size for f in tmp.iterdir()),
+                "created_at": now_utc(),
+                "last_used": time.time(),
+            }
+            (tmp / "meta.json").write_text(json.dumps(meta, indent=2, sort_keys=True))
+            try:
+                tmp.rename(final)
+            except OSError:
+                if not final.exists():
+                    raise
+                # another run cached the same table meanwhile; identical content, keep theirs
+                shutil.rmtree(tmp)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        return CacheEntry(id=key["id"], path=final, meta=json.loads(self._meta_path(key["id"]).read_text()))
+
+    def entries(self) -> list[CacheEntry]:
+        """All complete entries, most recently used first."""
+        if not self.root.exists():
+            return []
+        out = []
+        for d in self.root.iterdir():
+            if not d.is_dir() or d.name.startswith("."):
+                continue
+            try:
+                meta = json.loads((d / "meta.json").read_text())
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+            out.append(CacheEntry(id=d.name, path=d, meta=meta))
+        return sorted(out, key=lambda e: e.last_used, reverse=True)
+
+    def total_bytes(self) -> int:
+        return sum(e.nbytes for e in self.entries())
+
+    def gc(self, max_bytes: int | None = None) -> list[CacheEntry]:
+        """Evict least-recently-used entries until the total fits `max_bytes`; returns evicted."""
+        budget = self.max_bytes if max_bytes is None else int(max_bytes)
+        evicted, total = [], 0
+        for e in self.entries():
+            total += e.nbytes
+            if total > budget:
+                evicted.append(e)
+        for e in evicted:
+            shutil.rmtree(e.path, ignore_errors=True)
+        return evicted
@@ -6,9 +6,11 @@ from pathlib import Path
 
 import typer
 
-from excrypto.ml.service import train_model, predict_signals
+# model libraries (sklearn, lightgbm) are imported inside the commands that need them
 
 app = typer.Typer(help="ML: train/predict (thin CLI wrapper)")
+cache_app = typer.Typer(help="Training-table cache under <runs_root>/_cache/xy")
+app.add_typer(cache_app, name="cache")
 
 
 def _parse_symbols(s: str) -> list[str]:
@@ -25,7 +27,14 @@ def train(
     config: Path | None = typer.Option(None, exists=True, dir_okay=False, help="Train config (yaml/json)."),
     features_manifest: Path | None = typer.Option(None, exists=True, dir_okay=False, help="Override features manifest."),
     labels_manifest: Path | None = typer.Option(None, exists=True, dir_okay=False, help="Override labels manifest."),
+    fold_workers: int = typer.Option(1, help="Processes for CV folds (1=serial, -1=all cores)."),
+    cache: bool = typer.Option(True, "--cache/--no-cache", help="Reuse/store the joined X/y table."),
+    parent: Path | None = typer.Option(
+        None, exists=True, dir_okay=False, help="ML manifest to warm-start from (incremental retrain, no CV).",
+    ),
 ) -> None:
+    from excrypto.ml.service import train_model
+
     syms = _parse_symbols(symbols)
     res = train_model(
         snapshot=snapshot,
@@ -36,6 +45,9 @@ def train(
         config=config,
         features_manifest=features_manifest,
         labels_manifest=labels_manifest,
+        fold_workers=fold_workers,
+        cache=cache,
+        parent=parent,
     )
     typer.echo(json.dumps(
         {
@@ -47,6 +59,44 @@ def train(
     ))
 
 
+@app.command("sweep")
+def sweep(
+    snapshot: str = typer.Option(...),
+    symbols: str = typer.Option(..., help="Comma-separated symbols"),
+    exchange: str = typer.Option("binance"),
+    timeframe: str = typer.Option("1h"),
+    runs_root: Path = typer.Option(Path("runs")),
+    config: Path = typer.Option(..., exists=True, dir_okay=False, help="Sweep config (search space + halving)."),
+    features_manifest: Path | None = typer.Option(None, exists=True, dir_okay=False, help="Override features manifest."),
+    labels_manifest: Path | None = typer.Option(None, exists=True, dir_okay=False, help="Override labels manifest."),
+    workers: int = typer.Option(1, help="Processes for (trial, fold) fits (1=serial, -1=all cores)."),
+    resume: bool = typer.Option(True, "--resume/--fresh", help="Reuse finished evaluations in trials.jsonl."),
+) -> None:
+    from excrypto.ml.sweep import run_sweep
+
+    syms = _parse_symbols(symbols)
+    res = run_sweep(
+        snapshot=snapshot,
+        symbols=syms,
+        exchange=exchange,
+        timeframe=timeframe,
+        runs_root=runs_root,
+        config=config,
+        features_manifest=features_manifest,
+        labels_manifest=labels_manifest,
+        workers=workers,
+        resume=resume,
+    )
+    typer.echo(json.dumps(
+        {
+            "leaderboard": str(res.leaderboard_path),
+            "manifest": str(res.manifest_path),
+            "best": res.best,
+        },
+        indent=2,
+    ))
+
+
 @app.command("predict")
 def predict(
     snapshot: str = typer.Option(...),
@@ -56,7 +106,13 @@ def predict(
     runs_root: Path = typer.Option(Path("runs")),
     manifest: Path | None = typer.Option(None, exists=True, dir_okay=False, help="Override ML manifest."),
     threshold: float = typer.Option(0.5, help="Decision threshold on score."),
+    auto_threshold: bool = typer.Option(False, help="Use the threshold selected during training instead."),
+    batch_rows: int | None = typer.Option(None, help="Stream features in batches of this many rows."),
+    workers: int = typer.Option(1, help="Processes scoring batches (1=in-process, -1=all cores)."),
+    flat: bool = typer.Option(False, help="Score with the flattened ensemble (see `ml flatten`)."),
 ) -> None:
+    from excrypto.ml.service import predict_signals
+
     syms = _parse_symbols(symbols)
     res = predict_signals(
         snapshot=snapshot,
@@ -65,7 +121,10 @@ def predict(
         timeframe=timeframe,
         runs_root=runs_root,
         manifest=manifest,
-        threshold=threshold,
+        threshold=None if auto_threshold else threshold,
+        batch_rows=batch_rows,
+        workers=workers,
+        flat=flat,
     )
     typer.echo(json.dumps(
         {
@@ -74,3 +133,50 @@ def predict(
         },
         indent=2,
     ))
+
+
+@app.command("flatten")
+def flatten(
+    manifest: Path = typer.Option(..., exists=True, dir_okay=False, help="ML model manifest."),
+    runs_root: Path = typer.Option(Path("runs")),
+) -> None:
+    from excrypto.ml.flat_trees import flatten_run
+
+    out = flatten_run(manifest, runs_root=runs_root)
+    typer.echo(json.dumps({"model_flat": str(out), "manifest": str(manifest)}, indent=2))
+
+
+@cache_app.command("ls")
+def cache_ls(runs_root: Path = typer.Option(Path("runs"))) -> None:
+    from excrypto.ml.cache import XYCache
+
+    c = XYCache.for_runs_root(runs_root)
+    rows = [
+        {
+            "id": e.id,
+            "label_col": e.meta.get("label_col"),
+            "shape": e.meta.get("shape"),
+            "mb": round(e.nbytes / 1024**2, 2),
+            "created_at": e.meta.get("created_at"),
+            "features": (e.meta.get("sources") or {}).get("features"),
+        }
+        for e in c.entries()
+    ]
+    typer.echo(json.dumps({"root": str(c.root), "total_mb": round(c.total_bytes() / 1024**2, 2), "entries": rows}, indent=2))
+
+
+@cache_app.command("gc")
+def cache_gc(
+    runs_root: Path = typer.Option(Path("runs")),
+    max_gb: float = typer.Option(4.0, help="Evict least-recently-used entries above this size."),
+    all_: bool = typer.Option(False, "--all", help="Remove every entry."),
+) -> None:
+    from excrypto.ml.cache import XYCache
+
+    c = XYCache.for_runs_root(runs_root)
+    evicted = c.gc(max_bytes=0 if all_ else int(max_gb * 1024**3))
+    typer.echo(json.dumps(
+        {"evicted": [e.id for e in evicted], "freed_mb": round(sum(e.nbytes for e in evicted) / 1024**2, 2),
+         "total_mb": round(c.total_bytes() / 1024**2, 2)},
+        indent=2,
+    ))
@@ -2,17 +2,76 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable, Sequence
+from typing import Sequence
 
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 
 
 @dataclass(frozen=True)
 class XYData:
-    X: pd.DataFrame
-    y: pd.Series
+    """
+    Training table as contiguous arrays: X is a C-ordered (n_rows, n_features) matrix whose
+    columns are `feature_cols`, y the aligned label vector, keys the matching (timestamp, symbol).
+    """
+    X: np.ndarray
+    y: np.ndarray
     keys: pd.DataFrame
     label_col: str
+    feature_cols: tuple[str, ...]
+    join: str = "aligned"  # "aligned" | "permuted" | "merge" (which join path was taken)
+
+    def X_frame(self) -> pd.DataFrame:
+        """Zero-copy DataFrame view of X (keeps feature names for sklearn)."""
+        return pd.DataFrame(self.X, columns=list(self.feature_cols), copy=False)
+
+    def y_series(self) -> pd.Series:
+        return pd.Series(self.y, name=self.label_col, copy=False)
+
+
+def _columns(path: str) -> list[str]:
+    return list(pq.read_schema(path).names)
+
+
+def _keys_equal(a: pd.DataFrame, b: pd.DataFrame, key_cols: Sequence[str]) -> bool:
+    if len(a) != len(b):
+        return False
+    # Series.equals compares the underlying arrays (no per-row Timestamp boxing for tz-aware keys)
+    return all(a[c].reset_index(drop=True).equals(b[c].reset_index(drop=True)) for c in key_cols)
+
+
+def _align_by_sorted_keys(xk: pd.DataFrame, yk: pd.DataFrame, key_cols: Sequence[str]) -> np.ndarray | None:
+    """
+    Row permutation `perm` with yk.iloc[perm] == xk when both hold the same set of unique keys
+    in a different order; None when they do not (caller falls back to a merge).
+
+    Each key column is factorized over both sides into shared integer codes, so sorting and
+    comparing the codes is exact and never touches Python objects row by row.
+    """
+    n = len(xk)
+    if n != len(yk):
+        return None
+    cx, cy = [], []
+    for c in key_cols:
+        codes, _ = pd.factorize(pd.concat([xk[c], yk[c]], ignore_index=True))
+        cx.append(codes[:n])
+        cy.append(codes[n:])
+    # np.lexsort sorts by the last key first
+    ox, oy = np.lexsort(cx[::-1]), np.lexsort(cy[::-1])
+    sx = np.stack([k[ox] for k in cx])
+    if not np.array_equal(sx, np.stack([k[oy] for k in cy])):
+        return None
+    if n > 1 and not (sx[:, 1:] != sx[:, :-1]).any(axis=0).all():
+        return None  # duplicate keys: merge semantics (cartesian) differ from a permutation
+    perm = np.empty(n, dtype=np.intp)
+    perm[ox] = oy
+    return perm
+
+
+def _as_matrix(df: pd.DataFrame, cols: Sequence[str], dtype) -> np.ndarray:
+    # pandas stores same-dtype columns as one (k, n) block; to_numpy is its transpose -> one C copy
+    return np.ascontiguousarray(df[list(cols)].to_numpy(dtype=dtype, na_value=np.nan))
 
 
 def load_xy(
@@ -23,36 +82,73 @@ def load_xy(
     key_cols: Sequence[str] = ("timestamp", "symbol"),
     how: str = "inner",
     dropna: bool = True,
+    dtype=np.float64,
 ) -> XYData:
-    Xdf = pd.read_parquet(features_path)
-    ydf = pd.read_parquet(labels_path)
+    """
+    Join features and labels on `key_cols` and return contiguous arrays.
+
+    Both artifacts are normally built from the same panel, so the join tries, in order:
+      - aligned:  keys identical row-for-row -> columns are sliced positionally, no merge
+      - permuted: same unique keys in another order (checked on sorted key codes) -> labels
+                  are gathered by a row permutation
+      - merge:    anything else -> pandas merge on key_cols (left key order preserved)
+    The fast paths only apply to how="inner"/"left", where they give the merge's result.
+    Only the key columns, feature columns and `label_col` are read from disk.
+    """
+    key_cols = list(key_cols)
+    feat_cols_all = _columns(features_path)
+    lbl_cols_all = _columns(labels_path)
 
     for c in key_cols:
-        if c not in Xdf.columns:
+        if c not in feat_cols_all:
             raise ValueError(f"Features missing key col '{c}': {features_path}")
-        if c not in ydf.columns:
+        if c not in lbl_cols_all:
             raise ValueError(f"Labels missing key col '{c}': {labels_path}")
 
     # choose label column
     if label_col is None:
-        label_cols = [c for c in ydf.columns if c not in key_cols]
+        label_cols = [c for c in lbl_cols_all if c not in key_cols]
         if not label_cols:
             raise ValueError("No label columns found in labels parquet.")
         label_col = label_cols[-1]
-    if label_col not in ydf.columns:
+    if label_col not in lbl_cols_all:
         raise ValueError(f"Label column '{label_col}' not found in labels parquet.")
 
-    df = Xdf.merge(ydf[list(key_cols) + [label_col]], on=list(key_cols), how=how)
+    feature_cols = [c for c in feat_cols_all if c not in key_cols and c != label_col]
+    Xdf = pd.read_parquet(features_path, columns=key_cols + feature_cols)
+    ydf = pd.read_parquet(labels_path, columns=key_cols + [label_col])
+
+    join = "merge"
+    if how in ("inner", "left"):
+        if _keys_equal(Xdf, ydf, key_cols):
+            join = "aligned"
+        else:
+            perm = _align_by_sorted_keys(Xdf, ydf, key_cols)
+            if perm is not None:
+                ydf = ydf.iloc[perm]
+                join = "permuted"
+
+    if join == "merge":
+        Xdf = Xdf.merge(ydf, on=key_cols, how=how, sort=False)
+        y = Xdf.pop(label_col).to_numpy()
+    else:
+        y = ydf[label_col].to_numpy()
 
-    # build outputs
-    keys = df[list(key_cols)].copy()
-    y = df[label_col]
-    X = df.drop(columns=list(key_cols) + [label_col])
+    X = _as_matrix(Xdf, feature_cols, dtype)
+    keys = Xdf[key_cols].reset_index(drop=True)
 
     if dropna:
-        keep = ~(X.isna().any(axis=1) | y.isna())
-        X = X.loc[keep].reset_index(drop=True)
-        y = y.loc[keep].reset_index(drop=True)
-        keys = keys.loc[keep].reset_index(drop=True)
+        drop = np.isnan(X).any(axis=1) | pd.isna(y)
+        if drop.any():
+            keep = ~drop
+            X, y = X[keep], y[keep]
+            keys = keys.loc[keep].reset_index(drop=True)
 
-    return XYData(X=X, y=y, keys=keys, label_col=label_col)
+    return XYData(
+        X=np.ascontiguousarray(X),
+        y=np.ascontiguousarray(y),
+        keys=keys,
+        label_col=label_col,
+        feature_cols=tuple(feature_cols),
+        join=join,
+    )
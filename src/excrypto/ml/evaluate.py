@@ -1,11 +1,174 @@
 from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
 import numpy as np
 from sklearn.metrics import accuracy_score, f1_score
 
+
+@dataclass(frozen=True)
+class ThresholdSweep:
+    """
+    Confusion counts of a binary scorer at every distinct score, from one sort.
+
+    `thresholds` are the distinct scores in decreasing order; at thresholds[i] the rule
+    `score >= thresholds[i]` predicts tp[i] true and fp[i] false positives. Every metric
+    below is a vector over those thresholds; `at`/`on_grid` look up arbitrary thresholds.
+    """
+    thresholds: np.ndarray
+    tp: np.ndarray
+    fp: np.ndarray
+    n_pos: int
+    n_neg: int
+
+    @property
+    def fn(self) -> np.ndarray:
+        return self.n_pos - self.tp
+
+    @property
+    def tn(self) -> np.ndarray:
+        return self.n_neg - self.fp
+
+    @staticmethod
+    def _ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+        # zero_division=0, like the sklearn metrics this replaces
+        num, den = np.asarray(num, dtype=float), np.asarray(den, dtype=float)
+        return np.divide(num, den, out=np.zeros(np.broadcast(num, den).shape), where=den > 0)
+
+    def precision(self) -> np.ndarray:
+        return self._ratio(self.tp, self.tp + self.fp)
+
+    def recall(self) -> np.ndarray:
+        return self._ratio(self.tp, self.n_pos)
+
+    def fpr(self) -> np.ndarray:
+        return self._ratio(self.fp, self.n_neg)
+
+    def f1(self) -> np.ndarray:
+        return self._ratio(2 * self.tp, 2 * self.tp + self.fp + self.fn)
+
+    def f1_macro(self) -> np.ndarray:
+        """
+        Mean of the positive- and negative-class F1 over the classes present in the labels
+        or the predictions (sklearn average="macro").
+        """
+        f1_neg = self._ratio(2 * self.tn, 2 * self.tn + self.fp + self.fn)
+        has_pos = (self.n_pos > 0) | (self.tp + self.fp > 0)
+        has_neg = (self.n_neg > 0) | (self.tn + self.fn > 0)
+        return self._ratio(self.f1() * has_pos + f1_neg * has_neg, has_pos.astype(int) + has_neg)
+
+    def accuracy(self) -> np.ndarray:
+        return (self.tp + self.tn) / float(self.n_pos + self.n_neg)
+
+    def youden(self) -> np.ndarray:
+        return self.recall() - self.fpr()
+
+    def roc(self) -> tuple[np.ndarray, np.ndarray]:
+        """(fpr, tpr), starting at (0, 0)."""
+        return np.r_[0.0, self.fpr()], np.r_[0.0, self.recall()]
+
+    def pr(self) -> tuple[np.ndarray, np.ndarray]:
+        """(precision, recall) by decreasing threshold."""
+        return self.precision(), self.recall()
+
+    def auc(self) -> float:
+        fpr, tpr = self.roc()
+        if not (self.n_pos and self.n_neg):
+            return float("nan")
+        return float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1])) / 2.0)
+
+    def average_precision(self) -> float:
+        """Step-wise area under the PR curve (sklearn average_precision_score)."""
+        if not self.n_pos:
+            return float("nan")
+        prec, rec = self.pr()
+        return float(np.sum(np.diff(np.r_[0.0, rec]) * prec))
+
+    def _index(self, threshold: np.ndarray | float) -> np.ndarray:
+        # number of distinct scores >= threshold; 0 means nothing predicted positive
+        return np.searchsorted(-self.thresholds, -np.asarray(threshold, dtype=float), side="right")
+
+    def _counts(self, threshold: np.ndarray | float) -> tuple[np.ndarray, np.ndarray]:
+        j = self._index(threshold)
+        tp = np.where(j > 0, np.r_[0, self.tp][j], 0)
+        fp = np.where(j > 0, np.r_[0, self.fp][j], 0)
+        return tp, fp
+
+    def on_grid(self, grid: np.ndarray) -> "ThresholdSweep":
+        """The same counts at caller-chosen thresholds (e.g. a plotting grid)."""
+        grid = np.asarray(grid, dtype=float)
+        tp, fp = self._counts(grid)
+        return ThresholdSweep(grid, np.asarray(tp), np.asarray(fp), self.n_pos, self.n_neg)
+
+    def at(self, threshold: float) -> dict[str, float]:
+        s = self.on_grid(np.array([threshold]))
+        return {
+            "threshold": float(threshold),
+            "acc": float(s.accuracy()[0]),
+            "f1": float(s.f1_macro()[0]),
+            "f1_pos": float(s.f1()[0]),
+            "precision": float(s.precision()[0]),
+            "recall": float(s.recall()[0]),
+        }
+
+    def best(self, metric: str = "f1_macro", *, min_precision: float | None = None) -> dict[str, float]:
+        """
+        Threshold maximizing `metric` (f1, f1_macro, accuracy, youden), optionally among
+        thresholds with precision >= min_precision. Ties go to the highest threshold.
+        """
+        scores = {"f1": self.f1, "f1_macro": self.f1_macro, "accuracy": self.accuracy, "youden": self.youden}
+        if metric not in scores:
+            raise ValueError(f"Unknown threshold metric '{metric}'; expected one of {sorted(scores)}")
+        values = scores[metric]()
+        if min_precision is not None:
+            values = np.where(self.precision() >= min_precision, values, -np.inf)
+        if not len(values) or not np.isfinite(values).any():
+            raise ValueError("No threshold satisfies the selection constraints")
+        return {**self.at(float(self.thresholds[int(np.argmax(values))])), "metric": metric}
+
+    def summary(self, metric: str = "f1_macro") -> dict[str, Any]:
+        return {"auc": self.auc(), "ap": self.average_precision(), "best": self.best(metric)}
+
+
+def threshold_sweep(y_true, y_score, pos_label: int = 1) -> ThresholdSweep:
+    """Sort once, cumulative-sum the labels, keep the last row of each run of tied scores."""
+    y = np.asarray(y_true) == pos_label
+    s = np.asarray(y_score, dtype=float)
+    if y.shape != s.shape or y.ndim != 1:
+        raise ValueError(f"y_true and y_score must be 1-d and aligned, got {y.shape} and {s.shape}")
+    order = np.argsort(-s, kind="mergesort")
+    s, y = s[order], y[order]
+    last = np.r_[np.flatnonzero(np.diff(s)), len(s) - 1] if len(s) else np.array([], dtype=int)
+    tp = np.cumsum(y, dtype=np.int64)[last]
+    fp = (last + 1) - tp
+    n_pos = int(y.sum())
+    return ThresholdSweep(thresholds=s[last], tp=tp, fp=fp, n_pos=n_pos, n_neg=int(len(y) - n_pos))
+
+
+def finite_or_none(v: float) -> float | None:
+    return float(v) if np.isfinite(v) else None
+
+
 def cls_metrics(y_true, y_score, threshold: float = 0.5) -> dict:
-    y_pred = (y_score >= threshold).astype(int) if set(np.unique(y_true)) <= {0,1} else np.sign(y_score)
-    out = {
+    """
+    acc / macro F1 at `threshold`. Binary labels also get ROC AUC, average precision and the
+    F1-optimal threshold, all from one threshold_sweep (None where a class is missing).
+    """
+    y_true = np.asarray(y_true)
+    if set(np.unique(y_true)) <= {0, 1}:
+        sweep = threshold_sweep(y_true, y_score)
+        at, best = sweep.at(threshold), sweep.best("f1_macro")
+        return {
+            "acc": at["acc"],
+            "f1": at["f1"],
+            "auc": finite_or_none(sweep.auc()),
+            "ap": finite_or_none(sweep.average_precision()),
+            "best_threshold": best["threshold"],
+            "best_f1": best["f1"],
+        }
+    y_pred = np.sign(y_score)
+    return {
         "acc": float(accuracy_score(y_true, y_pred)),
-        "f1":  float(f1_score(y_true, y_pred, average="macro")),
+        "f1": float(f1_score(y_true, y_pred, average="macro")),
     }
-    return out
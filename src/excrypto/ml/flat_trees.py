@@ -0,0 +1,324 @@
+# src/excrypto/ml/flat_trees.py
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import joblib
+import numpy as np
+
+# LightGBM treats |x| <= kZeroThreshold as zero for missing_type == "Zero"
+_LGBM_ZERO = 1e-35
+# rows * trees per traversal block: small enough that the per-level (trees, rows) index
+# arrays stay cache resident, large enough to amortize the per-level numpy calls
+_BLOCK_ELEMS = 1 << 19
+
+_MISSING_NONE, _MISSING_ZERO, _MISSING_NAN = 0, 1, 2
+
+
+@dataclass(frozen=True)
+class FlatForest:
+    """
+    A tree ensemble as contiguous node arrays (all trees concatenated, node ids global).
+    Each tree is laid out breadth-first with siblings adjacent, so a step is one gather:
+
+      child[i]         left child of node i; the right child is child[i] + 1
+      feature[i]       split feature
+      threshold[i]     go left if x <= threshold
+      missing_left[i]  where NaN (or a LightGBM "zero") goes
+      missing_type[i]  0 none, 1 zero, 2 nan (LightGBM semantics; sklearn nodes use 2)
+      value[i, k]      leaf output per class column
+      roots[t]         root node of tree t
+
+    Leaves point to themselves (child == i, threshold == +inf, missing_left) so extra steps
+    are no-ops and all trees of a row block are walked in lockstep for `max_depth` steps,
+    tree-major so each tree's nodes are gathered from one small region.
+    The NaN/zero rules are only evaluated for blocks that contain such values. Leaf outputs
+    are accumulated in tree order like the source libraries do.
+
+      link="mean"     RF: per-tree class fractions averaged (sklearn predict_proba)
+      link="sigmoid"  LightGBM binary: sigmoid of the summed raw score
+      link="softmax"  LightGBM multiclass: softmax over per-class raw sums
+    """
+    child: np.ndarray
+    feature: np.ndarray
+    threshold: np.ndarray
+    missing_left: np.ndarray
+    missing_type: np.ndarray
+    value: np.ndarray
+    roots: np.ndarray
+    max_depth: int
+    link: str
+    classes_: np.ndarray
+    n_features: int
+    float32_inputs: bool = False
+    feature_names: tuple[str, ...] | None = None
+    has_zero_missing: bool = False
+
+    @property
+    def n_trees(self) -> int:
+        return int(len(self.roots))
+
+    def _leaves(self, X: np.ndarray) -> np.ndarray:
+        """(n_trees, n_rows) leaf node ids."""
+        n = X.shape[0]
+        # feature-major copy of the block: x[f, i] lives at f * n + i
+        XT = np.ascontiguousarray(X.T).ravel()
+        idx = np.int32 if XT.size < 2**31 else np.int64
+        col = np.arange(n, dtype=idx)
+        feat_off = self.feature.astype(idx) * idx(n)
+        node = np.repeat(self.roots[:, None], n, axis=1)
+        special = bool(np.isnan(XT).any()) or (self.has_zero_missing and bool((np.abs(XT) <= _LGBM_ZERO).any()))
+        for _ in range(self.max_depth):
+            x = XT.take(feat_off.take(node) + col)
+            if not special:
+                np.add(self.child.take(node), x > self.threshold.take(node), out=node, casting="unsafe")
+                continue
+            mt = self.missing_type.take(node)
+            isnan = np.isnan(x)
+            # LightGBM: NaN counts as 0.0 unless the split tracks NaN
+            x = np.where(isnan & (mt != _MISSING_NAN), 0.0, x)
+            missing = np.where(mt == _MISSING_NAN, isnan, (mt == _MISSING_ZERO) & (np.abs(x) <= _LGBM_ZERO))
+            go_right = np.where(missing, ~self.missing_left.take(node), x > self.threshold.take(node))
+            np.add(self.child.take(node), go_right, out=node, casting="unsafe")
+        return node
+
+    def _as_matrix(self, X) -> np.ndarray:
+        # frames are reordered to the training columns when they carry them all
+        if self.feature_names is not None and hasattr(X, "columns") and set(self.feature_names) <= set(X.columns):
+            X = X[list(self.feature_names)]
+        arr = np.asarray(X, dtype=np.float32 if self.float32_inputs else np.float64)
+        if arr.ndim != 2 or arr.shape[1] != self.n_features:
+            raise ValueError(f"expected (n, {self.n_features}) features, got {arr.shape}")
+        return np.ascontiguousarray(arr)
+
+    def raw(self, X) -> np.ndarray:
+        """Per-class sum of leaf outputs over trees, (n_rows, n_outputs)."""
+        arr = self._as_matrix(X)
+        n = arr.shape[0]
+        out = np.empty((n, self.value.shape[1]), dtype=np.float64)
+        step = max(1, _BLOCK_ELEMS // max(1, self.n_trees))
+        for a in range(0, n, step):
+            leaves = self._leaves(arr[a:a + step])
+            # accumulate tree by tree, in tree order (np.sum may pair-wise sum and drift by an ulp)
+            acc = out[a:a + step]
+            acc[:] = self.value.take(leaves[0], axis=0)
+            for t in range(1, self.n_trees):
+                acc += self.value.take(leaves[t], axis=0)
+        return out
+
+    def predict_proba(self, X) -> np.ndarray:
+        s = self.raw(X)
+        if self.link == "mean":
+            return s / self.n_trees
+        if self.link == "sigmoid":
+            p = 1.0 / (1.0 + np.exp(-s[:, 0]))
+            return np.column_stack([1.0 - p, p])
+        if self.link == "softmax":
+            e = np.exp(s - s.max(axis=1, keepdims=True))
+            return e / e.sum(axis=1, keepdims=True)
+        raise ValueError(f"Unknown link: {self.link}")
+
+    def predict_score(self, X) -> np.ndarray:
+        return self.predict_proba(X)[:, -1]
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def save(self, path: str) -> None:
+        # uncompressed so the registry can memory-map the node arrays
+        joblib.dump(self, path, compress=0)
+
+
+def _bfs_order(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Node ids in breadth-first order with each internal node's children adjacent (left, right)."""
+    order, frontier = [np.array([0])], np.array([0])
+    while True:
+        inner = frontier[left[frontier] >= 0]
+        if not len(inner):
+            break
+        frontier = np.column_stack([left[inner], right[inner]]).ravel()
+        order.append(frontier)
+    return np.concatenate(order)
+
+
+class _Builder:
+    _COLS = ("child", "feature", "threshold", "missing_left", "missing_type", "value")
+
+    def __init__(self, n_outputs: int):
+        self.n_outputs = n_outputs
+        self.cols: dict[str, list[np.ndarray]] = {k: [] for k in self._COLS}
+        self.roots: list[int] = []
+        self.n_nodes = 0
+        self.max_depth = 0
+
+    def add_tree(self, feature, threshold, left, right, missing_left, missing_type, value, depth) -> None:
+        """One tree in its source numbering: node 0 is the root, left/right are -1 at leaves."""
+        left, right = np.asarray(left), np.asarray(right)
+        order = _bfs_order(left, right)
+        new_id = np.empty(len(left), dtype=np.int64)
+        new_id[order] = np.arange(len(order))
+        is_leaf = left[order] < 0
+        off = self.n_nodes
+        self.cols["child"].append(np.where(is_leaf, np.arange(len(order)), new_id[left[order]]) + off)
+        self.cols["feature"].append(np.where(is_leaf, 0, np.asarray(feature)[order]))
+        self.cols["threshold"].append(np.where(is_leaf, np.inf, np.asarray(threshold, dtype=np.float64)[order]))
+        self.cols["missing_left"].append(np.where(is_leaf, True, np.asarray(missing_left, dtype=bool)[order]))
+        self.cols["missing_type"].append(np.asarray(missing_type)[order])
+        self.cols["value"].append(np.asarray(value, dtype=np.float64).reshape(len(left), self.n_outputs)[order])
+        self.roots.append(off)
+        self.n_nodes += len(order)
+        self.max_depth = max(self.max_depth, int(depth))
+
+    def build(self, **kwargs) -> FlatForest:
+        idx = np.int32 if self.n_nodes < 2**31 else np.int64
+        dtypes = {"child": idx, "feature": idx, "threshold": np.float64, "missing_left": bool,
+                  "missing_type": np.int8, "value": np.float64}
+        cat = {k: np.ascontiguousarray(np.concatenate(v), dtype=dtypes[k]) for k, v in self.cols.items()}
+        return FlatForest(
+            **cat,
+            roots=np.asarray(self.roots, dtype=idx),
+            max_depth=self.max_depth,
+            has_zero_missing=bool((cat["missing_type"] == _MISSING_ZERO).any()),
+            **kwargs,
+        )
+
+
+def _flatten_sklearn_forest(model: Any) -> FlatForest:
+    if getattr(model, "n_outputs_", 1) != 1:
+        raise ValueError("multi-output forests are not supported")
+    k = int(model.n_classes_)
+    b = _Builder(k)
+    for est in model.estimators_:
+        t = est.tree_
+        v = t.value[:, 0, :k].astype(np.float64)
+        # sklearn >= 1.4 stores class fractions and returns them as-is; older trees hold
+        # weighted counts that predict_proba normalizes per row
+        norm = v.sum(axis=1, keepdims=True)
+        if np.allclose(norm, 1.0):
+            norm = np.ones_like(norm)
+        norm[norm == 0.0] = 1.0
+        missing_left = getattr(t, "missing_go_to_left", np.zeros(t.node_count, dtype=np.uint8))
+        b.add_tree(
+            t.feature, t.threshold, t.children_left, t.children_right,
+            missing_left.astype(bool), np.full(t.node_count, _MISSING_NAN), v / norm, t.max_depth,
+        )
+    names = getattr(model, "feature_names_in_", None)
+    return b.build(
+        link="mean",
+        classes_=np.asarray(model.classes_),
+        n_features=int(model.n_features_in_),
+        float32_inputs=True,  # sklearn trees compare float32 inputs against float64 thresholds
+        feature_names=tuple(map(str, names)) if names is not None else None,
+    )
+
+
+def _flatten_lgbm_booster(booster: Any, classes: np.ndarray, num_iteration: int | None) -> FlatForest:
+    dump = booster.dump_model(num_iteration=num_iteration or -1)
+    if dump.get("average_output"):
+        raise ValueError("LightGBM rf boosting (average_output) is not supported")
+    k = int(dump["num_tree_per_iteration"])
+    b = _Builder(k)
+    missing_codes = {"None": _MISSING_NONE, "Zero": _MISSING_ZERO, "NaN": _MISSING_NAN}
+
+    for i, info in enumerate(dump["tree_info"]):
+        feat, thr, left, right, mleft, mtype, val = [], [], [], [], [], [], []
+
+        def visit(node: dict[str, Any], depth: int) -> tuple[int, int]:
+            nid = len(feat)
+            feat.append(-1)
+            thr.append(0.0)
+            left.append(-1)
+            right.append(-1)
+            mleft.append(False)
+            mtype.append(_MISSING_NONE)
+            out = np.zeros(k)
+            val.append(out)
+            if "leaf_value" in node:
+                out[i % k] = float(node["leaf_value"])
+                return nid, depth
+            if node.get("decision_type", "<=") != "<=":
+                raise ValueError("categorical LightGBM splits are not supported")
+            feat[nid] = int(node["split_feature"])
+            thr[nid] = float(node["threshold"])
+            mleft[nid] = bool(node.get("default_left", True))
+            mtype[nid] = missing_codes[node.get("missing_type", "None")]
+            left[nid], dl = visit(node["left_child"], depth + 1)
+            right[nid], dr = visit(node["right_child"], depth + 1)
+            return nid, max(dl, dr)
+
+        _, depth = visit(info["tree_structure"], 0)
+        b.add_tree(np.array(feat), np.array(thr), np.array(left), np.array(right),
+                   np.array(mleft), np.array(mtype), np.array(val), depth)
+
+    objective = str(dump.get("objective", ""))
+    if k == 1 and objective.startswith("binary"):
+        link = "sigmoid"
+        # "binary sigmoid:2" scales the raw score inside the sigmoid; fold it into the leaves
+        scale = next((float(t.split(":", 1)[1]) for t in objective.split() if t.startswith("sigmoid:")), 1.0)
+        if scale != 1.0:
+            b.cols["value"] = [v * scale for v in b.cols["value"]]
+    elif k > 1 and objective.startswith("multiclass") and "ova" not in objective:
+        link = "softmax"
+    else:
+        raise ValueError(f"unsupported LightGBM objective for flattening: {objective}")
+    return b.build(
+        link=link,
+        classes_=np.asarray(classes),
+        n_features=int(dump["max_feature_idx"]) + 1,
+        feature_names=tuple(dump.get("feature_names") or ()) or None,
+    )
+
+
+def flatten_model(model: Any) -> FlatForest:
+    """
+    Export a fitted model to a FlatForest. Accepts a sklearn RandomForest/ExtraTrees
+    classifier, an LGBMNativeClassifier, an lightgbm LGBMClassifier, or an SKLearnClassifier
+    wrapping one of those. Other model types raise TypeError; supported types with trees or
+    objectives the flat layout cannot express (categorical splits, rf boosting) raise ValueError.
+    """
+    from excrypto.ml.models_lgbm import LGBMNativeClassifier
+    from excrypto.ml.models_sklearn import SKLearnClassifier
+
+    if isinstance(model, SKLearnClassifier):
+        model = model.model
+    if isinstance(model, FlatForest):
+        return model
+    if isinstance(model, LGBMNativeClassifier):
+        return _flatten_lgbm_booster(model.booster, model.classes_, model.best_iteration)
+    if hasattr(model, "booster_") and hasattr(model, "classes_"):  # lightgbm.LGBMClassifier
+        return _flatten_lgbm_booster(model.booster_, model.classes_, getattr(model, "best_iteration_", None))
+    if hasattr(model, "estimators_") and hasattr(model, "n_classes_"):
+        return _flatten_sklearn_forest(model)
+    raise TypeError(f"Cannot flatten model of type {type(model).__name__}")
+
+
+def flatten_run(manifest_path: Path, *, runs_root: Path = Path("runs")) -> Path:
+    """
+    Write `model_flat.joblib` next to an ML run's model and record it as `paths.model_flat`
+    in the run manifest (predict picks it up with flat=True).
+    """
+    from excrypto.ml.registry import get_registry
+    from excrypto.ml.resolve import load_manifest
+
+    man = load_manifest(Path(manifest_path))
+    loaded = get_registry().load_manifest(manifest_path, runs_root=runs_root)
+    t0 = time.perf_counter()
+    flat = flatten_model(loaded.model)
+    seconds = time.perf_counter() - t0
+    out = loaded.path.with_name("model_flat.joblib")
+    flat.save(str(out))
+    man["paths"]["model_flat"] = str(out)
+    man["flat"] = {
+        "n_trees": flat.n_trees,
+        "n_nodes": int(len(flat.feature)),
+        "max_depth": flat.max_depth,
+        "link": flat.link,
+        "bytes": out.stat().st_size,
+        "seconds": round(seconds, 4),
+    }
+    Path(manifest_path).write_text(json.dumps(man, indent=2, sort_keys=True))
+    return out
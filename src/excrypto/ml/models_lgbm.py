@@ -0,0 +1,182 @@
+# src/excrypto/ml/models_lgbm.py
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+import joblib
+import lightgbm as lgb
+import numpy as np
+
+from excrypto.data.splits import IndexRanges
+
+DEFAULT_PARAMS: dict[str, Any] = {
+    "learning_rate": 0.05,
+    "num_leaves": 31,
+    "min_data_in_leaf": 50,
+    "feature_fraction": 0.9,
+    "bagging_fraction": 0.8,
+    "bagging_freq": 1,
+    "seed": 0,
+    "num_threads": 0,
+    "deterministic": True,
+    "force_row_wise": True,
+    "verbosity": -1,
+}
+
+# sklearn-style names accepted in train/sweep configs
+_ALIASES = {"n_estimators": "num_boost_round", "n_jobs": "num_threads", "random_state": "seed"}
+
+
+@dataclass
+class LGBMNativeClassifier:
+    """
+    LightGBM via the native API (lgb.Dataset / lgb.train), same surface as SKLearnClassifier.
+
+    In CV (`fit_fold`) the whole training table is binned once into a constructed Dataset and
+    each fold trains on `subset`s of it, so histogram bin boundaries are computed once and
+    shared by every fold (they see feature values of the whole table, never labels). Each fold
+    early-stops on its validation rows; `with_fold_results` turns the folds' best iterations
+    into the round count used by the final `fit`.
+    """
+    params: dict[str, Any] = field(default_factory=lambda: dict(DEFAULT_PARAMS))
+    num_boost_round: int = 1000
+    early_stopping_rounds: int = 50
+    max_bin: int = 255
+    booster: lgb.Booster | None = None
+    classes_: np.ndarray | None = None
+    best_iteration: int | None = None
+    _binned: tuple[int, lgb.Dataset] | None = field(default=None, repr=False)
+
+    @classmethod
+    def make(cls, **kwargs) -> "LGBMNativeClassifier":
+        kw = {_ALIASES.get(k, k): v for k, v in kwargs.items()}
+        num_boost_round = int(kw.pop("num_boost_round", 1000))
+        early_stopping_rounds = int(kw.pop("early_stopping_rounds", 50))
+        max_bin = int(kw.pop("max_bin", 255))
+        return cls(
+            params={**DEFAULT_PARAMS, **kw},
+            num_boost_round=num_boost_round,
+            early_stopping_rounds=early_stopping_rounds,
+            max_bin=max_bin,
+        )
+
+    def fresh(self, n_jobs: int | None = None) -> "LGBMNativeClassifier":
+        params = dict(self.params)
+        if n_jobs and int(params.get("num_threads", 0)) <= 0:
+            params["num_threads"] = int(n_jobs)
+        return LGBMNativeClassifier(
+            params=params,
+            num_boost_round=self.num_boost_round,
+            early_stopping_rounds=self.early_stopping_rounds,
+            max_bin=self.max_bin,
+        )
+
+    def _train_params(self) -> dict[str, Any]:
+        k = len(self.classes_)
+        if k < 2:
+            raise ValueError("lgbm needs at least two label classes")
+        if k == 2:
+            return {"objective": "binary", **self.params}
+        return {"objective": "multiclass", "num_class": k, **self.params}
+
+    def _encode(self, y) -> np.ndarray:
+        return np.searchsorted(self.classes_, np.asarray(y))
+
+    def _dataset(self, X, y) -> lgb.Dataset:
+        return lgb.Dataset(
+            X, label=self._encode(y), free_raw_data=False,
+            params={"max_bin": self.max_bin, "verbosity": -1},
+        )
+
+    def fit_fold(self, X, y, train: IndexRanges, valid: IndexRanges) -> "LGBMNativeClassifier":
+        # bins over the full table are built once per (X object) and reused by later folds
+        if self._binned is None or self._binned[0] != id(X):
+            self.classes_ = np.unique(np.asarray(y))
+            self._binned = (id(X), self._dataset(X, y).construct())
+        full = self._binned[1]
+        dtrain = full.subset(train.to_indices())
+        dvalid = full.subset(valid.to_indices())
+        self.booster = lgb.train(
+            self._train_params(), dtrain,
+            num_boost_round=self.num_boost_round,
+            valid_sets=[dvalid],
+            callbacks=[lgb.early_stopping(self.early_stopping_rounds, verbose=False)],
+        )
+        self.best_iteration = int(self.booster.best_iteration or self.booster.current_iteration())
+        return self
+
+    def fold_info(self) -> dict[str, Any]:
+        return {"best_iteration": self.best_iteration}
+
+    def with_fold_results(self, fold_metrics: list[dict[str, Any]]) -> "LGBMNativeClassifier":
+        """Final refit runs for the mean of the folds' early-stopped iteration counts."""
+        iters = [m["best_iteration"] for m in fold_metrics if m.get("best_iteration")]
+        out = self.fresh()
+        if iters:
+            out.num_boost_round = max(1, int(round(float(np.mean(iters)))))
+        return out
+
+    def fit(self, X, y) -> "LGBMNativeClassifier":
+        self.classes_ = np.unique(np.asarray(y))
+        self.booster = lgb.train(self._train_params(), self._dataset(X, y), num_boost_round=self.num_boost_round)
+        self.best_iteration = self.booster.current_iteration()
+        self._binned = None
+        return self
+
+    def warm_update(self, X, y, *, n_new: int, forget: dict[str, Any] | None = None) -> dict[str, Any]:
+        """
+        Continue boosting a fitted model for `n_new` rounds on (X, y) only (init_model).
+        forget.decay_rate first refits the existing trees' leaf values on (X, y), keeping that
+        share of each old value (Booster.refit), so old trees drift toward recent data.
+        Returns a summary for the run manifest.
+        """
+        unknown = set(forget or {}) - {"decay_rate"}
+        if unknown:
+            raise ValueError(f"Unsupported forgetting policy for lgbm: {sorted(unknown)}")
+        if self.booster is None:
+            raise ValueError("warm updates need a fitted model")
+        classes = np.unique(np.asarray(y))
+        if not np.array_equal(classes, self.classes_):
+            raise ValueError(f"update rows have classes {classes.tolist()}, model has {self.classes_.tolist()}")
+        before = int(self.best_iteration or self.booster.current_iteration())
+        booster = self.booster
+        decay_rate = (forget or {}).get("decay_rate")
+        if decay_rate is not None:
+            booster = booster.refit(X, self._encode(y), decay_rate=float(decay_rate))
+        self.booster = lgb.train(
+            self._train_params(), self._dataset(X, y), num_boost_round=int(n_new), init_model=booster,
+        )
+        self.best_iteration = self.booster.current_iteration()
+        self.num_boost_round = self.best_iteration
+        self._binned = None
+        return {"iterations_before": before, "iterations_added": int(n_new), "leaf_decay_rate": decay_rate,
+                "iterations": self.best_iteration}
+
+    def predict_proba(self, X) -> np.ndarray:
+        p = self.booster.predict(X, num_iteration=self.best_iteration)
+        if p.ndim == 1:
+            return np.column_stack([1.0 - p, p])
+        return p
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def predict_score(self, X) -> np.ndarray:
+        return self.predict_proba(X)[:, -1]
+
+    def refit_info(self) -> dict[str, Any]:
+        return {"num_boost_round": self.num_boost_round}
+
+    def __getstate__(self) -> dict[str, Any]:
+        # the binned Dataset is a per-process cache, never pickled (pool tasks, model.joblib)
+        state = dict(self.__dict__)
+        state["_binned"] = None
+        return state
+
+    def save(self, path: str) -> None:
+        joblib.dump(self, path, compress=0)
+
+    @classmethod
+    def load(cls, path: str) -> "LGBMNativeClassifier":
+        return joblib.load(path)
@@ -6,6 +6,7 @@ from typing import Any
 
 import joblib
 import numpy as np
+from sklearn.base import clone
 from sklearn.ensemble import RandomForestClassifier
 
 
@@ -20,15 +21,52 @@ class SKLearnClassifier:
     @classmethod
     def make(cls, kind: str = "rf", **kwargs) -> "SKLearnClassifier":
         if kind == "rf":
-            m = RandomForestClassifier(n_estimators=300, random_state=0, n_jobs=-1, **kwargs)
+            params = {"n_estimators": 300, "random_state": 0, "n_jobs": -1, **kwargs}
+            m = RandomForestClassifier(**params)
         else:
             raise ValueError(f"Unknown model kind: {kind}")
         return cls(model=m)
 
+    def fresh(self, n_jobs: int | None = None) -> "SKLearnClassifier":
+        """Unfitted copy; `n_jobs` replaces an all-cores setting (None / -1) but not an explicit one."""
+        m = clone(self.model)
+        current = m.get_params(deep=False).get("n_jobs", 0)
+        if n_jobs and (current is None or current < 0):
+            m.set_params(n_jobs=n_jobs)
+        return SKLearnClassifier(model=m)
+
     def fit(self, X, y) -> "SKLearnClassifier":
         self.model.fit(X, y)
         return self
 
+    def warm_update(self, X, y, *, n_new: int, forget: dict[str, Any] | None = None) -> dict[str, Any]:
+        """
+        Grow a fitted forest by `n_new` trees trained on (X, y) only (sklearn warm_start).
+        forget.max_trees drops the oldest trees beyond that count, so the forest slides
+        forward in time. Returns a summary for the run manifest.
+        """
+        m = self.model
+        unknown = set(forget or {}) - {"max_trees"}
+        if unknown:
+            raise ValueError(f"Unsupported forgetting policy for {type(m).__name__}: {sorted(unknown)}")
+        if not hasattr(m, "estimators_") or "warm_start" not in m.get_params(deep=False):
+            raise ValueError(f"warm updates need a fitted forest, got {type(m).__name__}")
+        classes = np.unique(np.asarray(y))
+        if not np.array_equal(classes, m.classes_):
+            raise ValueError(f"update rows have classes {classes.tolist()}, model has {m.classes_.tolist()}")
+        before = len(m.estimators_)
+        m.set_params(warm_start=True, n_estimators=before + int(n_new))
+        m.fit(X, y)
+        m.set_params(warm_start=False)
+        dropped = 0
+        max_trees = (forget or {}).get("max_trees")
+        if max_trees and len(m.estimators_) > int(max_trees):
+            dropped = len(m.estimators_) - int(max_trees)
+            m.estimators_ = m.estimators_[dropped:]
+            m.set_params(n_estimators=len(m.estimators_))
+        return {"trees_before": before, "trees_added": int(n_new), "trees_dropped": dropped,
+                "trees": len(m.estimators_)}
+
     def predict_score(self, X) -> np.ndarray:
         if hasattr(self.model, "predict_proba"):
             p = self.model.predict_proba(X)
@@ -41,7 +79,8 @@ class SKLearnClassifier:
         return self.model.predict(X)
 
     def save(self, path: str) -> None:
-        joblib.dump(self.model, path)
+        # uncompressed: numpy arrays stay raw in the file so the registry can mmap them
+        joblib.dump(self.model, path, compress=0)
 
     @classmethod
     def load(cls, path: str) -> "SKLearnClassifier":
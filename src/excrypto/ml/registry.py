@@ -0,0 +1,158 @@
+# src/excrypto/ml/registry.py
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import joblib
+
+from excrypto.ml.models_sklearn import SKLearnClassifier
+from excrypto.ml.resolve import load_manifest, read_latest_pointer
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    """
+    A model from the registry: the raw estimator plus where it came from and what it cost.
+
+    Cached entries are shared by every caller in the process (predict, the inference predictor,
+    the comparator, the scoring service), so `model` is read-only: callers that set params
+    (n_jobs, warm_start, ...) or refit load with `fresh=True` and get a private copy.
+    """
+    model: Any
+    path: Path
+    mtime_ns: int
+    load_seconds: float
+    mmap_mode: str | None
+    manifest: dict[str, Any] | None = None
+    manifest_path: Path | None = None
+
+    @property
+    def classifier(self) -> SKLearnClassifier:
+        return SKLearnClassifier(model=self.model)
+
+    @property
+    def feature_cols(self) -> list[str] | None:
+        ds = (self.manifest or {}).get("dataset") or {}
+        return list(ds["feature_cols"]) if ds.get("feature_cols") else None
+
+
+def _abs(runs_root: Path, p: str | Path) -> Path:
+    pp = Path(p)
+    if pp.is_absolute():
+        return pp
+    if pp.parts and pp.parts[0] == Path(runs_root).name:
+        return pp.resolve()
+    return (Path(runs_root) / pp).resolve()
+
+
+@dataclass
+class ModelRegistry:
+    """
+    In-process LRU of loaded models keyed by (resolved path, mtime_ns): re-loading the same
+    file is free, and overwriting it (a retrain into the same run dir) invalidates the entry.
+
+    Loads go through joblib.load(mmap_mode=...). Model dumps are uncompressed (see
+    SKLearnClassifier.save), so numpy-backed arrays inside them are mapped read-only from the
+    page cache instead of copied into every process. Cached models are shared and read-only;
+    `load(..., fresh=True)` returns a private, writable copy that bypasses the cache.
+    """
+    max_models: int = 8
+    mmap_mode: str | None = "r"
+    _cache: OrderedDict = field(default_factory=OrderedDict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    hits: int = 0
+    misses: int = 0
+
+    def load(self, path: str | Path, *, manifest: dict[str, Any] | None = None,
+             manifest_path: Path | None = None, fresh: bool = False) -> LoadedModel:
+        p = Path(path).resolve()
+        key = (str(p), p.stat().st_mtime_ns)
+        if fresh:
+            # private copy for callers that mutate the estimator: not mmap'd, not cached
+            t0 = time.perf_counter()
+            model = joblib.load(p)
+            return LoadedModel(model=model, path=p, mtime_ns=key[1], load_seconds=round(time.perf_counter() - t0, 4),
+                               mmap_mode=None, manifest=manifest, manifest_path=manifest_path)
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return hit
+
+        t0 = time.perf_counter()
+        model = joblib.load(p, mmap_mode=self.mmap_mode)
+        loaded = LoadedModel(
+            model=model,
+            path=p,
+            mtime_ns=key[1],
+            load_seconds=round(time.perf_counter() - t0, 4),
+            mmap_mode=self.mmap_mode,
+            manifest=manifest,
+            manifest_path=manifest_path,
+        )
+        with self._lock:
+            self.misses += 1
+            # drop stale versions of the same file, then enforce the size bound
+            for k in [k for k in self._cache if k[0] == key[0]]:
+                del self._cache[k]
+            self._cache[key] = loaded
+            while len(self._cache) > self.max_models:
+                self._cache.popitem(last=False)
+        return loaded
+
+    def load_manifest(self, manifest_path: str | Path, *, runs_root: Path = Path("runs"),
+                      fresh: bool = False) -> LoadedModel:
+        """Load the model of an `ml_model` manifest (model path resolved like the ML service does)."""
+        man = load_manifest(Path(manifest_path))
+        if man.get("kind") not in (None, "ml_model"):
+            raise ValueError(f"Not an ML model manifest ({man.get('kind')}): {manifest_path}")
+        return self.load(_abs(runs_root, man["paths"]["model"]), manifest=man, manifest_path=Path(manifest_path),
+                         fresh=fresh)
+
+    def load_latest(
+        self,
+        runs_root: Path,
+        snapshot: str,
+        *,
+        timeframe: str | None = None,
+        universe: str | None = None,
+        stage: str = "ml",
+    ) -> LoadedModel:
+        ptr = read_latest_pointer(runs_root, snapshot, stage, timeframe=timeframe, universe=universe)
+        return self.load_manifest(ptr, runs_root=runs_root)
+
+    def resolve(self, ref: str | Path, *, runs_root: Path = Path("runs")) -> LoadedModel:
+        """A model file, or a manifest .json (ML manifest or latest pointer)."""
+        p = Path(ref)
+        if p.suffix != ".json":
+            return self.load(p)
+        man = load_manifest(p)
+        if "kind" not in man and (man.get("paths") or {}).get("manifest"):
+            return self.load_manifest(man["paths"]["manifest"], runs_root=runs_root)
+        return self.load_manifest(p, runs_root=runs_root)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "cached": [{"path": k[0], "load_seconds": v.load_seconds} for k, v in self._cache.items()],
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+_REGISTRY = ModelRegistry()
+
+
+def get_registry() -> ModelRegistry:
+    """Process-wide registry shared by predict, the inference predictor and the comparator."""
+    return _REGISTRY
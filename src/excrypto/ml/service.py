@@ -1,25 +1,35 @@
 # src/excrypto/ml/service.py
 from __future__ import annotations
 
+import hashlib
 import json
 import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
-
-from excrypto.ml.datasets import load_xy
-from excrypto.ml.evaluate import cls_metrics
+import pyarrow as pa
+import pyarrow.parquet as pq
+from threadpoolctl import threadpool_limits
+
+from excrypto.ml.cache import XYCache, xy_cache_key
+from excrypto.ml.datasets import XYData, load_xy
+from excrypto.ml.evaluate import cls_metrics, finite_or_none, threshold_sweep
+from excrypto.ml.models_lgbm import LGBMNativeClassifier
 from excrypto.ml.models_sklearn import SKLearnClassifier
-from excrypto.ml.resolve import read_latest_pointer, load_manifest, write_latest_pointer
-from excrypto.ml.splitters import PurgedKFold
+from excrypto.ml.registry import get_registry
+from excrypto.ml.resolve import now_utc, read_latest_pointer, load_manifest, write_latest_pointer
+from excrypto.ml.splitters import FoldRanges, folds_to_manifest, splitter_from_cfg
 from excrypto.utils.config import load_cfg, cfg_hash
+from excrypto.utils.parallel import load_spooled, resolve_workers, spooled_arrays, thread_budget
 from excrypto.utils.paths import RunPaths
 
 
-def _now_utc() -> str:
-    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+Classifier = SKLearnClassifier | LGBMNativeClassifier
 
 
 def _abs_from_runs_root(runs_root: Path, p: str | Path) -> Path:
@@ -46,24 +56,155 @@ def _universe_for(snapshot: str, stage: str, symbols: list[str], timeframe: str,
     ).universe
 
 
+def fit_fold(clf: Classifier, X, y, fold: FoldRanges, threshold: float) -> tuple[dict[str, Any], np.ndarray]:
+    """
+    Fit on the fold's train rows and score its validation rows; returns (metrics, scores in
+    validation-row order). Models with a `fit_fold` hook (lgbm: shared bins + early
+    stopping) get the full table and the ranges instead of slices.
+    """
+    tr, va = fold
+    t0 = time.perf_counter()
+    if hasattr(clf, "fit_fold"):
+        clf.fit_fold(X, y, tr, va)
+    else:
+        clf.fit(tr.take(X), tr.take(y))
+    t_fit = time.perf_counter()
+    score = clf.predict_score(va.take(X))
+    m = cls_metrics(np.asarray(va.take(y)), score, threshold)
+    m.update(
+        n_train=tr.size,
+        n_valid=va.size,
+        fit_seconds=round(t_fit - t0, 4),
+        wall_seconds=round(time.perf_counter() - t0, 4),
+    )
+    if hasattr(clf, "fold_info"):
+        m.update(clf.fold_info())
+    return m, np.asarray(score, dtype=np.float64)
+
+
+def fit_fold_spooled(
+    spool_dir: str,
+    columns: list[str],
+    clf: Classifier,
+    fold: FoldRanges,
+    threshold: float,
+    n_threads: int,
+) -> tuple[dict[str, Any], np.ndarray]:
+    """
+    Worker entry point: view the memory-mapped X/y spool (no copy), fit a fresh copy of the
+    estimator under a per-process thread budget; only the fold's rows get materialized.
+    """
+    X = pd.DataFrame(load_spooled(spool_dir, "X"), columns=columns, copy=False)
+    y = load_spooled(spool_dir, "y")
+    with threadpool_limits(limits=n_threads):
+        return fit_fold(clf.fresh(n_threads), X, y, fold, threshold)
+
+
+def _cv_metrics(
+    clf: SKLearnClassifier,
+    X: pd.DataFrame,
+    y: pd.Series,
+    folds: list[FoldRanges],
+    threshold: float,
+    workers: int,
+) -> tuple[list[tuple[dict[str, Any], np.ndarray]], int]:
+    """
+    Per-fold (metrics, validation scores), serially or with one process per fold (up to
+    `workers`). Returns them in fold order plus the thread budget each worker ran with.
+    """
+    n_workers = min(resolve_workers(workers), len(folds))
+    if n_workers <= 1:
+        return [fit_fold(clf, X, y, fold, threshold) for fold in folds], 0
+
+    n_threads = thread_budget(n_workers)
+    with spooled_arrays(X=X.to_numpy(dtype=np.float64), y=y.to_numpy()) as spool:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = [
+                pool.submit(fit_fold_spooled, str(spool), list(X.columns), clf, fold, threshold, n_threads)
+                for fold in folds
+            ]
+            return [f.result() for f in futures], n_threads
+
+
+def _oof_frame(keys: pd.DataFrame, y: pd.Series, folds: list[FoldRanges], scores: list[np.ndarray]) -> pd.DataFrame:
+    """One row per validation row of every fold: timestamp, symbol, fold, score, label."""
+    parts = []
+    for k, ((_, va), score) in enumerate(zip(folds, scores)):
+        idx = va.to_indices()
+        part = keys.iloc[idx].reset_index(drop=True)
+        part["fold"] = np.int32(k)
+        part["score"] = score
+        part["label"] = y.to_numpy()[idx]
+        parts.append(part)
+    return pd.concat(parts, ignore_index=True)
+
+
+def _threshold_selection(oof: pd.DataFrame, fold_metrics: list[dict[str, Any]]) -> dict[str, Any] | None:
+    """Macro-F1-optimal threshold over the pooled out-of-fold scores (binary labels only)."""
+    if oof.empty or not set(np.unique(oof["label"])) <= {0, 1}:
+        return None
+    sweep = threshold_sweep(oof["label"].to_numpy(), oof["score"].to_numpy())
+    best = sweep.best("f1_macro")
+    return {
+        "metric": "f1_macro",
+        "source": "oof",
+        "selected": best["threshold"],
+        "f1": best["f1"],
+        "auc": finite_or_none(sweep.auc()),
+        "ap": finite_or_none(sweep.average_precision()),
+        "per_fold": [m.get("best_threshold") for m in fold_metrics],
+    }
+
+
 @dataclass(frozen=True)
-class TrainResult:
-    model_path: Path
-    manifest_path: Path
-    metrics_path: Path
+class TrainInputs:
+    features_manifest: Path
+    labels_manifest: Path
+    features_path: Path
+    labels_path: Path
+    labels_meta: dict[str, Any]
+
+    def to_dict(self) -> dict[str, str]:
+        return {
+            "features_manifest": str(self.features_manifest),
+            "labels_manifest": str(self.labels_manifest),
+            "features_path": str(self.features_path),
+            "labels_path": str(self.labels_path),
+        }
 
 
-def train_model(
+@dataclass(frozen=True)
+class TrainingTable:
+    xy: XYData
+    cache_key: dict[str, Any]
+    cache_hit: bool
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "cache_key": self.cache_key["id"],
+            "cache_hit": self.cache_hit,
+            "join": self.xy.join,
+            "n_rows": int(len(self.xy.y)),
+            "feature_cols": list(self.xy.feature_cols),
+            **self.time_range(),
+        }
+
+    def time_range(self) -> dict[str, str]:
+        ts = self.xy.keys.get("timestamp")
+        if ts is None or not len(ts):
+            return {}
+        return {"data_start": pd.Timestamp(ts.min()).isoformat(), "data_end": pd.Timestamp(ts.max()).isoformat()}
+
+
+def resolve_train_inputs(
     *,
     snapshot: str,
     symbols: list[str],
-    exchange: str,
     timeframe: str,
     runs_root: Path,
-    config: Path | None,
     features_manifest: Path | None,
     labels_manifest: Path | None,
-) -> TrainResult:
+) -> TrainInputs:
     # Resolve latest pointers per (timeframe, universe) like Features
     universe = _universe_for(snapshot, "features", symbols, timeframe, runs_root)
 
@@ -78,25 +219,47 @@ def train_model(
     feat_man = load_manifest(feat_man_path)
     lbl_man = load_manifest(lbl_man_path)
 
-    features_path = _abs_from_runs_root(runs_root, feat_man["paths"]["features"])
-    labels_path = _abs_from_runs_root(runs_root, lbl_man["paths"]["labels"])
-    label_col = lbl_man["label"]["label_col"]
-
-    train_cfg: dict[str, Any] = {}
-    train_cfg_hash = "p-default"
-    if config is not None:
-        train_cfg = load_cfg(config)
-        train_cfg_hash = cfg_hash(train_cfg)
-
-    xy = load_xy(str(features_path), str(labels_path), label_col=label_col)
-    X, y, used_label_col = xy.X, xy.y, xy.label_col
+    return TrainInputs(
+        features_manifest=feat_man_path,
+        labels_manifest=lbl_man_path,
+        features_path=_abs_from_runs_root(runs_root, feat_man["paths"]["features"]),
+        labels_path=_abs_from_runs_root(runs_root, lbl_man["paths"]["labels"]),
+        labels_meta=lbl_man,
+    )
 
-    split_cfg = train_cfg.get("split", {})
-    splitter = PurgedKFold(**split_cfg) if isinstance(split_cfg, dict) else PurgedKFold()
 
-    model_spec = train_cfg.get("model", "rf")
+def load_training_table(
+    inputs: TrainInputs,
+    *,
+    label_col: str | None,
+    runs_root: Path,
+    cache: bool = True,
+) -> TrainingTable:
+    lbl_man = inputs.labels_meta
+    # multi-label (grid) artifacts: pick the target via `label_col` in the train config
+    label_col = label_col or lbl_man["label"]["label_col"]
+    available = [e["label_col"] for e in lbl_man.get("labels", [])] or [lbl_man["label"]["label_col"]]
+    if label_col not in available:
+        raise ValueError(f"label_col '{label_col}' not in labels manifest: {available}")
+
+    # joined X/y are cached by (features manifest, labels manifest, label_col, NaN policy), so
+    # re-training with different model params skips the parquet read + join
+    xy_cache = XYCache.for_runs_root(runs_root) if cache else None
+    key = xy_cache_key(inputs.features_manifest, inputs.labels_manifest, label_col=label_col, dropna=True)
+    xy = xy_cache.get(key) if xy_cache else None
+    hit = xy is not None
+    if xy is None:
+        xy = load_xy(str(inputs.features_path), str(inputs.labels_path), label_col=label_col)
+        if xy_cache:
+            xy_cache.put(key, xy, sources={"features": str(inputs.features_path), "labels": str(inputs.labels_path)})
+            xy_cache.gc()
+    return TrainingTable(xy=xy, cache_key=key, cache_hit=hit)
+
+
+def make_classifier(model_spec: Any) -> Classifier:
+    """`model: rf` or `model: {name: rf|lgbm, params: {...}}` from a train config."""
     if isinstance(model_spec, str):
-        clf = SKLearnClassifier.make(model_spec)
+        kind, params = model_spec, {}
     elif isinstance(model_spec, dict):
         kind = str(model_spec.get("name", model_spec.get("kind", "rf")))
         params = model_spec.get("params", {})
@@ -104,53 +267,208 @@ def train_model(
             params = {}
         if not isinstance(params, dict):
             raise ValueError(f"model.params must be a dict, got {type(params)}")
-        clf = SKLearnClassifier.make(kind, **params)
     else:
         raise ValueError(f"Invalid model spec type for 'model': {type(model_spec)}")
+    if kind == "lgbm":
+        return LGBMNativeClassifier.make(**params)
+    return SKLearnClassifier.make(kind, **params)
+
+
+def _load_parent(parent: Path, runs_root: Path) -> tuple[dict[str, Any], Path, Classifier]:
+    """A private (mutable, not mmap'd) copy of the parent run's model; registry entries stay intact."""
+    man = load_manifest(parent)
+    if man.get("kind") != "ml_model":
+        raise ValueError(f"Not an ML model manifest ({man.get('kind')}): {parent}")
+    model_path = _abs_from_runs_root(runs_root, man["paths"]["model"])
+    obj = get_registry().load(model_path, fresh=True).model
+    return man, model_path, obj if isinstance(obj, LGBMNativeClassifier) else SKLearnClassifier(model=obj)
+
+
+def _warm_update(
+    parent: Path,
+    table: TrainingTable,
+    X: pd.DataFrame,
+    y: pd.Series,
+    inc_cfg: dict[str, Any],
+    threshold: float,
+    runs_root: Path,
+) -> tuple[Classifier, dict[str, Any], dict[str, Any]]:
+    """
+    Incremental retrain from `parent`: score the parent on rows newer than its training data
+    (prequential, out-of-sample for the parent), then add trees/rounds fitted on the recent
+    window only (`incremental.window`, default: just the new rows) and apply the forgetting
+    policy. Returns (model, metrics block, lineage block).
+    """
+    p_man, p_model, clf = _load_parent(parent, runs_root)
+    p_ds = p_man.get("dataset") or {}
+    if list(p_ds.get("feature_cols") or []) != list(table.xy.feature_cols):
+        raise ValueError("incremental: feature columns differ from the parent model's; retrain from scratch")
+    if not p_ds.get("data_end"):
+        raise ValueError(f"incremental: parent manifest has no dataset.data_end: {parent}")
+
+    ts = table.xy.keys["timestamp"]
+    parent_end = pd.Timestamp(p_ds["data_end"])
+    new = (ts > parent_end).to_numpy()
+    if not new.any():
+        raise ValueError(f"incremental: no rows after the parent's data_end ({parent_end})")
+    window = inc_cfg.get("window")
+    recent = (ts > ts.max() - pd.Timedelta(window)).to_numpy() if window else new
+
+    t0 = time.perf_counter()
+    prequential = cls_metrics(y.to_numpy()[new], clf.predict_score(X[new]), threshold)
+    prequential["n_rows"] = int(new.sum())
+    t1 = time.perf_counter()
+    default_new = 50 if isinstance(clf, LGBMNativeClassifier) else 20
+    update = clf.warm_update(
+        X[recent], y[recent], n_new=int(inc_cfg.get("new_trees", default_new)), forget=inc_cfg.get("forget"),
+    )
+    metrics = {
+        "prequential": prequential,
+        "update": update,
+        "score_seconds": round(t1 - t0, 4),
+        "update_seconds": round(time.perf_counter() - t1, 4),
+    }
+    p_lineage = p_man.get("lineage") or {}
+    lineage = {
+        "mode": "warm_start",
+        "parent_manifest": str(parent),
+        "parent_model": str(p_model),
+        "parent_created_at": p_man.get("created_at"),
+        "parent_data_end": p_ds["data_end"],
+        "root_manifest": p_lineage.get("root_manifest", str(parent)),
+        "generation": int(p_lineage.get("generation", 0)) + 1,
+        "window": window,
+        "new_rows": int(new.sum()),
+        "window_rows": int(recent.sum()),
+        "update": update,
+    }
+    return clf, metrics, lineage
 
-    threshold = float(train_cfg.get("threshold", 0.5))
-    fold_metrics: list[dict[str, Any]] = []
-    for _, (tr_idx, te_idx) in enumerate(splitter.split(X)):
-        clf.fit(X.iloc[tr_idx], y.iloc[tr_idx])
-        score = clf.predict_score(X.iloc[te_idx])
-        pred = (score >= threshold).astype(int)
-        fold_metrics.append(cls_metrics(y.iloc[te_idx].to_numpy(), pred, score))
 
-    clf.fit(X, y)
+@dataclass(frozen=True)
+class TrainResult:
+    model_path: Path
+    manifest_path: Path
+    metrics_path: Path
+
+
+def train_model(
+    *,
+    snapshot: str,
+    symbols: list[str],
+    exchange: str,
+    timeframe: str,
+    runs_root: Path,
+    config: Path | None,
+    features_manifest: Path | None,
+    labels_manifest: Path | None,
+    fold_workers: int = 1,
+    cache: bool = True,
+    parent: Path | None = None,
+) -> TrainResult:
+    """
+    Purged-CV metrics plus a final fit on the full table. With `parent` (an ML model manifest)
+    the run is incremental instead: no CV, the parent's model is warm-started on recent rows
+    (see `_warm_update` and the `incremental` config block) and the manifest records lineage.
+    """
+    inputs = resolve_train_inputs(
+        snapshot=snapshot, symbols=symbols, timeframe=timeframe, runs_root=runs_root,
+        features_manifest=features_manifest, labels_manifest=labels_manifest,
+    )
+
+    train_cfg: dict[str, Any] = {}
+    train_cfg_hash = "p-default"
+    if config is not None:
+        train_cfg = load_cfg(config)
+        train_cfg_hash = cfg_hash(train_cfg)
+
+    table = load_training_table(inputs, label_col=train_cfg.get("label_col"), runs_root=runs_root, cache=cache)
+    xy = table.xy
+    X, y, used_label_col = xy.X_frame(), xy.y_series(), xy.label_col
+
+    splitter = splitter_from_cfg(train_cfg.get("split", {}))
+
+    clf = make_classifier(train_cfg.get("model", "rf"))
+
+    threshold = float(train_cfg.get("threshold", 0.5))
+    run_params = {"exchange": exchange, "cfg": train_cfg_hash}
+    incremental, lineage = {}, None
+    t0 = time.perf_counter()
+    oof = pd.DataFrame()
+    if parent is not None:
+        folds, fold_metrics = [], []
+        clf, incremental, lineage = _warm_update(
+            parent, table, X, y, train_cfg.get("incremental") or {}, threshold, runs_root,
+        )
+        run_params["parent"] = hashlib.md5(str(Path(parent).resolve()).encode("utf-8")).hexdigest()[:10]
+        timing = {"update_seconds": round(time.perf_counter() - t0, 4)}
+    else:
+        folds = list(splitter.split_ranges(X))
+        fold_results, threads_per_worker = _cv_metrics(clf, X, y, folds, threshold, fold_workers)
+        fold_metrics = [m for m, _ in fold_results]
+        oof = _oof_frame(xy.keys, y, folds, [score for _, score in fold_results])
+        t_cv = time.perf_counter()
+        if hasattr(clf, "with_fold_results"):
+            # e.g. lgbm: refit for the folds' early-stopped number of rounds
+            clf = clf.with_fold_results(fold_metrics)
+        clf.fit(X, y)
+        timing = {
+            "fold_workers": min(resolve_workers(fold_workers), len(folds)),
+            "threads_per_worker": threads_per_worker or None,
+            "cv_seconds": round(t_cv - t0, 4),
+            "refit_seconds": round(time.perf_counter() - t_cv, 4),
+        }
 
     out_paths = RunPaths(
         snapshot=snapshot,
         strategy="ml",
         symbols=tuple(symbols),
         timeframe=timeframe,
-        params={"exchange": exchange, "cfg": train_cfg_hash},
+        params=run_params,
         runs_root=runs_root,
     )
     out_paths.ensure(report=False)
 
     model_bin = out_paths.base / "model.joblib"
     metrics_path = out_paths.base / "metrics.json"
+    oof_path = out_paths.base / "oof_scores.parquet"
     clf.save(str(model_bin))
-    metrics_path.write_text(json.dumps({"folds": fold_metrics}, indent=2, sort_keys=True))
+    paths = {"model": str(model_bin), "metrics": str(metrics_path), "manifest": str(out_paths.manifest)}
+    if not oof.empty:
+        oof.to_parquet(oof_path, index=False)
+        paths["oof_scores"] = str(oof_path)
+    metrics = {
+        "folds": fold_metrics,
+        "timing": timing,
+        "refit": clf.refit_info() if hasattr(clf, "refit_info") else {},
+    }
+    if incremental:
+        metrics["incremental"] = incremental
+    metrics_path.write_text(json.dumps(metrics, indent=2, sort_keys=True))
 
     manifest = {
         "kind": "ml_model",
         "schema_version": 1,
-        "created_at": _now_utc(),
+        "created_at": now_utc(),
         "snapshot": snapshot,
         "timeframe": timeframe,
         "symbols": symbols,
         "exchange": exchange,
-        "inputs": {
-            "features_manifest": str(feat_man_path),
-            "labels_manifest": str(lbl_man_path),
-            "features_path": str(features_path),
-            "labels_path": str(labels_path),
-            "label_col": used_label_col,
+        "inputs": {**inputs.to_dict(), "label_col": used_label_col},
+        "dataset": table.to_dict(),
+        "train": {
+            "threshold": threshold,
+            "threshold_selection": _threshold_selection(oof, fold_metrics),
+            "train_cfg_hash": train_cfg_hash,
+            "train_cfg": train_cfg,
+            "model_bytes": model_bin.stat().st_size,
         },
-        "train": {"threshold": threshold, "train_cfg_hash": train_cfg_hash, "train_cfg": train_cfg},
-        "paths": {"model": str(model_bin), "metrics": str(metrics_path), "manifest": str(out_paths.manifest)},
+        # compact CV folds (row ranges into the training table); replay with `split: {folds_from: ...}`
+        "cv": folds_to_manifest(folds, n_rows=len(X)),
+        "paths": paths,
     }
+    if lineage is not None:
+        manifest["lineage"] = lineage
     out_paths.manifest.write_text(json.dumps(manifest, indent=2, sort_keys=True))
 
     # Write latest pointer per (timeframe, universe)
@@ -172,6 +490,59 @@ class PredictResult:
     manifest_path: Path
 
 
+# per-process scorer for predict pool workers (set by _init_scorer)
+_SCORER: dict[str, Any] = {}
+
+
+def _limit_model_threads(model: Any, n_threads: int) -> None:
+    if hasattr(model, "get_params") and "n_jobs" in model.get_params(deep=False):
+        model.set_params(n_jobs=n_threads)
+
+
+def _init_scorer(model_path: str, n_threads: int) -> None:
+    clf = get_registry().load(model_path, fresh=True).classifier  # n_jobs is set on it below
+    _limit_model_threads(clf.model, n_threads)
+    threadpool_limits(limits=n_threads)
+    _SCORER["clf"] = clf
+
+
+def _score_batch(X: np.ndarray, columns: list[str]) -> np.ndarray:
+    return _SCORER["clf"].predict_score(pd.DataFrame(X, columns=columns, copy=False))
+
+
+def _iter_feature_batches(features_path: Path, batch_rows: int | None):
+    """Whole file as one frame (batch_rows=None) or row-group-backed batches of <= batch_rows."""
+    if batch_rows is None:
+        yield pd.read_parquet(features_path)
+        return
+    pf = pq.ParquetFile(features_path)
+    for batch in pf.iter_batches(batch_size=int(batch_rows)):
+        yield pa.Table.from_batches([batch]).to_pandas()
+
+
+class _ParquetSink:
+    """
+    Appends DataFrames to one parquet file; the first frame fixes the schema. If no frame
+    arrives, close() writes `empty` (a zero-row frame with the output schema) instead.
+    """
+
+    def __init__(self, path: Path, empty: pd.DataFrame | None = None):
+        self.path, self._writer, self._schema, self._empty = path, None, None, empty
+
+    def write(self, df: pd.DataFrame) -> None:
+        table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+        if self._writer is None:
+            self._schema = table.schema
+            self._writer = pq.ParquetWriter(self.path, self._schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        elif self._empty is not None:
+            self._empty.to_parquet(self.path, index=False)
+
+
 def predict_signals(
     *,
     snapshot: str,
@@ -180,8 +551,23 @@ def predict_signals(
     timeframe: str,
     runs_root: Path,
     manifest: Path | None,
-    threshold: float,
+    threshold: float | None,
+    batch_rows: int | None = None,
+    workers: int = 1,
+    flat: bool = False,
 ) -> PredictResult:
+    """
+    Score the ML run's features parquet and write signals + panel.
+
+    batch_rows=None reads the file in one go. With batch_rows set, the file is streamed in
+    batches of at most that many rows and both outputs are appended batch by batch, so
+    memory is bounded by the batch size. With workers > 1, each pool process loads the
+    model once (with a per-process thread budget) and batches are scored there, at most
+    2*workers in flight. Results are written in input order either way, so the output
+    matches the one-shot path row for row. flat=True scores with the run's flattened
+    ensemble (`paths.model_flat`, written by `excrypto ml flatten`). threshold=None uses the
+    threshold selected during training (`train.threshold_selection`), else 0.5.
+    """
     universe = _universe_for(snapshot, "ml", symbols, timeframe, runs_root)
 
     ml_man_path = manifest or read_latest_pointer(
@@ -189,25 +575,21 @@ def predict_signals(
     )
 
     ml_man = load_manifest(ml_man_path)
+    if threshold is None:
+        threshold = float(((ml_man.get("train") or {}).get("threshold_selection") or {}).get("selected", 0.5))
 
-    model_bin = _abs_from_runs_root(runs_root, ml_man["paths"]["model"])
+    model_key = "model_flat" if flat else "model"
+    if model_key not in ml_man["paths"]:
+        raise FileNotFoundError(f"ML manifest has no flattened model; run `excrypto ml flatten`: {ml_man_path}")
+    model_bin = _abs_from_runs_root(runs_root, ml_man["paths"][model_key])
     features_path = _abs_from_runs_root(runs_root, ml_man["inputs"]["features_path"])
 
-    Xdf = pd.read_parquet(features_path)
     key_cols = ["timestamp", "symbol"]
-    missing = [c for c in key_cols if c not in Xdf.columns]
+    columns = pq.read_schema(features_path).names
+    missing = [c for c in key_cols if c not in columns]
     if missing:
         raise ValueError(f"Features missing key cols required for signals: {missing}")
-
-    keys = Xdf[key_cols].copy()
-    X = Xdf.drop(columns=key_cols, errors="ignore")
-
-    clf = SKLearnClassifier.load(str(model_bin))
-    score = clf.predict_score(X)
-
-    signals = keys.copy()
-    signals["score"] = score
-    signals["signal"] = (score >= float(threshold)).astype(float)
+    feature_cols = [c for c in columns if c not in key_cols]
 
     out_paths = RunPaths(
         snapshot=snapshot,
@@ -219,24 +601,79 @@ def predict_signals(
     )
     out_paths.ensure(report=True)
 
-    signals.to_parquet(out_paths.signals, index=False)
-
-    # Optional panel (kept for now)
-    panel = signals.copy()
-    if "close" in Xdf.columns:
-        panel["close"] = Xdf["close"].values
-    panel.to_parquet(out_paths.panel, index=False)
+    n_workers = resolve_workers(workers)
+    n_threads = thread_budget(n_workers)
+    n_rows, t0 = 0, time.perf_counter()
+    clf = get_registry().load(model_bin, manifest=ml_man, manifest_path=Path(ml_man_path)).classifier
+    t_load = time.perf_counter() - t0
+
+    def _outputs(batch: pd.DataFrame, score: np.ndarray) -> tuple[pd.DataFrame, pd.DataFrame]:
+        signals = batch[key_cols].reset_index(drop=True)
+        signals["score"] = score
+        signals["signal"] = (score >= float(threshold)).astype(float)
+        # Optional panel (kept for now)
+        panel = signals.copy()
+        if "close" in batch.columns:
+            panel["close"] = batch["close"].values
+        return signals, panel
+
+    # a features file without rows still yields (empty) signals and panel files
+    empty_signals, empty_panel = _outputs(
+        pq.read_schema(features_path).empty_table().to_pandas(), np.empty(0, dtype=float))
+    signals_sink = _ParquetSink(out_paths.signals, empty=empty_signals)
+    panel_sink = _ParquetSink(out_paths.panel, empty=empty_panel)
+
+    def _emit(batch: pd.DataFrame, score: np.ndarray) -> None:
+        nonlocal n_rows
+        signals, panel = _outputs(batch, score)
+        signals_sink.write(signals)
+        panel_sink.write(panel)
+        n_rows += len(batch)
+
+    try:
+        batches = _iter_feature_batches(features_path, batch_rows)
+        if n_workers <= 1:
+            for batch in batches:
+                if len(batch):
+                    _emit(batch, clf.predict_score(batch[feature_cols]))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=n_workers, initializer=_init_scorer, initargs=(str(model_bin), n_threads)
+            ) as pool:
+                pending: deque = deque()
+                for batch in batches:
+                    if not len(batch):
+                        continue
+                    X = batch[feature_cols].to_numpy()
+                    pending.append((batch, pool.submit(_score_batch, X, feature_cols)))
+                    if len(pending) >= 2 * n_workers:
+                        b, fut = pending.popleft()
+                        _emit(b, fut.result())
+                while pending:
+                    b, fut = pending.popleft()
+                    _emit(b, fut.result())
+    finally:
+        signals_sink.close()
+        panel_sink.close()
 
     pred_manifest = {
         "kind": "ml_predict",
         "schema_version": 1,
-        "created_at": _now_utc(),
+        "created_at": now_utc(),
         "snapshot": snapshot,
         "timeframe": timeframe,
         "symbols": symbols,
         "exchange": exchange,
         "inputs": {"ml_manifest": str(ml_man_path), "model": str(model_bin), "features": str(features_path)},
         "params": {"threshold": float(threshold)},
+        "execution": {
+            "flat": bool(flat),
+            "batch_rows": batch_rows,
+            "workers": n_workers,
+            "rows": n_rows,
+            "model_load_seconds": round(t_load, 4),
+            "seconds": round(time.perf_counter() - t0, 4),
+        },
         "paths": {"signals": str(out_paths.signals), "panel": str(out_paths.panel), "manifest": str(out_paths.manifest)},
     }
     out_paths.manifest.write_text(json.dumps(pred_manifest, indent=2, sort_keys=True))
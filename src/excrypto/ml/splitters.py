@@ -1,36 +1,100 @@
 from __future__ import annotations
+import json
 import numpy as np
-from typing import Iterator, Tuple
+from pathlib import Path
+from typing import Any, Iterator, Tuple
+
+from excrypto.data.splits import IndexRanges
+
+FoldRanges = Tuple[IndexRanges, IndexRanges]
+
 
 class PurgedKFold:
     """
     Time-aware CV splitter with purge/embargo (Lopez de Prado).
     Assumes X is indexed in time order already.
+
+    `split_ranges` yields compact (train, test) IndexRanges; `split` materializes them into
+    index arrays for sklearn-style consumers.
     """
     def __init__(self, n_splits: int = 5, purge: int = 0, embargo: int = 0):
         if n_splits < 2:
             raise ValueError("n_splits >= 2")
         self.n_splits, self.purge, self.embargo = n_splits, purge, embargo
 
-    def split(self, X) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    def get_n_splits(self, X=None, y=None, groups=None) -> int:
+        return self.n_splits
+
+    def split_ranges(self, X) -> Iterator[FoldRanges]:
         n = len(X)
         fold_sizes = np.full(self.n_splits, n // self.n_splits, dtype=int)
         fold_sizes[: n % self.n_splits] += 1
-        idx = np.arange(n)
         current = 0
         cuts = []
         for fold_size in fold_sizes:
-            start, stop = current, current + fold_size
+            start, stop = current, current + int(fold_size)
             cuts.append((start, stop))
             current = stop
 
-        for k, (start, stop) in enumerate(cuts):
+        for start, stop in cuts:
             # test = [start:stop]
-            test_idx = idx[start:stop]
+            test = IndexRanges.from_bounds([(start, stop)])
             # validation purge/embargo around test
             left = max(0, start - self.purge)
             right = min(n, stop + self.embargo)
-            train_mask = np.ones(n, dtype=bool)
-            train_mask[left:right] = False
-            train_idx = idx[train_mask]
-            yield train_idx, test_idx
+            train = IndexRanges.from_bounds([(0, left), (right, n)])
+            yield train, test
+
+    def split(self, X) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        for train, test in self.split_ranges(X):
+            yield train.to_indices(), test.to_indices()
+
+
+class PrecomputedFolds:
+    """
+    Replays folds persisted in a training manifest (see `folds_to_manifest`) with the same
+    interface as PurgedKFold, so downstream consumers reuse the exact training splits.
+    """
+    def __init__(self, folds: list[FoldRanges], n_rows: int):
+        self.folds, self.n_rows = list(folds), int(n_rows)
+
+    @classmethod
+    def from_manifest(cls, cv: dict[str, Any]) -> "PrecomputedFolds":
+        folds = [(IndexRanges.from_list(f["train"]), IndexRanges.from_list(f["valid"])) for f in cv["folds"]]
+        return cls(folds, n_rows=cv["n_rows"])
+
+    def get_n_splits(self, X=None, y=None, groups=None) -> int:
+        return len(self.folds)
+
+    def split_ranges(self, X) -> Iterator[FoldRanges]:
+        if len(X) != self.n_rows:
+            raise ValueError(f"Precomputed folds expect {self.n_rows} rows, got {len(X)}")
+        yield from self.folds
+
+    def split(self, X) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        for train, test in self.split_ranges(X):
+            yield train.to_indices(), test.to_indices()
+
+
+def folds_to_manifest(folds: list[FoldRanges], n_rows: int) -> dict[str, Any]:
+    """Compact JSON form: [[start, stop], ...] ranges per fold."""
+    return {
+        "n_rows": int(n_rows),
+        "folds": [{"train": tr.to_list(), "valid": te.to_list()} for tr, te in folds],
+    }
+
+
+def splitter_from_cfg(split_cfg: Any) -> PurgedKFold | PrecomputedFolds:
+    """
+    Splitter for a `split:` config block: PurgedKFold params, or `folds_from: <ml manifest>`
+    to replay that training run's persisted folds (same table, same rows).
+    """
+    if not isinstance(split_cfg, dict):
+        return PurgedKFold()
+    if "folds_from" in split_cfg:
+        path = Path(split_cfg["folds_from"])
+        cv = json.loads(path.read_text(encoding="utf-8")).get("cv")
+        if not cv:
+            raise ValueError(f"Manifest has no persisted CV folds: {path}")
+        return PrecomputedFolds.from_manifest(cv)
+    return PurgedKFold(**split_cfg)
@@ -0,0 +1,297 @@
+# src/excrypto/ml/sweep.py
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+import numpy as np
+
+from excrypto.ml.resolve import now_utc, write_latest_pointer
+from excrypto.ml.service import (
+    fit_fold,
+    fit_fold_spooled,
+    load_training_table,
+    make_classifier,
+    resolve_train_inputs,
+)
+from excrypto.ml.splitters import FoldRanges, folds_to_manifest, splitter_from_cfg
+from excrypto.utils.config import cfg_hash, load_cfg
+from excrypto.utils.parallel import resolve_workers, spooled_arrays, thread_budget
+from excrypto.utils.paths import RunPaths
+
+
+def _params_hash(params: dict[str, Any]) -> str:
+    payload = json.dumps(params, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.md5(payload).hexdigest()[:10]
+
+
+def _sample_value(spec: Any, rng: np.random.Generator) -> Any:
+    """
+    One value from a search-space entry:
+      - list                             -> uniform choice
+      - {low, high[, log][, int]}        -> uniform (log-uniform) float, rounded if int
+      - anything else                    -> fixed value
+    """
+    if isinstance(spec, list):
+        return spec[int(rng.integers(len(spec)))]
+    if isinstance(spec, dict) and {"low", "high"} <= spec.keys():
+        lo, hi = float(spec["low"]), float(spec["high"])
+        if spec.get("log"):
+            v = float(math.exp(rng.uniform(math.log(lo), math.log(hi))))
+        else:
+            v = float(rng.uniform(lo, hi))
+        return int(round(v)) if spec.get("int") else v
+    return spec
+
+
+def sample_trials(space: dict[str, Any], n_trials: int, seed: int = 0) -> list[dict[str, Any]]:
+    """Deterministic (seeded) random search; duplicate draws are skipped."""
+    rng = np.random.default_rng(seed)
+    trials, seen = [], set()
+    for _ in range(max(1, n_trials) * 20):
+        if len(trials) >= n_trials:
+            break
+        params = {k: _sample_value(v, rng) for k, v in sorted(space.items())}
+        h = _params_hash(params)
+        if h in seen:
+            continue
+        seen.add(h)
+        trials.append({"trial": f"t{len(trials):03d}", "params": params, "params_hash": h})
+    return trials
+
+
+def halving_budgets(n_folds: int, *, eta: int = 3, min_folds: int = 1) -> list[int]:
+    """Folds evaluated per rung: min_folds * eta^r, capped at (and always ending on) n_folds."""
+    if eta < 2:
+        raise ValueError("halving.eta must be >= 2")
+    budgets, b = [], max(1, min(int(min_folds), n_folds))
+    while b < n_folds:
+        budgets.append(b)
+        b *= eta
+    budgets.append(n_folds)
+    return budgets
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    leaderboard_path: Path
+    manifest_path: Path
+    best: dict[str, Any]
+
+
+class _Checkpoint:
+    """Append-only JSONL of finished (trial, fold) evaluations; a rerun skips what is here."""
+
+    def __init__(self, path: Path, resume: bool = True):
+        self.path = path
+        self.done: dict[tuple[str, int], dict[str, Any]] = {}
+        if not resume and path.exists():
+            path.unlink()
+        if path.exists():
+            for line in path.read_text().splitlines():
+                try:
+                    rec = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn last line from an interrupted write
+                self.done[(rec["params_hash"], int(rec["fold"]))] = rec
+
+    def add(self, rec: dict[str, Any]) -> None:
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(rec, sort_keys=True) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.done[(rec["params_hash"], int(rec["fold"]))] = rec
+
+
+def _evaluate(
+    tasks: list[tuple[dict[str, Any], int]],
+    *,
+    kind: str,
+    X,
+    y,
+    folds: list[FoldRanges],
+    threshold: float,
+    pool: ProcessPoolExecutor | None,
+    spool: Path | None,
+    n_threads: int,
+) -> Iterator[tuple[dict[str, Any], int, dict[str, Any]]]:
+    if pool is None:
+        for trial, k in tasks:
+            clf = make_classifier({"name": kind, "params": trial["params"]}).fresh(n_threads)
+            yield trial, k, fit_fold(clf, X, y, folds[k], threshold)[0]
+        return
+
+    futures = {
+        pool.submit(
+            fit_fold_spooled, str(spool), list(X.columns),
+            make_classifier({"name": kind, "params": trial["params"]}), folds[k], threshold, n_threads,
+        ): (trial, k)
+        for trial, k in tasks
+    }
+    for f in as_completed(futures):
+        trial, k = futures[f]
+        yield trial, k, f.result()[0]
+
+
+def run_sweep(
+    *,
+    snapshot: str,
+    symbols: list[str],
+    exchange: str,
+    timeframe: str,
+    runs_root: Path,
+    config: Path,
+    features_manifest: Path | None = None,
+    labels_manifest: Path | None = None,
+    workers: int = 1,
+    resume: bool = True,
+    cache: bool = True,
+) -> SweepResult:
+    """
+    Successive halving over purged CV folds.
+
+    All trials start on `min_folds` folds; after each rung the top 1/eta (by mean `metric`)
+    move on with eta-times as many folds until survivors have seen every fold. Folds are
+    visited most-recent-first, so each rung extends the previous rung's folds and earlier
+    scores are reused. Every (trial, fold) fit is one task on the worker pool, reading the
+    shared X/y spool; results are appended to trials.jsonl as they finish, so rerunning the
+    same sweep resumes where it stopped.
+    """
+    cfg = load_cfg(config)
+    search = cfg.get("search") or {}
+    halving = cfg.get("halving") or {}
+    metric = str(cfg.get("metric", "f1"))
+    threshold = float(cfg.get("threshold", 0.5))
+    kind = str(search.get("kind", "rf"))
+    if not isinstance(search.get("space"), dict) or not search["space"]:
+        raise ValueError("sweep config needs search.space")
+
+    inputs = resolve_train_inputs(
+        snapshot=snapshot, symbols=symbols, timeframe=timeframe, runs_root=runs_root,
+        features_manifest=features_manifest, labels_manifest=labels_manifest,
+    )
+    table = load_training_table(inputs, label_col=cfg.get("label_col"), runs_root=runs_root, cache=cache)
+    X, y = table.xy.X_frame(), table.xy.y_series()
+
+    folds = list(splitter_from_cfg(cfg.get("split", {})).split_ranges(X))
+    order = list(range(len(folds)))[::-1]
+    eta = int(halving.get("eta", 3))
+    budgets = halving_budgets(len(folds), eta=eta, min_folds=int(halving.get("min_folds", 1)))
+    trials = sample_trials(search["space"], int(search.get("n_trials", 27)), seed=int(search.get("seed", 0)))
+
+    out = RunPaths(
+        snapshot=snapshot,
+        strategy="ml_sweep",
+        symbols=tuple(symbols),
+        timeframe=timeframe,
+        params={"exchange": exchange, "cfg": cfg_hash(cfg), "data": table.cache_key["id"]},
+        runs_root=runs_root,
+    )
+    out.ensure(report=False)
+    ckpt = _Checkpoint(out.base / "trials.jsonl", resume=resume)
+    n_resumed = len(ckpt.done)
+
+    def _score(t: dict[str, Any], budget: int) -> float:
+        return float(np.mean([ckpt.done[(t["params_hash"], k)][metric] for k in order[:budget]]))
+
+    n_workers = resolve_workers(workers)
+    n_threads = thread_budget(n_workers)
+    rungs: list[dict[str, Any]] = []
+    reached: dict[str, int] = {}
+    t0 = time.perf_counter()
+
+    with spooled_arrays(X=X.to_numpy(dtype=np.float64), y=y.to_numpy()) if n_workers > 1 else nullcontext() as spool:
+        with ProcessPoolExecutor(max_workers=n_workers) if n_workers > 1 else nullcontext() as pool:
+            alive = trials
+            for r, budget in enumerate(budgets):
+                todo = [
+                    (t, k) for t in alive for k in order[:budget] if (t["params_hash"], k) not in ckpt.done
+                ]
+                for trial, k, m in _evaluate(
+                    todo, kind=kind, X=X, y=y, folds=folds, threshold=threshold,
+                    pool=pool, spool=spool, n_threads=n_threads,
+                ):
+                    ckpt.add({"trial": trial["trial"], "params_hash": trial["params_hash"], "fold": k, **m})
+
+                for t in alive:
+                    reached[t["trial"]] = r
+                ranked = sorted(alive, key=lambda t: _score(t, budget), reverse=True)
+                rungs.append({
+                    "rung": r,
+                    "n_folds": budget,
+                    "n_trials": len(alive),
+                    "evaluated": len(todo),
+                    "best": ranked[0]["trial"],
+                    "best_score": _score(ranked[0], budget),
+                })
+                alive = ranked[: max(1, len(ranked) // eta)]
+
+    leaderboard = []
+    for t in trials:
+        r = reached[t["trial"]]
+        recs = [ckpt.done[(t["params_hash"], k)] for k in order[: budgets[r]]]
+        scores = [rec[metric] for rec in recs]
+        leaderboard.append({
+            "trial": t["trial"],
+            "params": t["params"],
+            "params_hash": t["params_hash"],
+            "rung": r,
+            "n_folds": len(recs),
+            metric: float(np.mean(scores)),
+            f"{metric}_std": float(np.std(scores)),
+            "fit_seconds": round(sum(rec["fit_seconds"] for rec in recs), 4),
+        })
+    leaderboard.sort(key=lambda row: (row["n_folds"], row[metric]), reverse=True)
+    best = {"model": {"name": kind, "params": leaderboard[0]["params"]}, metric: leaderboard[0][metric]}
+
+    lb_path = out.base / "leaderboard.json"
+    tmp = lb_path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps({"metric": metric, "rows": leaderboard}, indent=2, sort_keys=True))
+    tmp.replace(lb_path)
+
+    manifest = {
+        "kind": "ml_sweep",
+        "schema_version": 1,
+        "created_at": now_utc(),
+        "snapshot": snapshot,
+        "timeframe": timeframe,
+        "symbols": symbols,
+        "exchange": exchange,
+        "inputs": {**inputs.to_dict(), "label_col": table.xy.label_col},
+        "dataset": table.to_dict(),
+        "sweep": {
+            "method": "successive_halving",
+            "metric": metric,
+            "threshold": threshold,
+            "eta": eta,
+            "budgets": budgets,
+            "n_trials": len(trials),
+            "workers": n_workers,
+            "threads_per_worker": n_threads,
+            "resumed_evaluations": n_resumed,
+            "seconds": round(time.perf_counter() - t0, 4),
+            "rungs": rungs,
+            "cfg": cfg,
+        },
+        "best": best,
+        "cv": folds_to_manifest(folds, n_rows=len(X)),
+        "paths": {
+            "leaderboard": str(lb_path),
+            "trials": str(ckpt.path),
+            "manifest": str(out.manifest),
+        },
+    }
+    out.manifest.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    write_latest_pointer(
+        out.runs_root, out.snapshot, out.strategy, out.manifest, timeframe=out.timeframe, universe=out.universe
+    )
+    return SweepResult(leaderboard_path=lb_path, manifest_path=out.manifest, best=best)
+
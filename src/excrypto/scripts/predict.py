@@ -13,7 +13,10 @@ def main(config: str = typer.Option(..., "--config", "-c", help="YAML config pat
     if not p.exists():
         raise typer.BadParameter(f"Config not found: {p}")
     predictor = CryptoPredictor(config_path=str(p))
-    predictor.run()
+    try:
+        predictor.run()
+    finally:
+        predictor.close()
 
 if __name__ == "__main__":
     app()
@@ -0,0 +1,9 @@
+from excrypto.utils.lazy import lazy_exports
+
+# the server imports the model registry and feature pipeline; `excrypto.serve.cli` defers them
+__getattr__, __all__ = lazy_exports(__name__, {
+    "LatencyStats": ".server",
+    "MicroBatcher": ".server",
+    "OnlineFeatures": ".server",
+    "ScoringServer": ".server",
+})
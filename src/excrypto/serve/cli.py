@@ -0,0 +1,52 @@
+# src/excrypto/serve/cli.py
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import typer
+
+from excrypto.utils.config import load_cfg
+
+app = typer.Typer(help="Long-lived local scoring service (HTTP/JSON, micro-batched)")
+
+
+@app.callback(invoke_without_command=True)
+def serve(
+    model: str | None = typer.Option(None, help="Model file, ML manifest or latest_manifest.json pointer."),
+    config: Path | None = typer.Option(None, exists=True, dir_okay=False, help="Serve config (yaml/json)."),
+    host: str | None = typer.Option(None, help="Bind address (default 127.0.0.1)."),
+    port: int | None = typer.Option(None, help="Port (default 8765)."),
+    runs_root: Path | None = typer.Option(None, help="Runs root for manifest pointers (default runs)."),
+    threshold: float | None = typer.Option(None, help="Signal threshold (default 0.5)."),
+    max_batch: int | None = typer.Option(None, help="Rows per scoring call (default 256)."),
+    max_wait_ms: float | None = typer.Option(None, help="How long a batch stays open for more requests (default 2)."),
+    log_path: Path | None = typer.Option(None, help="Append scored requests to this prediction log."),
+) -> None:
+    """
+    Keep a model (and per-symbol feature tails, when the config has feature `specs`) warm and
+    score POST /predict and /bars requests in micro-batches. GET /metrics for p50/p99/throughput.
+    CLI options override the config file.
+    """
+    from excrypto.serve.server import ScoringServer
+
+    cfg = load_cfg(str(config)) if config else {}
+    ref = model or cfg.get("model")
+    if not ref:
+        raise typer.BadParameter("Pass --model or set `model` in --config")
+    specs = (cfg.get("features") or {}).get("specs")
+    srv = ScoringServer.from_ref(
+        ref,
+        runs_root=Path(runs_root or cfg.get("runs_root", "runs")),
+        feature_cols=cfg.get("feature_cols"),
+        threshold=float(threshold if threshold is not None else cfg.get("threshold", 0.5)),
+        max_batch=int(max_batch or cfg.get("max_batch", 256)),
+        max_wait_ms=float(max_wait_ms if max_wait_ms is not None else cfg.get("max_wait_ms", 2.0)),
+        specs=specs,
+        log_path=log_path or (Path(cfg["log_path"]) if cfg.get("log_path") else None),
+    )
+    try:
+        asyncio.run(srv.serve_forever(host or cfg.get("host", "127.0.0.1"),
+                                      int(port if port is not None else cfg.get("port", 8765))))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,356 @@
+# src/excrypto/serve/server.py
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from excrypto.features import FeaturePipeline
+from excrypto.ml.registry import LoadedModel, get_registry
+
+
+@dataclass
+class LatencyStats:
+    """Request counters plus a ring of recent latencies for p50/p99 (GET /metrics)."""
+    window: int = 10_000
+    started: float = field(default_factory=time.monotonic)
+    requests: int = 0
+    rows: int = 0
+    batches: int = 0
+    errors: int = 0
+    _lat: deque = field(default_factory=deque, repr=False)
+    _done: deque = field(default_factory=deque, repr=False)
+
+    def __post_init__(self) -> None:
+        self._lat = deque(maxlen=self.window)
+        self._done = deque(maxlen=self.window)
+
+    def observe(self, seconds: float, rows: int = 1) -> None:
+        self.requests += 1
+        self.rows += rows
+        self._lat.append(seconds)
+        self._done.append(time.monotonic())
+
+    def snapshot(self) -> dict[str, Any]:
+        lat = np.asarray(self._lat, dtype=float)
+        uptime = time.monotonic() - self.started
+        recent = 0.0
+        if len(self._done) > 1:
+            span = self._done[-1] - self._done[0]
+            recent = (len(self._done) - 1) / span if span > 0 else 0.0
+        pct = (lambda q: round(float(np.percentile(lat, q)) * 1e3, 3)) if lat.size else (lambda q: None)
+        return {
+            "uptime_s": round(uptime, 3),
+            "requests": self.requests,
+            "rows": self.rows,
+            "errors": self.errors,
+            "batches": self.batches,
+            "mean_batch_rows": round(self.rows / self.batches, 2) if self.batches else None,
+            "p50_ms": pct(50),
+            "p99_ms": pct(99),
+            "throughput_rps": round(self.requests / uptime, 2) if uptime > 0 else 0.0,
+            "recent_rps": round(recent, 2),
+        }
+
+
+@dataclass
+class MicroBatcher:
+    """
+    Coalesces concurrent score requests: the first queued request opens a batch that closes
+    after `max_wait_ms` or `max_batch` rows, then the whole batch is scored with one
+    predict_score call on a worker thread (the event loop keeps accepting meanwhile).
+    """
+    model: LoadedModel
+    feature_cols: list[str]
+    max_batch: int = 256
+    max_wait_ms: float = 2.0
+    stats: LatencyStats = field(default_factory=LatencyStats)
+    _queue: asyncio.Queue | None = field(default=None, repr=False)
+    _task: asyncio.Task | None = field(default=None, repr=False)
+
+    def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def score(self, X: pd.DataFrame) -> np.ndarray:
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((X, fut))
+        return await fut
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        clf = self.model.classifier
+        while True:
+            items = [await self._queue.get()]
+            n = len(items[0][0])
+            deadline = loop.time() + self.max_wait_ms / 1e3
+            while n < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                items.append(item)
+                n += len(item[0])
+            X = pd.concat([x for x, _ in items], ignore_index=True)[self.feature_cols]
+            try:
+                scores = await loop.run_in_executor(None, clf.predict_score, X)
+            except Exception as e:  # one bad batch fails its requests, not the server
+                for _, fut in items:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+            self.stats.batches += 1
+            at = 0
+            for x, fut in items:
+                if not fut.done():
+                    fut.set_result(scores[at:at + len(x)])
+                at += len(x)
+
+
+@dataclass
+class OnlineFeatures:
+    """
+    Per-symbol ring of the last lookback() + 1 bars, so a new bar is featurized from the warm
+    tail (FeaturePipeline.transform_last) instead of from history on disk.
+    """
+    pipe: FeaturePipeline
+    _bars: dict[str, deque] = field(default_factory=dict, repr=False)
+
+    @property
+    def depth(self) -> int:
+        return self.pipe.lookback() + 1
+
+    def update(self, symbol: str, bars: list[dict[str, Any]]) -> pd.DataFrame | None:
+        """Append bars; the feature row of the newest one, or None while the ring is filling."""
+        ring = self._bars.setdefault(symbol, deque(maxlen=self.depth))
+        ring.extend(bars)
+        if len(ring) < ring.maxlen:
+            return None
+        df = pd.DataFrame(list(ring))
+        feats = self.pipe.transform_last(df)
+        raw = df.iloc[[-1]].drop(columns=feats.columns, errors="ignore")
+        return pd.concat([raw, feats], axis=1).reset_index(drop=True)
+
+    def status(self) -> dict[str, Any]:
+        return {s: len(r) for s, r in self._bars.items()}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+@dataclass
+class ScoringServer:
+    """
+    Long-lived HTTP/JSON scoring service on asyncio streams (HTTP/1.1 keep-alive, no framework).
+
+      POST /predict  {"rows": [{feature: value, ...}, ...]}    -> {"scores": [...], "signals": [...]}
+      POST /bars     {"symbol": "BTC/USDT", "bars": [{...}]}   -> score of the newest bar (needs specs)
+      GET  /metrics  latency percentiles, throughput, batch sizes, model registry stats
+      GET  /health
+    """
+    model: LoadedModel
+    feature_cols: list[str]
+    threshold: float = 0.5
+    max_batch: int = 256
+    max_wait_ms: float = 2.0
+    specs: list[dict[str, Any]] | None = None
+    log_path: Path | None = None
+    max_body: int = 8 << 20
+
+    def __post_init__(self) -> None:
+        self.stats = LatencyStats()
+        self.batcher = MicroBatcher(self.model, self.feature_cols, self.max_batch, self.max_wait_ms, self.stats)
+        self.online = OnlineFeatures(FeaturePipeline(self.specs).build()) if self.specs else None
+        self.log = None
+        if self.log_path is not None:
+            from excrypto.inference.prediction_log import PredictionLogWriter
+            self.log = PredictionLogWriter(self.log_path, flush_every=256, fsync="batch")
+            # one thread keeps records in order; its write + fsync every 256 stays off the event loop
+            self._log_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prediction-log")
+
+    @classmethod
+    def from_ref(cls, model_ref: str | Path, *, runs_root: Path = Path("runs"),
+                 feature_cols: list[str] | None = None, **kwargs) -> "ScoringServer":
+        """Model file, ML manifest or latest pointer, loaded once through the shared registry."""
+        loaded = get_registry().resolve(model_ref, runs_root=runs_root)
+        cols = feature_cols or loaded.feature_cols or list(getattr(loaded.model, "feature_names_in_", []))
+        if not cols:
+            raise ValueError(f"No feature columns for {model_ref}; pass them explicitly")
+        return cls(model=loaded, feature_cols=[str(c) for c in cols], **kwargs)
+
+    # ---- endpoints ----
+    def _frame(self, rows: Any) -> pd.DataFrame:
+        if not isinstance(rows, list) or not rows:
+            raise HTTPError(400, "'rows' must be a non-empty list of objects")
+        X = pd.DataFrame(rows)
+        missing = [c for c in self.feature_cols if c not in X.columns]
+        if missing:
+            raise HTTPError(400, f"missing features: {missing}")
+        return X[self.feature_cols].astype(float)
+
+    def _result(self, scores: np.ndarray) -> dict[str, Any]:
+        scores = np.asarray(scores, dtype=float)
+        return {"scores": scores.tolist(), "signals": (scores >= self.threshold).astype(int).tolist()}
+
+    def _log(self, kind: str, X: pd.DataFrame, scores: np.ndarray, extra: dict[str, Any] | None = None) -> None:
+        """Queue the records on the log thread; the response does not wait for the write."""
+        if self.log is None:
+            return
+        ts = pd.Timestamp.now(tz="UTC").isoformat()
+        fut = asyncio.get_running_loop().run_in_executor(self._log_pool, self._write_log, kind, ts, X, scores, extra)
+        fut.add_done_callback(self._log_done)
+
+    def _write_log(self, kind: str, ts: str, X: pd.DataFrame, scores: np.ndarray,
+                   extra: dict[str, Any] | None) -> None:
+        for rec, s in zip(X.to_dict(orient="records"), np.asarray(scores, dtype=float)):
+            self.log.append({"timestamp": ts, "source": kind, **(extra or {}), "features": rec,
+                             "score": float(s), "prediction": int(s >= self.threshold), "actual": None})
+
+    @staticmethod
+    def _log_done(fut: asyncio.Future) -> None:
+        if not fut.cancelled() and fut.exception() is not None:
+            print(f"[serve] prediction log write failed: {fut.exception()!r}")
+
+    async def predict(self, body: dict[str, Any]) -> dict[str, Any]:
+        X = self._frame(body.get("rows"))
+        scores = await self.batcher.score(X)
+        self._log("predict", X, scores)
+        return self._result(scores)
+
+    async def bars(self, body: dict[str, Any]) -> dict[str, Any]:
+        if self.online is None:
+            raise HTTPError(404, "server started without feature specs; /bars is disabled")
+        symbol, bars = body.get("symbol"), body.get("bars") or ([body["bar"]] if "bar" in body else None)
+        if not symbol or not isinstance(bars, list):
+            raise HTTPError(400, "expected {'symbol': ..., 'bars': [...]}")
+        row = self.online.update(str(symbol), bars)
+        if row is None:
+            return {"symbol": symbol, "warm": False, "have": self.online.status()[symbol], "need": self.online.depth}
+        X = self._frame(row.to_dict(orient="records"))
+        if X.isna().any(axis=None):
+            raise HTTPError(400, f"latest bar has missing features: {X.columns[X.isna().any()].tolist()}")
+        scores = await self.batcher.score(X)
+        self._log("bars", X, scores, {"symbol": symbol})
+        return {"symbol": symbol, "warm": True, **self._result(scores)}
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            **self.stats.snapshot(),
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait_ms,
+            "model": str(self.model.path),
+            "registry": get_registry().stats(),
+            "online": self.online.status() if self.online else None,
+        }
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> tuple[int, dict[str, Any]]:
+        route = path.split("?", 1)[0]
+        if route == "/health":
+            return 200, {"status": "ok"}
+        if route == "/metrics":
+            return 200, self.metrics()
+        handlers = {"/predict": self.predict, "/bars": self.bars}
+        if route not in handlers:
+            raise HTTPError(404, f"no route {route}")
+        if method != "POST":
+            raise HTTPError(405, f"{route} expects POST")
+        try:
+            payload = json.loads(body or b"{}")
+        except json.JSONDecodeError as e:
+            raise HTTPError(400, f"invalid JSON: {e}")
+        t0 = time.perf_counter()
+        out = await handlers[route](payload)
+        self.stats.observe(time.perf_counter() - t0, rows=len(out.get("scores", [])))
+        return 200, out
+
+    # ---- HTTP/1.1 plumbing ----
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    method, target, version = line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    k, _, v = h.decode("latin-1").partition(":")
+                    headers[k.strip().lower()] = v.strip()
+                n = int(headers.get("content-length", 0) or 0)
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                try:
+                    if n > self.max_body:
+                        raise HTTPError(413, f"body over {self.max_body} bytes")
+                    body = await reader.readexactly(n) if n else b""
+                    status, out = await self.dispatch(method.upper(), target, body)
+                except HTTPError as e:
+                    self.stats.errors += 1
+                    status, out = e.status, {"error": str(e)}
+                except Exception as e:
+                    self.stats.errors += 1
+                    status, out = 500, {"error": f"{type(e).__name__}: {e}"}
+                data = json.dumps(out).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keep_alive or status == 413:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.AbstractServer:
+        self.batcher.start()
+        return await asyncio.start_server(self._handle, host, port)
+
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = 8765) -> None:
+        server = await self.start(host, port)
+        addr = ", ".join(str(s.getsockname()) for s in server.sockets)
+        print(f"[serve] {self.model.path} on {addr} (max_batch={self.max_batch}, max_wait_ms={self.max_wait_ms})")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.aclose()
+
+    async def aclose(self) -> None:
+        await self.batcher.stop()
+        if self.log is not None:
+            # drain queued records, then flush and close the writer
+            await asyncio.get_running_loop().run_in_executor(None, self._log_pool.shutdown)
+            self.log.close()
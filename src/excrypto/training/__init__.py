@@ -1 +1,6 @@
-from .trainer import ModelTrainer  # re-export
\ No newline at end of file
+from excrypto.utils.lazy import lazy_exports
+
+# the trainer imports lightgbm; `excrypto.training.cli` loads it only when a command runs
+__getattr__, __all__ = lazy_exports(__name__, {
+    "ModelTrainer": ".trainer",
+})
@@ -0,0 +1,136 @@
+from __future__ import annotations
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional, Sequence, Tuple
+
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+import lightgbm as lgb
+
+
+class _MemmapRows(lgb.Sequence):
+    """lightgbm.Sequence over a 2-D memmap: random rows for bin sampling, slices for the push pass."""
+
+    def __init__(self, X: np.ndarray, batch_size: int):
+        self.X = X
+        self.batch_size = int(batch_size)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, list):
+            idx = np.asarray(idx)
+        # LightGBM's bin sampler only takes float64; spool dtype is a disk/page-cache choice
+        return np.asarray(self.X[idx], dtype=np.float64)
+
+    def __len__(self) -> int:
+        return int(self.X.shape[0])
+
+
+@dataclass(frozen=True)
+class MemmapSource:
+    """
+    On-disk training table: `X.bin` (row-major float32/float64), `y.bin` (float64) and
+    `meta.json` (n_rows, dtype, feature_names, label). Nothing is read until used; X is only
+    ever touched through a read-only memmap, so the table can be much larger than RAM.
+
+    Build one in a single streaming pass with `from_chunks` / `from_parquet`.
+    """
+    root: Path
+    chunk_rows: int = 65_536
+
+    @property
+    def meta(self) -> dict:
+        return json.loads((self.root / "meta.json").read_text(encoding="utf-8"))
+
+    @property
+    def n_rows(self) -> int:
+        return int(self.meta["n_rows"])
+
+    @property
+    def feature_names(self) -> list[str]:
+        return list(self.meta["feature_names"])
+
+    def X(self) -> np.ndarray:
+        m = self.meta
+        shape = (int(m["n_rows"]), len(m["feature_names"]))
+        return np.memmap(self.root / "X.bin", dtype=np.dtype(m["dtype"]), mode="r", shape=shape)
+
+    def y(self) -> np.ndarray:
+        return np.memmap(self.root / "y.bin", dtype=np.float64, mode="r", shape=(self.n_rows,))
+
+    def sequence(self) -> lgb.Sequence:
+        return _MemmapRows(self.X(), self.chunk_rows)
+
+    def iter_chunks(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        X, y = self.X(), self.y()
+        for a in range(0, self.n_rows, self.chunk_rows):
+            yield X[a:a + self.chunk_rows], y[a:a + self.chunk_rows]
+
+    def fingerprint(self) -> str:
+        """Changes whenever the spooled files do (size + mtime), not on every open."""
+        parts = [json.dumps(self.meta, sort_keys=True)]
+        for name in ("X.bin", "y.bin"):
+            st = (self.root / name).stat()
+            parts.append(f"{name}:{st.st_size}:{st.st_mtime_ns}")
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:16]
+
+    @classmethod
+    def from_chunks(
+        cls,
+        chunks: Iterable[Tuple[pd.DataFrame, pd.Series]],
+        root: Path,
+        *,
+        dtype: str = "float32",
+        label: Optional[str] = None,
+        chunk_rows: int = 65_536,
+    ) -> "MemmapSource":
+        """
+        Append (X, y) frames to the spool one at a time; rows with a missing label are dropped.
+        Every chunk must have the first chunk's feature columns (reordered if needed).
+        """
+        root = Path(root)
+        root.mkdir(parents=True, exist_ok=True)
+        features: Optional[list[str]] = None
+        n = 0
+        with open(root / "X.bin", "wb") as fx, open(root / "y.bin", "wb") as fy:
+            for X, y in chunks:
+                if features is None:
+                    features = [str(c) for c in X.columns]
+                keep = pd.notna(np.asarray(y))
+                Xc = np.ascontiguousarray(X[features].to_numpy(dtype=dtype, na_value=np.nan)[keep])
+                fx.write(Xc.tobytes())
+                fy.write(np.asarray(y, dtype=np.float64)[keep].tobytes())
+                n += int(keep.sum())
+            fx.flush(); os.fsync(fx.fileno())
+            fy.flush(); os.fsync(fy.fileno())
+        meta = {"n_rows": n, "dtype": dtype, "feature_names": features or [], "label": label}
+        (root / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        return cls(root=root, chunk_rows=chunk_rows)
+
+    @classmethod
+    def from_parquet(
+        cls,
+        paths: Sequence[Path],
+        root: Path,
+        *,
+        label_col: str,
+        feature_cols: Optional[Sequence[str]] = None,
+        batch_rows: int = 65_536,
+        dtype: str = "float32",
+    ) -> "MemmapSource":
+        """Stream parquet file(s) batch by batch into the spool; memory is bounded by batch_rows."""
+        import pyarrow.parquet as pq
+
+        def _chunks():
+            for p in paths:
+                pf = pq.ParquetFile(p)
+                cols = list(feature_cols) if feature_cols else [
+                    c for c in pf.schema_arrow.names if c not in (label_col, "timestamp", "symbol")
+                ]
+                for batch in pf.iter_batches(batch_size=batch_rows, columns=cols + [label_col]):
+                    df = batch.to_pandas()
+                    yield df[cols], df[label_col]
+
+        return cls.from_chunks(_chunks(), root, dtype=dtype, label=label_col, chunk_rows=batch_rows)
@@ -3,20 +3,37 @@ from pathlib import Path
 from dataclasses import dataclass
 from typing import Optional, Sequence, Tuple
 
+import hashlib
 import json
+import time
 import joblib
+import numpy as np
 import pandas as pd
+import lightgbm as lgb
 from datetime import datetime
 from lightgbm import LGBMClassifier
 
+from excrypto.ml.models_lgbm import LGBMNativeClassifier
+from excrypto.training.sources import MemmapSource
+
 # Expect: from excrypto.pipeline import FeaturePipeline, FeatureConfig
 # (import inside methods to avoid circulars if needed)
 
+# LGBMClassifier names whose native name the Dataset-level checks of lgb.train look for
+_NATIVE_NAMES = {"subsample_for_bin": "bin_construct_sample_cnt", "min_child_samples": "min_data_in_leaf"}
+# params fixed when a Dataset is constructed (binning, feature pre-filtering, sampling seeds)
+DATASET_PARAMS = (
+    "max_bin", "max_bin_by_feature", "min_data_in_bin", "bin_construct_sample_cnt", "min_data_in_leaf",
+    "feature_pre_filter", "use_missing", "zero_as_missing", "enable_bundle", "linear_tree",
+    "forcedbins_filename", "data_random_seed", "seed", "random_state",
+)
+
 @dataclass
 class TrainerConfig:
     output_dir: Path = Path("models")
     random_state: Optional[int] = 42
     lgbm_params: Optional[dict] = None  # e.g., {"num_leaves": 31, "learning_rate": 0.05}
+    dataset_cache: bool = True          # fit_source: keep binned LightGBM Datasets under output_dir/datasets
 
 class ModelTrainer:
     def __init__(self, pipeline, config: Optional[TrainerConfig] = None):
@@ -28,8 +45,10 @@ class ModelTrainer:
         params = {"random_state": self.cfg.random_state}
         if self.cfg.lgbm_params:
             params.update(self.cfg.lgbm_params)
-        self.model = LGBMClassifier(**params)
+        self._estimator = LGBMClassifier(**params)  # params source for fit_source
+        self.model = self._estimator
         self.features: Sequence[str] = []  # filled after transform
+        self.train_info: dict = {}
 
     def prepare(self, df_raw: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
         """Run feature pipeline and return (X, y)."""
@@ -51,6 +70,72 @@ class ModelTrainer:
         self.model.fit(X, y)
         return self.model
 
+    def _native_params(self) -> Tuple[dict, int]:
+        """LGBMClassifier params as lgb.train params, sklearn names mapped to their native names."""
+        sk = self._estimator.get_params()
+        params = {_NATIVE_NAMES.get(k, k): v for k, v in sk.items()
+                  if v is not None and k not in ("n_estimators", "importance_type", "class_weight", "objective")}
+        return params, int(sk.get("n_estimators", 100))
+
+    def _binned_dataset(self, source: MemmapSource, classes: np.ndarray, params: dict) -> Tuple[lgb.Dataset, bool]:
+        """
+        Bins are sampled from random rows of the memmap, then rows are pushed in
+        `chunk_rows` slices; only the binned (uint8/16) matrix is kept. The binned Dataset is
+        saved next to the models and reloaded while the source and bin params are unchanged.
+        """
+        # lgb.train refuses to change Dataset-level params of a constructed Dataset, so the
+        # Dataset gets all of them (and they key the cache)
+        ds_params = {k: params[k] for k in DATASET_PARAMS if k in params} | {"verbosity": -1}
+        key = json.dumps({"source": source.fingerprint(), **ds_params}, sort_keys=True, default=str)
+        cache = self.cfg.output_dir / "datasets" / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]}.bin"
+        if self.cfg.dataset_cache and cache.exists():
+            return lgb.Dataset(str(cache), params=ds_params), True
+
+        label = np.searchsorted(classes, np.asarray(source.y()))
+        ds = lgb.Dataset(
+            source.sequence(), label=label, feature_name=source.feature_names, free_raw_data=True,
+            params=ds_params,
+        ).construct()
+        if self.cfg.dataset_cache:
+            cache.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache.with_suffix(".tmp")
+            ds.save_binary(str(tmp))
+            tmp.replace(cache)
+        return ds, False
+
+    def fit_source(self, source: MemmapSource):
+        """
+        Out-of-core fit on a memory-mapped table (see training.sources): never materializes X
+        as a DataFrame. Trains with the native API using this trainer's LGBMClassifier params
+        and replaces `self.model` with an LGBMNativeClassifier (predict/predict_proba).
+        """
+        params, rounds = self._native_params()
+        classes = np.unique(np.asarray(source.y()))
+        if len(classes) < 2:
+            raise ValueError("fit_source needs at least two label classes")
+        if len(classes) == 2:
+            params = {"objective": "binary", **params}
+        else:
+            params = {"objective": "multiclass", "num_class": len(classes), **params}
+
+        t0 = time.perf_counter()
+        ds, cache_hit = self._binned_dataset(source, classes, params)
+        t1 = time.perf_counter()
+        booster = lgb.train(params, ds, num_boost_round=rounds)
+        self.model = LGBMNativeClassifier(
+            params=params, num_boost_round=rounds, booster=booster, classes_=classes,
+            best_iteration=booster.current_iteration(),
+        )
+        self.features = source.feature_names
+        self.train_info = {
+            "source": str(source.root),
+            "n_rows": source.n_rows,
+            "dataset_cache_hit": cache_hit,
+            "dataset_seconds": round(t1 - t0, 4),
+            "train_seconds": round(time.perf_counter() - t1, 4),
+        }
+        return self.model
+
     def save_model(self) -> Path:
         """Persist model and metadata next to it."""
         self.cfg.output_dir.mkdir(parents=True, exist_ok=True)
@@ -63,8 +148,10 @@ class ModelTrainer:
             "timestamp": ts,
             "features": list(self.features),
             "model_path": str(model_path),
-            "lgbm_params": getattr(self.model, "get_params", lambda: {})(),
+            "lgbm_params": getattr(self.model, "get_params", lambda: getattr(self.model, "params", {}))(),
         }
+        if self.train_info:
+            metadata["train_info"] = self.train_info
         meta_path.write_text(json.dumps(metadata, indent=2), encoding="utf-8")
 
         print(f"✅ Model saved to {model_path}")
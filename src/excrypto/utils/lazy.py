@@ -0,0 +1,20 @@
+# src/excrypto/utils/lazy.py
+from __future__ import annotations
+
+from importlib import import_module
+from typing import Any, Callable
+
+
+def lazy_exports(package: str, exports: dict[str, str]) -> tuple[Callable[[str], Any], list[str]]:
+    """
+    Module `__getattr__` and `__all__` for a package whose public names live in heavy submodules.
+
+    `exports` maps each name to its relative submodule; the submodule is imported on first access,
+    so importing a sibling (e.g. the package's CLI) does not pay for it.
+    """
+    def __getattr__(name: str) -> Any:
+        if name in exports:
+            return getattr(import_module(exports[name], package), name)
+        raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+    return __getattr__, list(exports)
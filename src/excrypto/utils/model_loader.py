@@ -1,7 +1,6 @@
 import os
 import json
 from glob import glob
-import joblib
 
 def get_latest_model_metadata(models_dir="models/"):
     meta_files = sorted(
@@ -14,7 +13,9 @@ def get_latest_model_metadata(models_dir="models/"):
         return json.load(f)
 
 def load_latest_model():
+    from excrypto.ml.registry import get_registry
+
     metadata = get_latest_model_metadata()
 
-    model = joblib.load(metadata["model_path"])
-    return model, metadata
+    loaded = get_registry().load(metadata["model_path"])
+    return loaded.model, {**metadata, "load_seconds": loaded.load_seconds}
@@ -0,0 +1,179 @@
+# src/excrypto/utils/parallel.py
+from __future__ import annotations
+
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import numpy as np
+import pandas as pd
+
+
+GroupFn = Callable[[pd.DataFrame], Any]
+
+
+def resolve_workers(workers: int | None) -> int:
+    """
+    Normalize a `--workers` value:
+      - None / 0 / 1 -> 1 (serial)
+      - negative     -> os.cpu_count() (like joblib's n_jobs=-1)
+    """
+    if workers is None or workers == 0:
+        return 1
+    if workers < 0:
+        return max(1, os.cpu_count() or 1)
+    return int(workers)
+
+
+def thread_budget(workers: int) -> int:
+    """
+    Threads each of `workers` pool processes may use so nested parallelism (e.g. an RF with
+    n_jobs=-1 inside every worker) does not oversubscribe the machine.
+    """
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+@contextmanager
+def spooled_arrays(**arrays: np.ndarray) -> Iterator[Path]:
+    """
+    Write arrays to <tmpdir>/<name>.npy for the duration of the block so worker processes can
+    open them read-only with `load_spooled` (mmap) instead of receiving pickled copies.
+    """
+    with tempfile.TemporaryDirectory(prefix="excrypto-spool-") as spool:
+        root = Path(spool)
+        for name, arr in arrays.items():
+            np.save(root / f"{name}.npy", np.ascontiguousarray(arr))
+        yield root
+
+
+def load_spooled(spool_dir: str | Path, name: str) -> np.ndarray:
+    return np.load(Path(spool_dir) / f"{name}.npy", mmap_mode="r")
+
+
+def _is_mmappable(s: pd.Series) -> bool:
+    dt = s.dtype
+    if isinstance(dt, pd.DatetimeTZDtype):
+        return True
+    return isinstance(dt, np.dtype) and dt.kind in "biufcmM"
+
+
+def _to_numpy(s: pd.Series) -> np.ndarray:
+    if isinstance(s.dtype, pd.DatetimeTZDtype):
+        # store as naive UTC; tz is restored in the worker
+        return s.dt.tz_convert("UTC").dt.tz_localize(None).to_numpy()
+    return s.to_numpy()
+
+
+def _from_numpy(arr: np.ndarray, dtype: Any) -> Any:
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        return pd.DatetimeIndex(arr).tz_localize("UTC").tz_convert(dtype.tz)
+    return arr
+
+
+def _run_group(
+    spool_dir: str,
+    layout: list[tuple[str, Any]],
+    start: int,
+    stop: int,
+    group_col: str,
+    group_key: Any,
+    extra: dict[str, pd.Series],
+    fn: GroupFn,
+) -> Any:
+    """
+    Worker entry point: rebuild one group's frame from the memory-mapped spool and apply `fn`.
+    The mmap slices are views; only the DataFrame assembly touches this group's rows.
+    """
+    root = Path(spool_dir)
+    pos = np.load(root / "_pos.npy", mmap_mode="r")[start:stop]
+
+    cols: dict[str, Any] = {}
+    for i, (name, dtype) in enumerate(layout):
+        if name == group_col:
+            cols[name] = pd.array(np.full(stop - start, group_key, dtype=object), dtype=dtype)
+        elif name in extra:
+            cols[name] = extra[name].to_numpy()
+        else:
+            arr = np.load(root / f"{i}.npy", mmap_mode="r")[start:stop]
+            cols[name] = _from_numpy(arr, dtype)
+
+    g = pd.DataFrame(cols, index=pd.Index(np.asarray(pos)))
+    res = fn(g)
+    # groupby.apply treats "same index as the group" results as transforms (see apply_by_group)
+    same = isinstance(res, (pd.DataFrame, pd.Series)) and res.index.equals(g.index)
+    return res, same
+
+
+def apply_by_group(
+    frame: pd.DataFrame,
+    fn: GroupFn,
+    *,
+    group_col: str = "symbol",
+    workers: int | None = 1,
+) -> pd.DataFrame | pd.Series:
+    """
+    Equivalent of `frame.groupby(group_col, group_keys=False).apply(fn)` that can fan groups
+    out over a process pool.
+
+    With workers > 1:
+      - the frame is stably sorted by group once and its numeric/datetime columns are spooled to
+        .npy files in a temp dir; workers open them with mmap_mode="r" and slice their group's
+        contiguous row range instead of receiving a pickled DataFrame.
+      - object columns other than `group_col` (rare in panels) are shipped with the task.
+      - each group frame keeps the original index labels. As in pandas, when every result is
+        indexed exactly like its group, the output is put back in original row order;
+        otherwise results are concatenated in sorted group order.
+
+    `fn` must be picklable (a module-level function, functools.partial or bound method).
+    """
+    n_workers = resolve_workers(workers)
+
+    if group_col not in frame.columns:
+        raise ValueError(f"frame missing group column '{group_col}'")
+
+    if n_workers <= 1:
+        return frame.groupby(group_col, group_keys=False).apply(fn)
+
+    if not isinstance(frame.index, pd.RangeIndex):
+        raise ValueError("apply_by_group(workers>1) expects a RangeIndex frame; call reset_index(drop=True) first")
+
+    codes, uniques = pd.factorize(frame[group_col], sort=True)
+    if (codes < 0).any():
+        # groupby drops NaN keys by default; mirror that
+        keep = codes >= 0
+        frame, codes = frame.loc[keep], codes[keep]
+
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1), side="left")
+
+    layout = [(c, frame[c].dtype) for c in frame.columns]
+    object_cols = [c for c in frame.columns if c != group_col and not _is_mmappable(frame[c])]
+    positions = frame.index.to_numpy()[order]
+
+    with tempfile.TemporaryDirectory(prefix="excrypto-spool-") as spool:
+        root = Path(spool)
+        np.save(root / "_pos.npy", positions)
+        for i, (name, _) in enumerate(layout):
+            if name == group_col or name in object_cols:
+                continue
+            np.save(root / f"{i}.npy", np.ascontiguousarray(_to_numpy(frame[name])[order]))
+
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(uniques)) or 1) as pool:
+            futures = []
+            for k, key in enumerate(uniques):
+                start, stop = int(bounds[k]), int(bounds[k + 1])
+                extra = {c: frame[c].iloc[order[start:stop]] for c in object_cols}
+                futures.append(
+                    pool.submit(_run_group, spool, layout, start, stop, group_col, key, extra, fn)
+                )
+            results = [f.result() for f in futures]
+
+    if not results:
+        return frame.groupby(group_col, group_keys=False).apply(fn)
+    out = pd.concat([r for r, _ in results])
+    if all(same for _, same in results):
+        out = out.sort_index()
+    return out
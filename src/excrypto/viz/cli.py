@@ -3,6 +3,7 @@ from __future__ import annotations
 import typer
 from pathlib import Path
 import pandas as pd
+from excrypto.ml.evaluate import threshold_sweep
 from excrypto.viz.reporting import (
     plot_feature_correlation, plot_label_balance, plot_roc_pr,
     plot_threshold_sweep, plot_equity_curve, write_report_links, from_train_manifest
@@ -79,13 +80,14 @@ def from_train(manifest: Path = typer.Argument(..., exists=True, dir_okay=False)
     p1 = plot_feature_correlation(ctx["features_path"], rdir)
     # label balance
     p2 = plot_label_balance(ctx["labels_path"], ctx["label_col"], rdir)
-    # ROC/PR + threshold sweep (if predict scores present)
-    score_path = (ctx["run_dir"] / "scores.parquet")
+    # ROC/PR + threshold sweep from the training run's out-of-fold scores (no re-scoring)
+    score_path = ctx["oof_scores"]
     p_roc = p_pr = p_thr = None
     if score_path.exists():
-        df = pd.read_parquet(score_path)  # expected: timestamp,symbol,score,label
-        p_roc, p_pr = plot_roc_pr(df["label"], df["score"].values, rdir)
-        p_thr = plot_threshold_sweep(df["label"], df["score"].values, rdir)
+        df = pd.read_parquet(score_path, columns=["score", "label"])
+        sweep = threshold_sweep(df["label"].to_numpy(), df["score"].to_numpy())
+        p_roc, p_pr = plot_roc_pr(df["label"], df["score"].values, rdir, sweep=sweep)
+        p_thr = plot_threshold_sweep(df["label"], df["score"].values, rdir, sweep=sweep)
     # equity curve (if signals + panel exist)
     panel = ctx["run_dir"] / "panel.parquet"
     signals = ctx["run_dir"] / "signals.parquet"
@@ -5,8 +5,7 @@ import json
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from sklearn.metrics import roc_curve, roc_auc_score, precision_recall_curve, average_precision_score
-from sklearn.metrics import f1_score, accuracy_score
+from excrypto.ml.evaluate import ThresholdSweep, threshold_sweep
 from excrypto.utils.paths import RunPaths
 from .raw import price_series, volume_series, returns_hist, rolling_vol, missing_heatmap
 from .features import histograms, rolling_feature, corr_heatmap, feature_target_corr
@@ -53,34 +52,34 @@ def plot_label_balance(labels_path: Path, label_col: str, out_dir: Path) -> Path
     fig.tight_layout(); fig.savefig(p, dpi=150); plt.close(fig)
     return p
 
-def plot_roc_pr(y_true: pd.Series, score: np.ndarray, out_dir: Path) -> tuple[Path, Path]:
+def plot_roc_pr(y_true: pd.Series, score: np.ndarray, out_dir: Path,
+                sweep: ThresholdSweep | None = None) -> tuple[Path, Path]:
     _ensure_dir(out_dir)
+    sweep = sweep or threshold_sweep(y_true, score)
     # ROC
-    fpr, tpr, _ = roc_curve(y_true, score)
-    auc = roc_auc_score(y_true, score)
+    fpr, tpr = sweep.roc()
     fig, ax = plt.subplots(figsize=(5,4))
     ax.plot(fpr, tpr); ax.plot([0,1],[0,1], linestyle="--")
-    ax.set_title(f"ROC (AUC={auc:.3f})"); ax.set_xlabel("FPR"); ax.set_ylabel("TPR")
+    ax.set_title(f"ROC (AUC={sweep.auc():.3f})"); ax.set_xlabel("FPR"); ax.set_ylabel("TPR")
     p1 = out_dir / "ml_roc.png"; fig.tight_layout(); fig.savefig(p1, dpi=150); plt.close(fig)
     # PR
-    prec, rec, _ = precision_recall_curve(y_true, score)
-    ap = average_precision_score(y_true, score)
+    prec, rec = sweep.pr()
     fig, ax = plt.subplots(figsize=(5,4))
-    ax.plot(rec, prec)
-    ax.set_title(f"PR (AP={ap:.3f})"); ax.set_xlabel("Recall"); ax.set_ylabel("Precision")
+    ax.plot(np.r_[0.0, rec], np.r_[1.0, prec])
+    ax.set_title(f"PR (AP={sweep.average_precision():.3f})"); ax.set_xlabel("Recall"); ax.set_ylabel("Precision")
     p2 = out_dir / "ml_pr.png"; fig.tight_layout(); fig.savefig(p2, dpi=150); plt.close(fig)
     return p1, p2
 
-def plot_threshold_sweep(y_true: pd.Series, score: np.ndarray, out_dir: Path) -> Path:
+def plot_threshold_sweep(y_true: pd.Series, score: np.ndarray, out_dir: Path,
+                         sweep: ThresholdSweep | None = None) -> Path:
     _ensure_dir(out_dir)
+    sweep = sweep or threshold_sweep(y_true, score)
     thr = np.linspace(0.0, 1.0, 101)
-    f1 = []; acc = []
-    for t in thr:
-        yhat = (score >= t).astype(int)
-        f1.append(f1_score(y_true, yhat, zero_division=0))
-        acc.append(accuracy_score(y_true, yhat))
+    grid = sweep.on_grid(thr)
+    best = sweep.best("f1")
     fig, ax = plt.subplots(figsize=(6,4))
-    ax.plot(thr, f1, label="F1"); ax.plot(thr, acc, label="Accuracy")
+    ax.plot(thr, grid.f1(), label="F1"); ax.plot(thr, grid.accuracy(), label="Accuracy")
+    ax.axvline(best["threshold"], linestyle="--", color="grey", label=f"best F1 @ {best['threshold']:.3f}")
     ax.set_xlabel("Threshold"); ax.set_ylabel("Score"); ax.legend()
     p = out_dir / "ml_threshold_sweep.png"
     fig.tight_layout(); fig.savefig(p, dpi=150); plt.close(fig)
@@ -107,14 +106,19 @@ def from_train_manifest(manifest_path: Path) -> dict:
     man = json.loads(Path(manifest_path).read_text())
     # Find run base dir regardless of manifest location
     run_dir = manifest_path.parent if manifest_path.parent.name != "report" else manifest_path.parent.parent
+    inputs = man.get("inputs") or {}
+    model = ((man.get("train") or {}).get("train_cfg") or {}).get("model", "rf")
     return {
         "snapshot": man["snapshot"],
         "timeframe": man["timeframe"],
         "symbols": tuple(man.get("symbols") or []),
-        "features_path": Path(man["features_path"]),
-        "labels_path": Path(man["labels_path"]),
-        "label_col": man["params"]["label_col"],
-        "model": man.get("model") or man.get("model_kind"),
+        "features_path": Path(inputs["features_path"]),
+        "labels_path": Path(inputs["labels_path"]),
+        "label_col": inputs["label_col"],
+        "model": model.get("name", "rf") if isinstance(model, dict) else model,
+        "threshold_selection": (man.get("train") or {}).get("threshold_selection"),
+        # out-of-fold scores written during training (timestamp, symbol, fold, score, label)
+        "oof_scores": Path((man.get("paths") or {}).get("oof_scores") or run_dir / "oof_scores.parquet"),
         "run_dir": run_dir,
         "report_dir": run_dir / "report",
     }
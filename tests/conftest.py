@@ -0,0 +1,20 @@
+# tests/conftest.py
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture(scope="session")
+def make_panel():
+    """
+    Factory for a (timestamp, symbol) panel: `n` rows per symbol every `freq` from 2025-01-01
+    UTC, with standard-normal `feats`. Returns (df, rng) so callers draw labels from the same stream.
+    """
+    def _make(n, freq, feats, symbols=("BTC/USDT", "ETH/USDT"), seed=0):
+        rng = np.random.default_rng(seed)
+        ts = pd.date_range("2025-01-01", periods=n, freq=freq, tz="UTC")
+        df = pd.concat([pd.DataFrame({"timestamp": ts, "symbol": s}) for s in symbols], ignore_index=True)
+        df[list(feats)] = rng.normal(size=(len(df), len(feats)))
+        return df, rng
+
+    return _make
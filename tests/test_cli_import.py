@@ -0,0 +1,52 @@
+import subprocess
+import sys
+
+import pytest
+
+from excrypto.cli import SUBCOMMANDS, load_subcommand
+
+# heavy libraries no command-independent path may import
+HEAVY = ("lightgbm", "sklearn", "shap", "matplotlib", "scipy", "ccxt", "pandas")
+# cumulative `import excrypto.cli` budget in microseconds; ~0.1s today, ~7.5s with eager sub-apps
+IMPORT_BUDGET_US = 1_000_000
+
+
+def _importtime(code: str) -> dict[str, int]:
+    """module -> cumulative µs from `python -X importtime` (fresh interpreter, no cache effects)."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                         capture_output=True, text=True, check=True).stderr
+    times = {}
+    for line in out.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_root_cli_import_is_within_budget_and_light():
+    times = _importtime("import excrypto.cli")
+    assert times["excrypto.cli"] < IMPORT_BUDGET_US, times["excrypto.cli"]
+    assert not [m for m in times if m.split(".")[0] in HEAVY]
+
+
+def test_root_help_does_not_load_subcommands():
+    code = (
+        "import sys\n"
+        "from excrypto.cli import app\n"
+        "try:\n"
+        "    app(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        f"print(sorted(m for m in sys.modules if m.split('.')[0] in {HEAVY!r} or m.endswith('.cli')))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert "serve" in out and "Long-lived local scoring service" in out
+    assert out.strip().splitlines()[-1] == "['excrypto.cli']"
+
+
+@pytest.mark.parametrize("name", sorted(SUBCOMMANDS))
+def test_every_subcommand_resolves(name):
+    cmd = load_subcommand(name)
+    assert cmd.name == name
+    assert cmd.list_commands(None) or cmd.callback is not None
@@ -0,0 +1,89 @@
+# tests/test_explain_engine.py
+import json
+
+import pandas as pd
+import pytest
+import shap
+from sklearn.ensemble import RandomForestClassifier
+
+from excrypto.explain.engine import ExplainerCache, explain_frame, positive_class, read_shap
+from excrypto.ml.models_lgbm import LGBMNativeClassifier
+
+FEATS = ["f0", "f1", "f2", "f3"]
+
+
+@pytest.fixture
+def panel(make_panel):
+    """Two symbols, 3 days of hourly rows, a label driven by f0 + f1."""
+    df, rng = make_panel(72, "h", FEATS)
+    y = (df["f0"] + df["f1"] + rng.normal(0, 0.3, len(df)) > 0).astype(int)
+    return df, y
+
+
+@pytest.mark.parametrize("kind", ["rf", "lgbm"])
+def test_tree_fast_path_matches_tree_explainer(panel, tmp_path, kind):
+    df, y = panel
+    if kind == "rf":
+        model = RandomForestClassifier(n_estimators=20, max_depth=4, random_state=0).fit(df[FEATS], y)
+        ref_model = model
+    else:
+        model = LGBMNativeClassifier.make(num_boost_round=20, num_leaves=7, min_data_in_leaf=5, verbose=-1)
+        model.fit(df[FEATS], y)
+        ref_model = model.booster
+    ref, ev = positive_class(shap.TreeExplainer(ref_model).shap_values(df[FEATS]),
+                             shap.TreeExplainer(ref_model).expected_value)
+
+    run = explain_frame(model, df, FEATS, tmp_path / "shap", chunk_rows=50, sample_rows=10)
+    assert run.explainer == "tree" and run.rows == len(df) and run.chunks == 3
+    assert run.expected_value == pytest.approx(ev)
+    assert run.sample.shape == (10, len(FEATS))
+
+    out = read_shap(tmp_path / "shap")
+    want = pd.concat([df[["timestamp", "symbol"]], pd.DataFrame(ref, columns=FEATS)], axis=1)
+    want = want.sort_values(["timestamp", "symbol"], kind="mergesort").reset_index(drop=True)
+    pd.testing.assert_frame_equal(out, want, check_exact=False, atol=1e-10)
+
+    meta = json.loads((tmp_path / "shap" / "_meta.json").read_text())
+    assert meta["kind"] == "shap_values" and meta["features"] == FEATS
+
+
+def test_pool_matches_serial_and_partitions_by_date(panel, tmp_path):
+    df, y = panel
+    model = RandomForestClassifier(n_estimators=10, max_depth=4, random_state=0).fit(df[FEATS], y)
+    explain_frame(model, df, FEATS, tmp_path / "serial", chunk_rows=40)
+    explain_frame(model, df, FEATS, tmp_path / "pool", chunk_rows=40, workers=2)
+    pd.testing.assert_frame_equal(read_shap(tmp_path / "serial"), read_shap(tmp_path / "pool"))
+    assert json.loads((tmp_path / "pool" / "_meta.json").read_text())["workers"] == 2
+    explain_frame(model, df.head(10), FEATS, tmp_path / "one_chunk", chunk_rows=40, workers=-1)
+    assert json.loads((tmp_path / "one_chunk" / "_meta.json").read_text())["workers"] == 1
+
+    assert sorted(p.name for p in (tmp_path / "serial").glob("date=*")) == [
+        "date=2025-01-01", "date=2025-01-02", "date=2025-01-03"]
+    day = read_shap(tmp_path / "serial", start="2025-01-02", end="2025-01-02 23:00", symbols=["ETH/USDT"])
+    assert len(day) == 24 and set(day["symbol"]) == {"ETH/USDT"}
+
+
+def test_explainer_cache_builds_once_per_model(panel, tmp_path):
+    df, y = panel
+    model = RandomForestClassifier(n_estimators=5, random_state=0).fit(df[FEATS], y)
+    cache = ExplainerCache(max_explainers=1)
+    first = cache.get(model)
+    assert cache.get(model) is first and (cache.hits, cache.misses) == (1, 1)
+
+    other = RandomForestClassifier(n_estimators=5, random_state=1).fit(df[FEATS], y)
+    cache.get(other)
+    assert cache.get(model) is not first  # evicted (LRU of 1)
+    assert cache.misses == 3
+
+
+def test_explain_global_without_plot_sample(panel, tmp_path):
+    from excrypto.explain.explainer import ModelExplainer
+
+    df, y = panel
+    model = RandomForestClassifier(n_estimators=5, random_state=0).fit(df[FEATS], y)
+    explainer = ModelExplainer(model, FEATS)
+    run = explainer.explain_global(df, out_dir=str(tmp_path), plot_rows=0)
+    assert run.rows == len(df) and run.sample is None
+    assert not (tmp_path / "shap_summary.png").exists()
+    empty = explainer.explain_global(df.iloc[:0], out_dir=str(tmp_path / "empty"))
+    assert empty.rows == 0 and empty.files == 0
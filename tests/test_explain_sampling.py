@@ -0,0 +1,68 @@
+# tests/test_explain_sampling.py
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from excrypto.explain.engine import iter_shap
+from excrypto.explain.sampling import estimate_importance, stratified_order
+
+FEATS = ["f0", "f1", "f2", "f3"]
+
+
+@pytest.fixture(scope="module")
+def panel(make_panel):
+    """Two symbols x 4 days of minutes; f2 only matters for ETH, so strata differ."""
+    df, rng = make_panel(4 * 1440, "min", FEATS)
+    eth = (df["symbol"] == "ETH/USDT").to_numpy()
+    y = (df["f0"] + 2 * eth * df["f2"] + rng.normal(0, 0.3, len(df)) > 0).astype(int)
+    model = RandomForestClassifier(n_estimators=10, max_depth=5, random_state=0).fit(df[FEATS], y)
+    exact = np.abs(np.concatenate([v for _, v, _ in iter_shap(model, df[FEATS], chunk_rows=8192)])).mean(axis=0)
+    return df, model, pd.Series(exact, index=FEATS)
+
+
+def test_stratified_order_keeps_every_prefix_proportional():
+    strata = np.repeat([0, 1, 2], [600, 300, 100])
+    order = stratified_order(strata, seed=3)
+    assert sorted(order) == list(range(len(strata)))
+    for m in (10, 100, 500):
+        counts = np.bincount(strata[order[:m]], minlength=3)
+        np.testing.assert_allclose(counts, m * np.array([0.6, 0.3, 0.1]), atol=1)
+
+
+def test_sampled_importance_converges_close_to_exact(panel):
+    df, model, exact = panel
+    est = estimate_importance(model, df, FEATS, rel_tol=0.05, batch_rows=1024, min_rows=1024, time_budget=120)
+    assert est.stop_reason == "converged" and est.rows_explained < est.rows_total
+    assert est.strata == 8  # 2 symbols x 4 days
+    imp = est.importance.loc[FEATS]
+    assert ((imp["half_width"] <= 0.05 * imp["mean_abs_shap"])
+            | (imp["half_width"] <= 0.0005 * imp["mean_abs_shap"].max())).all()
+    # every exact value within a couple of half-widths of its estimate
+    assert ((imp["mean_abs_shap"] - exact).abs() <= 2 * imp["half_width"] + 1e-12).all()
+    assert list(est.importance.index[:2]) == list(exact.sort_values(ascending=False).index[:2])
+    assert est.sample.shape == (est.rows_explained, len(FEATS))
+
+
+def test_budget_and_exhaustion_stop_reasons(panel):
+    df, model, exact = panel
+    tight = estimate_importance(model, df, FEATS, rel_tol=1e-6, batch_rows=512, min_rows=512, time_budget=0.0)
+    assert tight.stop_reason == "budget" and tight.rounds == 1 and tight.rows_explained == 512
+    assert (tight.importance["ci_low"] <= tight.importance["ci_high"]).all()
+
+    small = df.iloc[::50]
+    full = estimate_importance(model, small, FEATS, batch_rows=64, min_rows=10**6)
+    assert full.stop_reason == "exhausted" and full.rows_explained == len(small)
+    want = np.abs(np.concatenate([v for _, v, _ in iter_shap(model, small[FEATS])])).mean(axis=0)
+    np.testing.assert_allclose(full.importance.loc[FEATS, "mean_abs_shap"], want)
+    assert (full.importance["half_width"] == 0).all()
+
+
+def test_sampled_explain_global_without_plot_sample(panel, tmp_path):
+    from excrypto.explain.explainer import ModelExplainer
+
+    df, model, _ = panel
+    est = ModelExplainer(model, FEATS).explain_global(df, out_dir=str(tmp_path), budget=5, plot_rows=0)
+    assert est.rows_explained > 0
+    assert (tmp_path / "shap_importance.csv").exists() and (tmp_path / "shap_importance.json").exists()
+    assert (tmp_path / "shap_bar.png").exists() and not (tmp_path / "shap_summary.png").exists()
@@ -0,0 +1,100 @@
+# tests/test_explain_store.py
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from excrypto.explain.engine import explain_frame, read_shap
+from excrypto.explain.store import ShapStore
+
+FEATS = ["f0", "f1", "f2"]
+
+
+@pytest.fixture
+def panel(make_panel):
+    """Two symbols, 10 days of hourly rows, and a small forest on them."""
+    df, _ = make_panel(240, "h", FEATS)
+    model = RandomForestClassifier(n_estimators=10, max_depth=4, random_state=0)
+    model.fit(df[FEATS], (df["f0"] - df["f1"] > 0).astype(int))
+    return df, model
+
+
+def test_append_explains_only_new_rows_and_matches_full_recompute(panel, tmp_path):
+    df, model = panel
+    store = ShapStore(tmp_path / "store")
+    first = store.append(model, df[df["timestamp"] < "2025-01-06"], FEATS, chunk_rows=64, model_id="rf")
+    second = store.append(model, df, FEATS, chunk_rows=64, model_id="rf")
+    again = store.append(model, df, FEATS, model_id="rf")
+    assert (first["rows_new"], second["rows_new"], again["rows_new"]) == (240, 240, 0)
+    assert second["rows_skipped"] == 240 and again["files"] == 0
+
+    explain_frame(model, df, FEATS, tmp_path / "full")
+    full = read_shap(tmp_path / "full")
+    pd.testing.assert_frame_equal(store.values(), full)
+
+    # pre-aggregated daily mean |SHAP| == recomputing from every raw value
+    day = full["timestamp"].dt.tz_localize(None).dt.floor("D").rename("bucket")
+    want = full[FEATS].abs().groupby(day).mean()
+    pd.testing.assert_frame_equal(store.importance("day"), want, check_exact=False, atol=1e-12)
+
+    eth = full[full["symbol"] == "ETH/USDT"]
+    pd.testing.assert_series_equal(store.global_importance(symbols=["ETH/USDT"]),
+                                   eth[FEATS].abs().mean().sort_values(ascending=False),
+                                   check_exact=False, atol=1e-12)
+    weekly = store.importance("week", by_symbol=True)
+    assert list(weekly.index.get_level_values("bucket").unique()) == [
+        pd.Timestamp("2024-12-30"), pd.Timestamp("2025-01-06")]
+
+
+def test_rolling_importance_weighs_buckets_by_rows(panel, tmp_path):
+    df, model = panel
+    store = ShapStore(tmp_path / "store")
+    store.append(model, df, FEATS, model_id="rf")
+    agg = store.aggregates("day")
+    rolled = store.importance("day", rolling="3D")
+    daily = agg.groupby("bucket")[["n", *FEATS]].sum()
+    last3 = daily.iloc[-3:]
+    np.testing.assert_allclose(rolled.iloc[-1].to_numpy(), (last3[FEATS].sum() / last3["n"].sum()).to_numpy())
+
+
+def test_uncommitted_files_are_dropped_and_mismatches_rejected(panel, tmp_path):
+    df, model = panel
+    store = ShapStore(tmp_path / "store")
+    store.append(model, df[df["timestamp"] < "2025-01-03"], FEATS, model_id="rf")
+    parts = store.state()["parts"]
+    # leftovers of an append that died before committing state.json
+    orphan = store.values_dir / "date=2025-01-05" / f"part-{parts:06d}.parquet"
+    orphan.parent.mkdir(parents=True)
+    df.head(3).to_parquet(orphan)
+    (store.root / "agg_day.999999.parquet").write_bytes(b"")
+
+    store.append(model, df, FEATS, model_id="rf")
+    assert not (store.root / "agg_day.999999.parquet").exists()
+    assert len(store.values()) == len(df)
+
+    with pytest.raises(ValueError, match="holds features"):
+        store.append(model, df, FEATS[:2], model_id="rf")
+
+
+def test_append_rejects_a_different_or_unidentified_model(panel, tmp_path):
+    import joblib
+
+    df, model = panel
+    path = tmp_path / "model.joblib"
+    joblib.dump(model, path)
+    store = ShapStore(tmp_path / "store")
+    store.append(model, df.iloc[:100], FEATS, model_path=path)
+    store.append(model, df, FEATS, model_path=path)  # same file: appends
+
+    with pytest.raises(ValueError, match="model_path or a model_id"):
+        ShapStore(tmp_path / "other").append(model, df, FEATS)
+    with pytest.raises(ValueError, match="use a new store"):
+        store.append(model, df, FEATS, model_id="rf")
+
+    # retrained and saved to the same path
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+    with pytest.raises(ValueError, match="use a new store"):
+        store.append(model, df, FEATS, model_path=path)
+    assert store.state()["rows"] == len(df)
@@ -4,6 +4,7 @@ from src.excrypto.features import (
     SimpleReturns, LogReturns,
     RollingVolatility, RSI, FeaturePipeline
 )
+from excrypto.features import FeaturePipeline as SpecPipeline
 
 def _mk_df(n=200, seed=7):
     rng = np.random.default_rng(seed)
@@ -28,3 +29,27 @@ def test_rsi_pipeline():
     pipe = FeaturePipeline(specs).fit(df)
     feats = pipe.transform(df)
     assert {"ret_log", "vol_30", "rsi_14"} <= set(feats.columns)
+
+def test_transform_last_matches_full_history():
+    df = _mk_df(n=2000)
+    specs = [
+        {"name": "log_returns", "input_cols": ["close"], "output_col": "ret_log"},
+        {"name": "rolling_volatility", "input_cols": ["ret_log"], "output_col": "vol_30", "params": {"window": 30}},
+        {"name": "rsi", "input_cols": ["close"], "output_col": "rsi_14", "params": {"window": 14}},
+        {"name": "roll_measure", "input_cols": ["close"], "output_col": "roll_50"},
+        {"name": "vpin_approx", "input_cols": ["ret_log", "volume"], "output_col": "vpin"},
+        {"name": "macd", "input_cols": ["close"], "output_col": "macd_hist"},
+    ]
+    pipe = SpecPipeline(specs).build()
+    # vol_30 over ret_log: 29 + 1 rows; macd is the longest (EWM truncation)
+    assert pipe.lookback() > 1 + 29
+    full = pipe.transform(df).iloc[[-1]]
+    last = pipe.transform_last(df)
+    assert list(last.index) == [df.index[-1]]
+    np.testing.assert_allclose(last.to_numpy(), full.to_numpy(), rtol=1e-9, atol=1e-9)
+
+    # without EWMs the tail is exact
+    exact = SpecPipeline(specs[:5]).build()
+    assert exact.lookback() == 51
+    pd.testing.assert_frame_equal(exact.transform_last(df), exact.transform(df).iloc[[-1]],
+                                  check_exact=False, rtol=1e-12)
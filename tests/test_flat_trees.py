@@ -0,0 +1,67 @@
+# tests/test_flat_trees.py
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+
+from excrypto.ml.flat_trees import FlatForest, flatten_model
+from excrypto.ml.models_lgbm import LGBMNativeClassifier
+from excrypto.ml.models_sklearn import SKLearnClassifier
+from excrypto.ml.registry import ModelRegistry
+
+
+def _data(n=3000, n_classes=2, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 6))
+    X[rng.random(X.shape) < 0.05] = np.nan
+    X[: n // 20, 2] = 0.0
+    z = np.nan_to_num(X[:, 0]) + 0.5 * np.nan_to_num(X[:, 1]) + rng.normal(0, 0.5, n)
+    y = np.digitize(z, np.quantile(z, np.linspace(0, 1, n_classes + 1)[1:-1]))
+    return pd.DataFrame(X, columns=[f"f{i}" for i in range(6)]), y
+
+
+@pytest.mark.parametrize("est", [
+    RandomForestClassifier(n_estimators=25, max_depth=12, n_jobs=1, random_state=0),
+    ExtraTreesClassifier(n_estimators=10, random_state=0),
+])
+@pytest.mark.parametrize("n_classes", [2, 3])
+def test_sklearn_forest_parity_is_exact(est, n_classes):
+    X, y = _data(n_classes=n_classes)
+    est.fit(X, y)
+    flat = flatten_model(SKLearnClassifier(est))
+    np.testing.assert_array_equal(flat.predict_proba(X), est.predict_proba(X))
+    np.testing.assert_array_equal(flat.predict(X), est.predict(X))
+
+
+@pytest.mark.parametrize("n_classes", [2, 3])
+def test_lgbm_parity(n_classes):
+    X, y = _data(n_classes=n_classes)
+    clf = LGBMNativeClassifier.make(num_boost_round=40, min_data_in_leaf=10).fit(X, y)
+    flat = flatten_model(clf)
+    assert flat.n_trees == 40 * (1 if n_classes == 2 else n_classes)
+    np.testing.assert_allclose(flat.predict_proba(X), clf.predict_proba(X), rtol=0, atol=1e-12)
+    # column order follows the training frame, not the caller's
+    np.testing.assert_allclose(flat.predict_score(X[X.columns[::-1]]), clf.predict_score(X), rtol=0, atol=1e-12)
+
+
+def test_flat_model_round_trips_through_registry(tmp_path):
+    X, y = _data()
+    rf = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y)
+    path = tmp_path / "model_flat.joblib"
+    flatten_model(rf).save(str(path))
+    loaded = ModelRegistry().load(path)
+    assert isinstance(loaded.model, FlatForest) and isinstance(loaded.model.value, np.memmap)
+    np.testing.assert_array_equal(loaded.classifier.predict_score(X), rf.predict_proba(X)[:, 1])
+
+
+def test_unsupported_models_raise_value_or_type_error():
+    import lightgbm as lgb
+
+    X, y = _data()
+    X["f5"] = np.arange(len(X)) % 4
+    y = np.isin(X["f5"], [0, 3]).astype(int)  # only a categorical split separates the classes
+    cat = lgb.LGBMClassifier(n_estimators=5, min_child_samples=5, verbose=-1).fit(X, y, categorical_feature=["f5"])
+    with pytest.raises(ValueError, match="categorical"):
+        flatten_model(cat)
+    with pytest.raises(TypeError, match="Cannot flatten"):
+        flatten_model(object())
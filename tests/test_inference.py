@@ -146,3 +146,146 @@ def test_predictor_uses_latest_model_when_no_model_path(tmp_path, monkeypatch, r
     assert not X.empty
     p, prob = pred.predict(X)
     assert p in (0, 1) and isinstance(prob, float)
+
+
+def test_predictor_tail_mode_reads_only_lookback_rows(tmp_path):
+    import joblib
+    import yaml
+    from sklearn.linear_model import LogisticRegression
+
+    n = 5000
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "open_time": pd.date_range("2024-01-01", periods=n, freq="min"),
+        "close": 100 + np.cumsum(rng.normal(0, 0.1, n)),
+        "sentiment_score": rng.uniform(-1, 1, n),
+    })
+    df.to_csv(tmp_path / "prices.csv", index=False)
+
+    features = ["ret_log", "vol_30", "rsi_14", "sentiment_score"]
+    model = LogisticRegression().fit(rng.normal(size=(50, 4)), rng.integers(0, 2, 50))
+    model_path = tmp_path / "model.joblib"
+    joblib.dump(model, model_path)
+    (tmp_path / "model_meta.json").write_text(json.dumps({"features": features}))
+
+    specs = [
+        {"name": "log_returns", "input_cols": ["close"], "output_col": "ret_log"},
+        {"name": "rolling_volatility", "input_cols": ["ret_log"], "output_col": "vol_30", "params": {"window": 30}},
+        {"name": "rsi", "input_cols": ["close"], "output_col": "rsi_14", "params": {"window": 14}},
+    ]
+    cfg = {
+        "model_path": str(model_path),
+        "data_path": str(tmp_path / "prices.csv"),
+        "features": {"specs": specs},
+        "logging": {"log_path": str(tmp_path / "logs" / "inference_log.jsonl"), "explain": False},
+    }
+    cfg_path = tmp_path / "predict.yaml"
+    cfg_path.write_text(yaml.safe_dump(cfg))
+
+    pred = CryptoPredictor(config_path=str(cfg_path))
+    X_tail = pred.load_latest_features()
+    assert pred.last_feature_stats["mode"] == "tail"
+    assert pred.last_feature_stats["rows_read"] == pred.pipe.lookback() + 1 == 31
+
+    pred.tail = False
+    X_full = pred.load_latest_features()
+    assert pred.last_feature_stats["rows_read"] == n
+    pd.testing.assert_frame_equal(X_tail.reset_index(drop=True), X_full.reset_index(drop=True),
+                                  check_exact=False, rtol=1e-12)
+
+    pred.tail = True
+    pred.run()
+    entry = json.loads((tmp_path / "logs" / "inference_log.jsonl").read_text().splitlines()[-1])
+    assert entry["feature_stats"]["rows_read"] == 31
+
+    # a missing feature in the last bar: score the last complete row, like full mode
+    df.loc[n - 1, "sentiment_score"] = np.nan
+    df.to_csv(tmp_path / "prices.csv", index=False)
+    X_nan = pred.load_latest_features()
+    assert pred.last_feature_stats["mode"] == "full" and pred.last_feature_stats["tail_fallback"]
+    pred.tail = False
+    pd.testing.assert_frame_equal(X_nan, pred.load_latest_features())
+    assert len(X_nan) == 1 and not X_nan.isna().any(axis=None)
+    assert X_nan["sentiment_score"].iloc[0] == df["sentiment_score"].iloc[n - 2]
+
+
+def test_prediction_log_rotates_compacts_and_reads_across_segments(tmp_path):
+    import threading
+    from excrypto.inference import PredictionLogWriter, list_segments, read_prediction_log
+
+    log = tmp_path / "logs" / "inference_log.jsonl"
+    writer = PredictionLogWriter(log, flush_every=8, flush_seconds=None, rotate_bytes=2_000, compact_keep=1)
+    for i in range(200):
+        writer.append({"i": i, "timestamp": f"2024-01-01T00:{i // 60:02d}:{i % 60:02d}", "prediction": i % 2,
+                       "features": {"f1": float(i)}, "actual": None})
+    assert writer.records_written == 200  # 200 is a multiple of flush_every
+    writer.close()
+
+    segs = list_segments(log)
+    assert segs[-1] == log and len(segs) > 3
+    # everything but the newest sealed segment and the active file is compacted
+    assert all(p.suffix == ".parquet" for p in segs[:-2]) and segs[-2].suffix == ".jsonl"
+    df = read_prediction_log(log)
+    assert df["i"].tolist() == list(range(200))
+    assert df["features"].iloc[0]["f1"] == 0.0
+
+    # concurrent writers never lose or interleave lines
+    log2 = tmp_path / "concurrent.jsonl"
+    w = PredictionLogWriter(log2, flush_every=5, fsync="never", rotate_bytes=None)
+
+    def work(t):
+        for k in range(100):
+            w.append({"t": t, "k": k})
+
+    threads = [threading.Thread(target=work, args=(t,)) for t in range(4)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    w.close()
+    got = read_prediction_log(log2)
+    assert len(got) == 400 and not got.duplicated().any()
+
+    # a torn last line (crash mid-write) is skipped, not fatal
+    with open(log2, "a") as f:
+        f.write('{"t": 9, "k"')
+    assert len(read_prediction_log(log2)) == 400
+
+
+def test_reconcile_is_incremental_and_matches_batch_metrics(tmp_path):
+    from excrypto.inference import PredictionLogWriter, attach_outcomes, read_outcomes, reconcile
+
+    rng = np.random.default_rng(1)
+    bars = pd.DataFrame({
+        "open_time": pd.date_range("2024-01-01", periods=300, freq="h"),
+        "close": 100 + np.cumsum(rng.normal(0, 1, 300)),
+    })
+    log = tmp_path / "inference_log.jsonl"
+    with PredictionLogWriter(log, flush_every=16, rotate_bytes=4_000, compact_keep=1) as w:
+        for i in range(250):
+            # predictions a few minutes after each bar opens; #7 is far from any bar
+            ts = bars["open_time"][i] + pd.Timedelta(minutes=int(rng.integers(0, 20)))
+            if i == 7:
+                ts = pd.Timestamp("2023-06-01")
+            p = float(rng.uniform())
+            w.append({"timestamp": ts.isoformat(), "prediction": int(p >= 0.5),
+                      "probability": max(p, 1 - p), "actual": None})
+
+    first = reconcile(log, bars.iloc[:120])
+    # bar 119 has no next close yet; the 2023 row can never match
+    assert first["resolved"] == 118 and first["expired"] == 1 and first["pending"] == 131
+    second = reconcile(log, bars)
+    assert second["scanned"] == 131 and second["resolved"] == 131 and second["pending"] == 0
+    assert reconcile(log, bars)["scanned"] == 0
+
+    # running aggregates == one batch computation over the whole log
+    full = attach_outcomes(read_outcomes(log).drop(columns=["actual"]), bars).dropna(subset=["actual"])
+    assert second["n"] == len(full) == 249
+    assert second["accuracy"] == round(float((full["actual"] == full["prediction"]).mean()), 6)
+    p_up = np.where(full["prediction"] == 1, full["probability"], 1 - full["probability"])
+    assert second["brier"] == round(float(((p_up - full["actual"]) ** 2).mean()), 6)
+    assert sum(b["n"] for b in second["calibration"]) == 249
+
+    joined = read_outcomes(log)
+    assert joined["status"].value_counts().to_dict() == {"resolved": 249, "expired": 1}
+    assert joined.loc[7, "status"] == "expired"
@@ -0,0 +1,63 @@
+# tests/test_labelers.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from excrypto.labels import labelers
+from excrypto.labels.labelers import fixed_horizon_return, triple_barrier
+
+
+def _triple_barrier_loop(price, *, horizon, up_mult, dn_mult, vol_window, min_periods=None, tail_value=0):
+    """Reference per-bar implementation (the pre-vectorization labeler)."""
+    p = price.astype(float)
+    logret = np.log(p).diff()
+    mp = min_periods if min_periods is not None else max(5, vol_window // 5)
+    vol = logret.rolling(vol_window, min_periods=mp).std(ddof=0).ffill().fillna(0.0)
+    p_arr, v_arr = p.to_numpy(), vol.to_numpy()
+    n = len(p_arr)
+    out = np.full(n, tail_value, dtype=int)
+    for i in range(max(0, n - horizon)):
+        p0, vi = p_arr[i], v_arr[i]
+        up, dn = p0 * np.exp(up_mult * vi), p0 * np.exp(-dn_mult * vi)
+        path = p_arr[i + 1 : i + horizon + 1]
+        hu, hd = path >= up, path <= dn
+        iu = int(np.argmax(hu)) if hu.any() else None
+        idn = int(np.argmax(hd)) if hd.any() else None
+        if iu is not None and idn is not None:
+            out[i] = 1 if iu < idn else -1
+        elif iu is not None:
+            out[i] = 1
+        elif idn is not None:
+            out[i] = -1
+        else:
+            out[i] = int(np.sign(np.log(p_arr[i + horizon]) - np.log(p0)))
+    return out
+
+
+def _prices(n, seed=0, sigma=0.01):
+    rng = np.random.default_rng(seed)
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0, sigma, n))))
+
+
+@pytest.mark.parametrize("n,horizon", [(1, 3), (5, 5), (6, 5), (300, 1), (300, 24), (500, 120)])
+@pytest.mark.parametrize("mults", [(2.0, 2.0), (0.5, 3.0), (10.0, 10.0)])
+def test_triple_barrier_matches_reference(n, horizon, mults):
+    price = _prices(n, seed=n + horizon)
+    kw = dict(horizon=horizon, up_mult=mults[0], dn_mult=mults[1], vol_window=20, tail_value=7)
+    got = triple_barrier(price, **kw).to_numpy()
+    np.testing.assert_array_equal(got, _triple_barrier_loop(price, **kw))
+
+
+def test_triple_barrier_ties_and_flat_paths(monkeypatch):
+    # flat segments -> zero vol -> up == dn == p0, so both barriers touch on the same bar
+    price = pd.Series(np.r_[np.full(40, 100.0), _prices(80, seed=3).to_numpy(), np.full(40, 50.0)])
+    # tiny blocks exercise the chunk boundaries
+    monkeypatch.setattr(labelers, "_TB_BLOCK_ELEMS", 7)
+    kw = dict(horizon=9, up_mult=1.0, dn_mult=1.0, vol_window=10)
+    np.testing.assert_array_equal(triple_barrier(price, **kw).to_numpy(), _triple_barrier_loop(price, **kw))
+
+
+def test_fixed_horizon_return_classes():
+    price = pd.Series([100.0, 101.0, 99.0, 99.0, 105.0])
+    lbl = fixed_horizon_return(price, horizon=1, thr=0.0)
+    assert lbl.tolist() == [1, -1, 0, 1, 0]
@@ -0,0 +1,93 @@
+# tests/test_labels_builder.py
+import json
+
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from excrypto.labels.builder import (
+    build_labels_frame,
+    canonical_label_params,
+    expand_label_grid,
+    label_col_name,
+    write_labels_artifact,
+)
+from excrypto.utils.paths import RunPaths
+
+
+def _panel(n=200, symbols=("BTC/USDT", "ETH/USDT"), seed=1):
+    rng = np.random.default_rng(seed)
+    ts = pd.date_range("2025-01-01", periods=n, freq="h", tz="UTC")
+    parts = [
+        pd.DataFrame({"timestamp": ts, "symbol": s, "close": 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))})
+        for s in symbols
+    ]
+    return pd.concat(parts).sort_values(["timestamp", "symbol"], kind="stable").reset_index(drop=True)
+
+
+GRID = [
+    {"kind": "fh", "horizon": [6, 24], "thr": [0.0, 0.002]},
+    {"kind": "fh", "horizon": 12, "as_class": False},
+    {"kind": "tb", "horizon": [6, 24], "up_mult": [1.0, 2.0], "dn_mult": 1.5, "vol_window": 20},
+]
+
+
+def test_expand_label_grid_products_and_names():
+    canons = expand_label_grid(GRID)
+    cols = [label_col_name(c) for c in canons]
+    assert len(canons) == 4 + 1 + 4
+    assert "fh_lbl_6" in cols and "fh_lbl_6_t0.002" in cols and "fh_ret_12" in cols
+    # duplicates collapse
+    assert len(expand_label_grid(GRID + [{"kind": "fh", "horizon": 6}])) == len(canons)
+    with pytest.raises(ValueError):
+        expand_label_grid([{"horizon": 6}])
+
+
+def test_grid_columns_match_single_label_builds():
+    panel = _panel()
+    canons = expand_label_grid(GRID)
+    grid = build_labels_frame(panel, canon=canons)
+    for canon in canons:
+        col = label_col_name(canon)
+        single = build_labels_frame(panel, canon=canon)
+        pdt.assert_frame_equal(grid[["timestamp", "symbol", col]], single)
+
+
+def test_grid_manifest_lists_every_label(tmp_path):
+    panel = _panel(60)
+    canons = expand_label_grid(GRID[:1])
+    labels = build_labels_frame(panel, canon=canons)
+    rp = RunPaths("snap", "labels", ("BTC/USDT", "ETH/USDT"), "1h", params={"x": 1}, runs_root=tmp_path)
+    art = write_labels_artifact(rp, labels, canon=canons)
+    man = json.loads(art.manifest_path.read_text())
+    assert [e["label_col"] for e in man["labels"]] == list(art.label_cols)
+    assert man["label"]["label_col"] == art.label_cols[0]
+    assert man["grid"]["n_labels"] == 4
+    assert man["labels"][1]["canon"] == canonical_label_params("fh", {"horizon": 6, "thr": 0.002})
+
+
+def _fh_groupby_reference(panel, canon):
+    """Per-symbol groupby.apply path the panel-level fh labeler replaces."""
+    from excrypto.labels.labelers import fixed_horizon_return
+
+    col = label_col_name(canon)
+
+    def one(g):
+        g = g.sort_values("timestamp")
+        s = fixed_horizon_return(g["close"], horizon=canon["horizon"], as_class=canon["as_class"], thr=canon["thr"])
+        out = g[["timestamp", "symbol"]].copy()
+        out[col] = s.to_numpy()
+        return out
+
+    return panel.groupby("symbol", group_keys=False).apply(one).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("shuffle", [False, True])
+@pytest.mark.parametrize("params", [{"horizon": 1}, {"horizon": 24, "thr": 0.002}, {"horizon": 7, "as_class": False}, {"horizon": 500}])
+def test_panel_fh_matches_groupby_reference(shuffle, params):
+    panel = _panel(150, symbols=("SOL/USDT", "BTC/USDT", "ETH/USDT"))
+    if shuffle:
+        panel = panel.sample(frac=1.0, random_state=0).reset_index(drop=True)
+    canon = canonical_label_params("fh", params)
+    pdt.assert_frame_equal(build_labels_frame(panel, canon=canon), _fh_groupby_reference(panel, canon))
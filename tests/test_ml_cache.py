@@ -0,0 +1,38 @@
+# tests/test_ml_cache.py
+import numpy as np
+import pandas as pd
+
+from excrypto.ml.cache import XYCache
+from excrypto.ml.datasets import XYData
+
+
+def _xy(n, seed):
+    rng = np.random.default_rng(seed)
+    keys = pd.DataFrame({"timestamp": pd.date_range("2025-01-01", periods=n, freq="h", tz="UTC"), "symbol": "BTC/USDT"})
+    return XYData(X=rng.normal(size=(n, 3)), y=rng.integers(0, 2, n), keys=keys, label_col="lbl", feature_cols=("a", "b", "c"))
+
+
+def test_cache_round_trip_is_memory_mapped(tmp_path):
+    cache = XYCache(tmp_path / "xy")
+    xy = _xy(20, 0)
+    assert cache.get({"id": "k1"}) is None
+    cache.put({"id": "k1"}, xy)
+
+    hit = cache.get({"id": "k1"})
+    assert isinstance(hit.X, np.memmap) and not hit.X.flags.writeable
+    np.testing.assert_array_equal(hit.X, xy.X)
+    np.testing.assert_array_equal(hit.y, xy.y)
+    pd.testing.assert_frame_equal(hit.keys, xy.keys)
+    assert hit.feature_cols == xy.feature_cols and hit.label_col == "lbl"
+
+
+def test_gc_evicts_least_recently_used(tmp_path):
+    cache = XYCache(tmp_path / "xy")
+    for i, k in enumerate(["old", "mid", "new"]):
+        cache.put({"id": k}, _xy(50, i))
+    cache.get({"id": "old"})  # refresh: now most recently used
+    one = cache.entries()[0].nbytes
+
+    evicted = cache.gc(max_bytes=2 * one + one // 2)
+    assert [e.id for e in evicted] == ["mid"]
+    assert {e.id for e in cache.entries()} == {"old", "new"}
@@ -0,0 +1,68 @@
+# tests/test_ml_datasets.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from excrypto.ml.datasets import load_xy
+
+KEYS = ["timestamp", "symbol"]
+
+
+def _merge_reference(fpath, lpath, label_col):
+    """Previous load_xy: full merge + NaN mask."""
+    df = pd.read_parquet(fpath).merge(pd.read_parquet(lpath)[KEYS + [label_col]], on=KEYS, how="inner")
+    X = df.drop(columns=KEYS + [label_col])
+    y = df[label_col]
+    keep = ~(X.isna().any(axis=1) | y.isna())
+    return X.loc[keep].reset_index(drop=True), y.loc[keep].reset_index(drop=True), df.loc[keep, KEYS].reset_index(drop=True)
+
+
+@pytest.fixture
+def tables():
+    rng = np.random.default_rng(1)
+    ts = pd.date_range("2025-01-01", periods=50, freq="h", tz="UTC")
+    keys = pd.DataFrame({"timestamp": np.repeat(ts, 3), "symbol": np.tile(["A/USDT", "B/USDT", "C/USDT"], 50)})
+    feats = keys.assign(f1=rng.normal(size=150), f2=rng.normal(size=150))
+    feats.loc[[0, 7], "f2"] = np.nan
+    labels = keys.assign(lbl_a=rng.integers(0, 2, 150).astype(float), lbl_b=rng.integers(0, 2, 150))
+    labels.loc[[3, 11], "lbl_a"] = np.nan
+    return feats, labels
+
+
+@pytest.mark.parametrize(
+    "variant, join",
+    [
+        ("aligned", "aligned"),
+        ("shuffled", "permuted"),
+        ("subset", "merge"),
+    ],
+)
+def test_load_xy_join_paths_match_merge(tables, tmp_path, variant, join):
+    feats, labels = tables
+    if variant == "shuffled":
+        labels = labels.sample(frac=1.0, random_state=0)
+    elif variant == "subset":
+        labels = labels.iloc[::2].sample(frac=1.0, random_state=0)
+    fpath, lpath = tmp_path / "f.parquet", tmp_path / "l.parquet"
+    feats.to_parquet(fpath, index=False)
+    labels.to_parquet(lpath, index=False)
+
+    xy = load_xy(str(fpath), str(lpath), label_col="lbl_a")
+    X_ref, y_ref, keys_ref = _merge_reference(fpath, lpath, "lbl_a")
+
+    assert xy.join == join
+    assert xy.X.flags.c_contiguous and xy.feature_cols == ("f1", "f2")
+    np.testing.assert_array_equal(xy.X, X_ref.to_numpy())
+    np.testing.assert_array_equal(xy.y, y_ref.to_numpy())
+    pd.testing.assert_frame_equal(xy.keys, keys_ref)
+    pd.testing.assert_frame_equal(xy.X_frame(), X_ref)
+
+
+def test_load_xy_defaults_to_last_label_column(tables, tmp_path):
+    feats, labels = tables
+    fpath, lpath = tmp_path / "f.parquet", tmp_path / "l.parquet"
+    feats.to_parquet(fpath, index=False)
+    labels.to_parquet(lpath, index=False)
+
+    xy = load_xy(str(fpath), str(lpath))
+    assert xy.label_col == "lbl_b" and len(xy.y) == 148
@@ -0,0 +1,43 @@
+# tests/test_ml_evaluate.py
+import numpy as np
+import pytest
+from sklearn.metrics import accuracy_score, average_precision_score, f1_score, precision_score, roc_auc_score
+
+from excrypto.ml.evaluate import cls_metrics, threshold_sweep
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_sweep_matches_sklearn_at_every_threshold(seed):
+    rng = np.random.default_rng(seed)
+    y = rng.integers(0, 2, 300)
+    score = np.round(rng.random(300), 2)  # plenty of ties
+    sweep = threshold_sweep(y, score)
+    assert np.all(np.diff(sweep.thresholds) < 0)
+
+    for t in np.r_[-0.1, np.linspace(0, 1, 23), 1.1]:
+        y_hat = (score >= t).astype(int)
+        at = sweep.at(t)
+        assert at["acc"] == pytest.approx(accuracy_score(y, y_hat), abs=1e-12)
+        assert at["f1"] == pytest.approx(f1_score(y, y_hat, average="macro", zero_division=0), abs=1e-12)
+        assert at["f1_pos"] == pytest.approx(f1_score(y, y_hat, zero_division=0), abs=1e-12)
+        assert at["precision"] == pytest.approx(precision_score(y, y_hat, zero_division=0), abs=1e-12)
+    assert sweep.auc() == pytest.approx(roc_auc_score(y, score), abs=1e-12)
+    assert sweep.average_precision() == pytest.approx(average_precision_score(y, score), abs=1e-12)
+
+
+def test_best_threshold_maximizes_metric():
+    rng = np.random.default_rng(0)
+    y = rng.integers(0, 2, 500)
+    score = np.clip(0.3 * y + rng.normal(0.35, 0.2, 500), 0, 1)
+    sweep = threshold_sweep(y, score)
+    best = sweep.best("f1_macro")
+    brute = max(f1_score(y, (score >= t).astype(int), average="macro") for t in np.unique(score))
+    assert best["f1"] == pytest.approx(brute, abs=1e-12)
+
+    strict = sweep.best("f1", min_precision=0.9)
+    assert strict["precision"] >= 0.9 and strict["threshold"] >= best["threshold"]
+
+
+def test_cls_metrics_single_class_fold():
+    m = cls_metrics(np.ones(5, dtype=int), np.linspace(0, 1, 5), threshold=0.5)
+    assert m["acc"] == pytest.approx(0.6) and m["auc"] is None
@@ -0,0 +1,76 @@
+# tests/test_ml_registry.py
+import json
+import os
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+from excrypto.ml.models_sklearn import SKLearnClassifier
+from excrypto.ml.registry import ModelRegistry
+from excrypto.ml.resolve import write_latest_pointer
+
+
+def _dump(path, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(200, 3))
+    SKLearnClassifier(RandomForestClassifier(n_estimators=5, random_state=seed).fit(X, X[:, 0] > 0)).save(str(path))
+    return X
+
+
+def test_registry_caches_by_path_and_mtime(tmp_path):
+    reg = ModelRegistry(max_models=2)
+    path = tmp_path / "model.joblib"
+    X = _dump(path)
+
+    first = reg.load(path)
+    assert reg.load(path) is first and (reg.hits, reg.misses) == (1, 1)
+    assert first.load_seconds >= 0 and first.mmap_mode == "r"
+    assert first.classifier.predict_score(X).shape == (200,)
+
+    _dump(path, seed=1)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))  # guarantee a new mtime
+    assert reg.load(path) is not first and reg.misses == 2
+    assert len(reg.stats()["cached"]) == 1  # the stale version was dropped
+
+    for i in range(3):
+        _dump(tmp_path / f"m{i}.joblib", seed=i)
+        reg.load(tmp_path / f"m{i}.joblib")
+    assert [c["path"] for c in reg.stats()["cached"]] == [str((tmp_path / f"m{i}.joblib").resolve()) for i in (1, 2)]
+
+
+def test_registry_resolves_manifest_and_latest_pointer(tmp_path):
+    runs_root = tmp_path / "runs"
+    base = runs_root / "snap" / "ml" / "1h" / "BTC_USDT" / "p-x"
+    base.mkdir(parents=True)
+    _dump(base / "model.joblib")
+    man_path = base / "manifest.json"
+    man_path.write_text(json.dumps({
+        "kind": "ml_model",
+        "paths": {"model": str(base / "model.joblib")},
+        "dataset": {"feature_cols": ["a", "b", "c"]},
+    }))
+    ptr = write_latest_pointer(runs_root, "snap", "ml", man_path, timeframe="1h", universe="BTC_USDT")
+
+    reg = ModelRegistry()
+    via_latest = reg.load_latest(runs_root, "snap", timeframe="1h", universe="BTC_USDT")
+    assert via_latest.feature_cols == ["a", "b", "c"] and via_latest.manifest_path == man_path
+    assert reg.resolve(ptr, runs_root=runs_root) is via_latest
+    assert reg.resolve(man_path, runs_root=runs_root) is via_latest
+    assert reg.hits == 2
+
+
+def test_fresh_load_is_a_private_writable_copy(tmp_path):
+    reg = ModelRegistry()
+    path = tmp_path / "model.joblib"
+    X = _dump(path)
+
+    shared = reg.load(path)
+    private = reg.load(path, fresh=True)
+    assert private.model is not shared.model and private.mmap_mode is None
+    assert (reg.hits, reg.misses) == (0, 1)  # fresh loads neither hit nor fill the cache
+
+    private.model.set_params(n_jobs=1)
+    assert shared.model.get_params()["n_jobs"] is None
+    assert reg.load(path).model is shared.model
+    np.testing.assert_array_equal(private.classifier.predict_score(X), shared.classifier.predict_score(X))
@@ -0,0 +1,296 @@
+# tests/test_ml_service.py
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from excrypto.compare.model_comparator import compare_oof
+from excrypto.features.builder import build_and_write_features
+from excrypto.labels.builder import build_and_write_labels, canonical_label_params
+from excrypto.ml.datasets import load_xy
+from excrypto.ml.flat_trees import flatten_run
+from excrypto.ml.models_sklearn import SKLearnClassifier
+from excrypto.ml.service import predict_signals, train_model
+from excrypto.ml.splitters import PrecomputedFolds
+from excrypto.ml.sweep import halving_budgets, run_sweep
+from excrypto.utils.paths import RunPaths
+
+SYMS = ["BTC/USDT", "ETH/USDT"]
+SPECS = [
+    {"name": "log_returns", "input_cols": ["close"], "output_col": "ret_log"},
+    {"name": "rolling_volatility", "input_cols": ["ret_log"], "output_col": "vol_10", "params": {"window": 10}},
+    {"name": "rsi", "input_cols": ["close"], "output_col": "rsi_14", "params": {"window": 14}},
+]
+
+
+@pytest.fixture
+def ml_inputs(tmp_path):
+    """Features + binary labels artifacts for a small 2-symbol panel under tmp runs/."""
+    rng = np.random.default_rng(0)
+    n = 240
+    ts = pd.date_range("2025-01-01", periods=n, freq="h", tz="UTC")
+    panel = pd.concat(
+        [pd.DataFrame({"timestamp": ts, "symbol": s, "close": 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))})
+         for s in SYMS]
+    ).sort_values(["timestamp", "symbol"], kind="stable").reset_index(drop=True)
+
+    runs_root = tmp_path / "runs"
+    feat = build_and_write_features(
+        panel, SPECS, RunPaths("snap", "features", tuple(SYMS), "1h", params={"f": 1}, runs_root=runs_root),
+        nan_policy="drop_any",
+    )
+    canon = canonical_label_params("fh", {"horizon": 4, "thr": 0.0})
+    # binary target: up (1) vs not up (0)
+    lbl_paths = RunPaths("snap", "labels", tuple(SYMS), "1h", params={"l": 1}, runs_root=runs_root)
+    lbl = build_and_write_labels(panel, canon=canon, runpaths=lbl_paths)
+    df = pd.read_parquet(lbl.labels_path)
+    df[lbl.label_col] = (df[lbl.label_col] > 0).astype(int)
+    df.to_parquet(lbl.labels_path, index=False)
+    return {"runs_root": runs_root, "features_manifest": feat.manifest_path, "labels_manifest": lbl.manifest_path}
+
+
+def _train(ml_inputs, tmp_path, cfg, **kwargs):
+    cfg_path = tmp_path / "train.yaml"
+    cfg_path.write_text(yaml.safe_dump(cfg))
+    return train_model(
+        snapshot="snap", symbols=SYMS, exchange="binance", timeframe="1h",
+        runs_root=ml_inputs["runs_root"], config=cfg_path,
+        features_manifest=ml_inputs["features_manifest"], labels_manifest=ml_inputs["labels_manifest"],
+        **kwargs,
+    )
+
+
+def test_train_model_writes_compact_folds(ml_inputs, tmp_path):
+    cfg = {"model": {"name": "rf", "params": {"n_estimators": 10}}, "split": {"n_splits": 3, "embargo": 4}}
+    res = _train(ml_inputs, tmp_path, cfg)
+    man = json.loads(res.manifest_path.read_text())
+    assert res.model_path.exists() and res.metrics_path.exists()
+
+    cv = man["cv"]
+    assert len(cv["folds"]) == 3 and all(len(f["valid"]) == 1 for f in cv["folds"])
+    replay = PrecomputedFolds.from_manifest(cv)
+    assert replay.get_n_splits() == 3
+
+    oof = pd.read_parquet(man["paths"]["oof_scores"])
+    assert list(oof.columns) == ["timestamp", "symbol", "fold", "score", "label"]
+    assert len(oof) == sum(len(range(a, b)) for f in cv["folds"] for a, b in f["valid"])
+    metrics = json.loads(res.metrics_path.read_text())
+    for k, fold in oof.groupby("fold"):
+        assert metrics["folds"][k]["n_valid"] == len(fold)
+
+    sel = man["train"]["threshold_selection"]
+    assert sel["source"] == "oof" and len(sel["per_fold"]) == 3 and oof["score"].isin([sel["selected"]]).any()
+    res = predict_signals(
+        snapshot="snap", symbols=SYMS, exchange="binance", timeframe="1h",
+        runs_root=ml_inputs["runs_root"], manifest=res.manifest_path, threshold=None,
+    )
+    assert json.loads(res.manifest_path.read_text())["params"]["threshold"] == sel["selected"]
+
+
+def test_compare_oof_reads_stored_scores(ml_inputs, tmp_path):
+    small = _train(ml_inputs, tmp_path, {"model": {"name": "rf", "params": {"n_estimators": 3}}})
+    large = _train(ml_inputs, tmp_path, {"model": {"name": "rf", "params": {"n_estimators": 15}}})
+    table = compare_oof({"small": small.manifest_path, "large": large.manifest_path}, threshold=0.5)
+    assert list(table.index) == ["small", "large"]
+    assert table["n_rows"].nunique() == 1 and ((0 <= table["roc_auc"]) & (table["roc_auc"] <= 1)).all()
+
+
+def test_parallel_folds_match_serial(ml_inputs, tmp_path):
+    cfg = {"model": {"name": "rf", "params": {"n_estimators": 10}}, "split": {"n_splits": 3, "embargo": 4}}
+    timing_keys = {"fit_seconds", "wall_seconds"}
+
+    def _folds(res):
+        metrics = json.loads(res.metrics_path.read_text())
+        return metrics, [{k: v for k, v in f.items() if k not in timing_keys} for f in metrics["folds"]]
+
+    serial, serial_folds = _folds(_train(ml_inputs, tmp_path, cfg))
+    pooled, pooled_folds = _folds(_train(ml_inputs, tmp_path, cfg, fold_workers=2))
+
+    assert pooled_folds == serial_folds
+    assert all(f["wall_seconds"] >= f["fit_seconds"] >= 0 for f in pooled["folds"])
+    assert serial["timing"]["fold_workers"] == 1 and pooled["timing"]["fold_workers"] == 2
+    assert pooled["timing"]["threads_per_worker"] >= 1
+
+
+def test_second_train_reuses_cached_xy(ml_inputs, tmp_path):
+    first = _train(ml_inputs, tmp_path, {"model": {"name": "rf", "params": {"n_estimators": 5}}})
+    second = _train(ml_inputs, tmp_path, {"model": {"name": "rf", "params": {"n_estimators": 7}}})
+    d1 = json.loads(first.manifest_path.read_text())["dataset"]
+    d2 = json.loads(second.manifest_path.read_text())["dataset"]
+
+    assert not d1["cache_hit"] and d2["cache_hit"] and d2["join"] == "cache"
+    assert d1["cache_key"] == d2["cache_key"] and d1["n_rows"] == d2["n_rows"]
+    assert d1["feature_cols"] == d2["feature_cols"]
+
+
+@pytest.mark.parametrize("model, incremental, grown", [
+    ({"name": "rf", "params": {"n_estimators": 10}}, {"new_trees": 4, "forget": {"max_trees": 12}}, 12),
+    ({"name": "lgbm", "params": {"num_boost_round": 20, "early_stopping_rounds": 5, "min_data_in_leaf": 5}},
+     {"new_trees": 5, "window": "48h", "forget": {"decay_rate": 0.5}}, None),
+])
+def test_incremental_train_warm_starts_parent(ml_inputs, tmp_path, model, incremental, grown):
+    parent = _train(ml_inputs, tmp_path, {"model": model})
+    # pretend the parent was trained on a snapshot that ended 40 hours earlier
+    p_man = json.loads(parent.manifest_path.read_text())
+    data_end = pd.Timestamp(p_man["dataset"]["data_end"])
+    p_man["dataset"]["data_end"] = (data_end - pd.Timedelta("40h")).isoformat()
+    parent.manifest_path.write_text(json.dumps(p_man))
+
+    child = _train(ml_inputs, tmp_path, {"model": model, "incremental": incremental}, parent=parent.manifest_path)
+    man = json.loads(child.manifest_path.read_text())
+    metrics = json.loads(child.metrics_path.read_text())
+    lineage = man["lineage"]
+    assert child.model_path != parent.model_path and man["cv"]["folds"] == []
+    assert lineage["parent_manifest"] == str(parent.manifest_path) and lineage["generation"] == 1
+    assert lineage["new_rows"] == 40 * len(SYMS) == metrics["incremental"]["prequential"]["n_rows"]
+    update = metrics["incremental"]["update"]
+    if grown is not None:
+        assert update["trees"] == grown and update["trees_dropped"] == 2
+    else:
+        assert lineage["window_rows"] == 48 * len(SYMS)
+        assert update["iterations"] == update["iterations_before"] + 5
+
+    # the child's data already reaches the end of the table: nothing new to learn from
+    with pytest.raises(ValueError, match="no rows after"):
+        _train(ml_inputs, tmp_path, {"model": model, "incremental": incremental}, parent=child.manifest_path)
+
+
+def test_halving_budgets():
+    assert halving_budgets(9, eta=3) == [1, 3, 9]
+    assert halving_budgets(5, eta=2) == [1, 2, 4, 5]
+    assert halving_budgets(3, eta=3, min_folds=3) == [3]
+
+
+def test_sweep_halves_and_resumes(ml_inputs, tmp_path):
+    cfg = {
+        "split": {"n_splits": 3, "embargo": 4},
+        "search": {"kind": "rf", "n_trials": 4, "seed": 1,
+                   "space": {"n_estimators": [5, 10], "max_depth": [2, 4, None]}},
+        "halving": {"eta": 2},
+    }
+    cfg_path = tmp_path / "sweep.yaml"
+    cfg_path.write_text(yaml.safe_dump(cfg))
+
+    def _sweep(**kwargs):
+        res = run_sweep(
+            snapshot="snap", symbols=SYMS, exchange="binance", timeframe="1h",
+            runs_root=ml_inputs["runs_root"], config=cfg_path,
+            features_manifest=ml_inputs["features_manifest"], labels_manifest=ml_inputs["labels_manifest"],
+            **kwargs,
+        )
+        man = json.loads(res.manifest_path.read_text())
+        rows = json.loads(res.leaderboard_path.read_text())["rows"]
+        return res, man["sweep"], [{k: v for k, v in r.items() if k != "fit_seconds"} for r in rows]
+
+    res, sweep, rows = _sweep()
+    assert [r["n_trials"] for r in sweep["rungs"]] == [4, 2, 1]
+    assert [r["evaluated"] for r in sweep["rungs"]] == [4, 2, 1]  # earlier folds are reused
+    assert rows[0]["n_folds"] == 3 and res.best["model"]["params"] == rows[0]["params"]
+
+    _, resumed, resumed_rows = _sweep()
+    assert resumed["resumed_evaluations"] == 7
+    assert all(r["evaluated"] == 0 for r in resumed["rungs"]) and resumed_rows == rows
+
+    _, pooled, pooled_rows = _sweep(workers=2, resume=False)
+    assert pooled["resumed_evaluations"] == 0 and pooled_rows == rows
+
+
+def test_lgbm_early_stops_per_fold_and_refits_on_mean_iteration(ml_inputs, tmp_path):
+    cfg = {
+        "model": {"name": "lgbm", "params": {"num_boost_round": 200, "early_stopping_rounds": 5,
+                                             "min_data_in_leaf": 5, "max_bin": 31}},
+        "split": {"n_splits": 3, "embargo": 4},
+    }
+    res = _train(ml_inputs, tmp_path, cfg)
+    metrics = json.loads(res.metrics_path.read_text())
+    iters = [f["best_iteration"] for f in metrics["folds"]]
+    assert all(1 <= i <= 200 for i in iters)
+    assert metrics["refit"]["num_boost_round"] == round(sum(iters) / len(iters))
+
+    pooled = json.loads(_train(ml_inputs, tmp_path, cfg, fold_workers=2).metrics_path.read_text())
+    assert [f["best_iteration"] for f in pooled["folds"]] == iters
+
+    man = json.loads(res.manifest_path.read_text())
+    xy = load_xy(man["inputs"]["features_path"], man["inputs"]["labels_path"], label_col=man["inputs"]["label_col"])
+    score = SKLearnClassifier.load(str(res.model_path)).predict_score(xy.X_frame())
+    assert score.shape == (len(xy.y),) and ((0 <= score) & (score <= 1)).all()
+
+
+@pytest.mark.parametrize("batch_rows, workers", [(37, 1), (50, 2)])
+def test_streaming_predict_matches_one_shot(ml_inputs, tmp_path, batch_rows, workers):
+    trained = _train(ml_inputs, tmp_path, {"model": {"name": "rf", "params": {"n_estimators": 10}}})
+
+    def _predict(**kwargs):
+        res = predict_signals(
+            snapshot="snap", symbols=SYMS, exchange="binance", timeframe="1h",
+            runs_root=ml_inputs["runs_root"], manifest=trained.manifest_path, threshold=0.5, **kwargs,
+        )
+        panel = res.signals_path.with_name("panel.parquet")
+        return pd.read_parquet(res.signals_path), pd.read_parquet(panel), json.loads(res.manifest_path.read_text())
+
+    signals, panel, _ = _predict()
+    s_signals, s_panel, man = _predict(batch_rows=batch_rows, workers=workers)
+
+    pd.testing.assert_frame_equal(s_signals, signals)
+    pd.testing.assert_frame_equal(s_panel, panel)
+    assert man["execution"]["rows"] == len(signals) and man["execution"]["batch_rows"] == batch_rows
+
+
+def test_predict_with_flattened_model_matches(ml_inputs, tmp_path):
+    trained = _train(ml_inputs, tmp_path, {"model": {"name": "rf", "params": {"n_estimators": 10}}})
+    flatten_run(trained.manifest_path, runs_root=ml_inputs["runs_root"])
+    man = json.loads(trained.manifest_path.read_text())
+    assert man["flat"]["n_trees"] == 10
+
+    def _signals(**kwargs):
+        res = predict_signals(
+            snapshot="snap", symbols=SYMS, exchange="binance", timeframe="1h",
+            runs_root=ml_inputs["runs_root"], manifest=trained.manifest_path, threshold=0.5, **kwargs,
+        )
+        return pd.read_parquet(res.signals_path)
+
+    pd.testing.assert_frame_equal(_signals(flat=True), _signals())
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("batch_rows", [None, 16])
+def test_predict_on_empty_features_writes_empty_outputs(ml_inputs, tmp_path, batch_rows, workers):
+    trained = _train(ml_inputs, tmp_path, {"model": {"name": "rf", "params": {"n_estimators": 3}}})
+    man = json.loads(trained.manifest_path.read_text())
+    features_path = man["inputs"]["features_path"]
+    pd.read_parquet(features_path).iloc[:0].to_parquet(features_path, index=False)
+
+    res = predict_signals(
+        snapshot="snap", symbols=SYMS, exchange="binance", timeframe="1h",
+        runs_root=ml_inputs["runs_root"], manifest=trained.manifest_path, threshold=0.5, batch_rows=batch_rows,
+        workers=workers,
+    )
+    signals = pd.read_parquet(res.signals_path)
+    assert signals.empty and list(signals.columns) == ["timestamp", "symbol", "score", "signal"]
+    assert pd.read_parquet(res.signals_path.with_name("panel.parquet")).empty
+    assert json.loads(res.manifest_path.read_text())["execution"]["rows"] == 0
+
+
+def test_train_and_sweep_replay_persisted_folds(ml_inputs, tmp_path):
+    first = _train(ml_inputs, tmp_path, {"model": {"name": "rf", "params": {"n_estimators": 3}},
+                                         "split": {"n_splits": 4, "purge": 2, "embargo": 6}})
+    cv = json.loads(first.manifest_path.read_text())["cv"]
+
+    replay = {"model": {"name": "rf", "params": {"n_estimators": 5}}, "split": {"folds_from": str(first.manifest_path)}}
+    second = _train(ml_inputs, tmp_path, replay)
+    assert json.loads(second.manifest_path.read_text())["cv"] == cv
+
+    cfg_path = tmp_path / "sweep.yaml"
+    cfg_path.write_text(yaml.safe_dump({
+        "split": {"folds_from": str(first.manifest_path)},
+        "search": {"kind": "rf", "n_trials": 2, "space": {"n_estimators": [3, 5]}},
+        "halving": {"eta": 2},
+    }))
+    res = run_sweep(
+        snapshot="snap", symbols=SYMS, exchange="binance", timeframe="1h",
+        runs_root=ml_inputs["runs_root"], config=cfg_path,
+        features_manifest=ml_inputs["features_manifest"], labels_manifest=ml_inputs["labels_manifest"],
+    )
+    assert json.loads(res.manifest_path.read_text())["cv"] == cv
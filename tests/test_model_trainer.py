@@ -65,3 +65,60 @@ def test_save_model_with_stub_pipeline(tmp_path, capsys):
         assert "Metadata saved to " in out and meta_path.name in out
     finally:
         trainer_module.datetime = orig_dt
+
+def test_fit_source_streams_memmap_and_reuses_binned_dataset(tmp_path):
+    from lightgbm import LGBMClassifier
+    from excrypto.training.sources import MemmapSource
+
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(3000, 4)).astype(np.float32), columns=["a", "b", "c", "d"])
+    y = pd.Series((X["a"] + rng.normal(size=3000) > 0).astype(int))
+    y.iloc[::100] = np.nan  # unlabeled rows are dropped while spooling
+    chunks = ((X.iloc[i:i + 700], y.iloc[i:i + 700]) for i in range(0, len(X), 700))
+    src = MemmapSource.from_chunks(chunks, tmp_path / "spool", chunk_rows=512)
+    assert src.n_rows == 2970 and src.feature_names == ["a", "b", "c", "d"]
+
+    params = {"n_estimators": 20, "verbosity": -1}
+    trainer = ModelTrainer(StubPipe(), TrainerConfig(output_dir=tmp_path / "models", lgbm_params=params))
+    model = trainer.fit_source(src)
+    assert not trainer.train_info["dataset_cache_hit"]
+
+    keep = y.notna()
+    ref = LGBMClassifier(random_state=42, **params).fit(X[keep], y[keep].astype(int))
+    np.testing.assert_allclose(model.predict_proba(X), ref.predict_proba(X), atol=1e-12)
+
+    again = trainer.fit_source(src)
+    assert trainer.train_info["dataset_cache_hit"]
+    np.testing.assert_array_equal(again.predict(X), model.predict(X))
+
+
+@pytest.mark.parametrize("params", [
+    {"min_child_samples": 5},
+    {"subsample_for_bin": 500},
+    {"min_child_samples": 40, "max_bin": 63, "subsample_for_bin": 1000, "feature_pre_filter": False},
+])
+def test_fit_source_accepts_leaf_and_bin_params(tmp_path, params):
+    from lightgbm import LGBMClassifier
+    from excrypto.training.sources import MemmapSource
+
+    rng = np.random.default_rng(1)
+    X = pd.DataFrame(rng.normal(size=(2000, 3)).astype(np.float32), columns=["a", "b", "c"])
+    y = pd.Series((X["a"] - X["b"] + rng.normal(size=2000) > 0).astype(int))
+    src = MemmapSource.from_chunks([(X, y)], tmp_path / "spool")
+
+    params = {"n_estimators": 10, "verbosity": -1, **params}
+    trainer = ModelTrainer(StubPipe(), TrainerConfig(output_dir=tmp_path / "models", lgbm_params=params))
+    model = trainer.fit_source(src)
+    if params.get("subsample_for_bin", len(X)) >= len(X):
+        ref = LGBMClassifier(random_state=42, **params).fit(X, y)
+        np.testing.assert_allclose(model.predict_proba(X), ref.predict_proba(X), atol=1e-12)
+    else:  # bins from a row sample: the memmap Sequence samples other rows than an in-memory array
+        assert (model.predict(X) == y).mean() > 0.7
+
+    # a different bin/leaf setting must not reuse the cached Dataset
+    other = ModelTrainer(StubPipe(), TrainerConfig(output_dir=tmp_path / "models",
+                                                   lgbm_params={**params, "min_data_in_bin": 7}))
+    other.fit_source(src)
+    assert not other.train_info["dataset_cache_hit"]
+    trainer.fit_source(src)
+    assert trainer.train_info["dataset_cache_hit"]
@@ -0,0 +1,50 @@
+# tests/test_parallel_build.py
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+
+from excrypto.features.builder import build_features_frame
+from excrypto.labels.builder import build_labels_frame, canonical_label_params
+
+SPECS = [
+    {"name": "log_returns", "input_cols": ["close"], "output_col": "ret_log"},
+    {"name": "rolling_volatility", "input_cols": ["ret_log"], "output_col": "vol_10", "params": {"window": 10}},
+    {"name": "rsi", "input_cols": ["close"], "output_col": "rsi_14", "params": {"window": 14}},
+]
+
+
+def _panel(n=120, symbols=("BTC/USDT", "ETH/USDT", "SOL/USDT"), seed=0):
+    rng = np.random.default_rng(seed)
+    ts = pd.date_range("2025-01-01", periods=n, freq="h", tz="UTC")
+    rows = []
+    for s in symbols:
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        rows.append(pd.DataFrame({"timestamp": ts, "symbol": s, "close": close}))
+    # interleaved by time, like load_snapshot output
+    return pd.concat(rows).sort_values(["timestamp", "symbol"], kind="stable").reset_index(drop=True)
+
+
+def test_features_keep_original_row_order():
+    panel = _panel()
+    out = build_features_frame(panel, SPECS)
+    pdt.assert_frame_equal(out[["timestamp", "symbol", "close"]], panel)
+    # per-symbol features must line up with their own symbol's rows
+    btc = panel[panel["symbol"] == "BTC/USDT"]
+    expected = np.log(btc["close"]).diff()
+    pdt.assert_series_equal(out.loc[btc.index, "ret_log"], expected, check_names=False)
+
+
+def test_features_workers_match_serial():
+    panel = _panel()
+    serial = build_features_frame(panel, SPECS, workers=1)
+    parallel = build_features_frame(panel, SPECS, workers=2)
+    pdt.assert_frame_equal(serial, parallel)
+
+
+def test_labels_workers_match_serial():
+    panel = _panel()
+    for kind, params in [("fh", {"horizon": 6}), ("tb", {"horizon": 6, "vol_window": 20})]:
+        canon = canonical_label_params(kind, params)
+        serial = build_labels_frame(panel, canon=canon, workers=1)
+        parallel = build_labels_frame(panel, canon=canon, workers=2)
+        pdt.assert_frame_equal(serial, parallel)
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import threading
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+from excrypto.inference import read_prediction_log
+from excrypto.serve import ScoringServer
+
+
+async def _post(port, path, payload):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode()
+    writer.write(f"POST {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, data = raw.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(data)
+
+
+def test_serve_micro_batches_and_online_features(tmp_path):
+    rng = np.random.default_rng(0)
+    cols = ["ret_log", "vol_30", "rsi_14"]
+    X = pd.DataFrame(rng.normal(size=(300, 3)), columns=cols)
+    model = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, (X["ret_log"] > 0).astype(int))
+    joblib.dump(model, tmp_path / "model.joblib")
+    specs = [
+        {"name": "log_returns", "input_cols": ["close"], "output_col": "ret_log"},
+        {"name": "rolling_volatility", "input_cols": ["ret_log"], "output_col": "vol_30", "params": {"window": 30}},
+        {"name": "rsi", "input_cols": ["close"], "output_col": "rsi_14", "params": {"window": 14}},
+    ]
+    srv = ScoringServer.from_ref(tmp_path / "model.joblib", max_wait_ms=20.0, specs=specs,
+                                 log_path=tmp_path / "serve_log.jsonl")
+    assert srv.feature_cols == cols  # from the estimator's feature_names_in_
+    log_threads = set()
+    append = srv.log.append
+    srv.log.append = lambda rec: (log_threads.add(threading.current_thread().name), append(rec))
+    rows = X.head(40).to_dict(orient="records")
+    closes = (100 + np.cumsum(rng.normal(0, 0.5, 40))).tolist()
+
+    async def scenario():
+        server = await srv.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            res = await asyncio.gather(*[_post(port, "/predict", {"rows": [r]}) for r in rows])
+            bad = await _post(port, "/predict", {"rows": [{"ret_log": 1.0}]})
+            warm = [await _post(port, "/bars", {"symbol": "BTC/USDT", "bar": {"close": c}}) for c in closes]
+            return res, bad, warm, srv.metrics()
+        finally:
+            server.close()
+            await server.wait_closed()
+            await srv.aclose()
+
+    res, bad, warm, metrics = asyncio.run(scenario())
+    assert all(status == 200 for status, _ in res)
+    np.testing.assert_allclose([out["scores"][0] for _, out in res], model.predict_proba(X.head(40))[:, 1])
+    # 40 concurrent single-row requests were coalesced
+    assert metrics["batches"] < 40 and metrics["requests"] >= 40
+    assert metrics["p50_ms"] is not None and metrics["p99_ms"] >= metrics["p50_ms"]
+    assert bad[0] == 400 and "missing features" in bad[1]["error"]
+
+    depth = srv.online.depth
+    assert depth == 31
+    assert all(not out["warm"] for _, out in warm[:depth - 1])
+    status, out = warm[-1]
+    assert status == 200 and out["warm"] and len(out["scores"]) == 1
+    # the warm ring scores exactly what full-history features would give
+    full = srv.online.pipe.transform(pd.DataFrame({"close": closes})).iloc[[-1]][cols]
+    np.testing.assert_allclose(out["scores"], model.predict_proba(full)[:, 1])
+
+    log = read_prediction_log(tmp_path / "serve_log.jsonl")
+    assert len(log) == 40 + (len(closes) - depth + 1)
+    # writes (and their periodic fsync) ran on the log thread, not the event loop
+    assert log_threads and all(t.startswith("prediction-log") for t in log_threads)
+
+
+def test_serve_cli_options_override_config(tmp_path, monkeypatch):
+    from typer.testing import CliRunner
+
+    from excrypto.serve.cli import app
+
+    seen = {}
+
+    class _Srv:
+        async def serve_forever(self, host, port):
+            seen.update(host=host, port=port)
+
+    def _from_ref(ref, **kw):
+        seen.update(ref=ref, **kw)
+        return _Srv()
+
+    monkeypatch.setattr(ScoringServer, "from_ref", staticmethod(_from_ref))
+    cfg = tmp_path / "serve.json"
+    cfg.write_text(json.dumps({"model": "m.joblib", "host": "127.0.0.1", "port": 8765,
+                               "runs_root": "runs", "max_batch": 64}))
+
+    res = CliRunner().invoke(app, ["--config", str(cfg), "--port", "9000", "--host", "0.0.0.0",
+                                   "--runs-root", str(tmp_path / "data_runs"), "--max-batch", "32"])
+    assert res.exit_code == 0, res.output
+    assert (seen["host"], seen["port"], seen["max_batch"]) == ("0.0.0.0", 9000, 32)
+    assert seen["runs_root"] == tmp_path / "data_runs"
+
+    res = CliRunner().invoke(app, ["--config", str(cfg)])
+    assert res.exit_code == 0, res.output
+    assert (seen["host"], seen["port"], seen["max_batch"]) == ("127.0.0.1", 8765, 64)
+    assert seen["runs_root"] == Path("runs")
@@ -52,3 +52,35 @@ def test_requires_tzaware_index():
     df = pd.DataFrame(index=idx, data={"x": range(10)})
     with pytest.raises(ValueError):
         build_rolling_splits(df, train="3H", valid="1H")
+
+
+def test_folds_are_compact_ranges_and_roundtrip():
+    from excrypto.data.splits import IndexRanges, SplitFold
+
+    df = _df(500)
+    folds = make_purged_kfold_indices(df, n_splits=5, embargo="10min")
+    for f in folds:
+        # at most a left and a right train block, one valid block
+        assert len(f.train_ranges.bounds) <= 2 and len(f.valid_ranges.bounds) == 1
+        assert f.train_ranges.size == f.train_idx.size
+        assert SplitFold.from_dict(f.to_dict()) == f
+
+    r = IndexRanges.from_bounds([(5, 10), (0, 3), (3, 4), (20, 20)])
+    assert r.bounds == ((0, 4), (5, 10))
+    assert r.difference(IndexRanges.from_bounds([(2, 6)])).to_indices().tolist() == [0, 1, 6, 7, 8, 9]
+
+
+def test_purged_kfold_splitter_ranges_match_arrays():
+    from excrypto.ml.splitters import PrecomputedFolds, PurgedKFold, folds_to_manifest
+
+    X = np.zeros((103, 2))
+    cv = PurgedKFold(n_splits=4, purge=3, embargo=5)
+    ranges = list(cv.split_ranges(X))
+    for (tr, te), (tr_idx, te_idx) in zip(ranges, cv.split(X)):
+        assert np.array_equal(tr.to_indices(), tr_idx) and np.array_equal(te.to_indices(), te_idx)
+        assert not np.isin(np.arange(te_idx[0] - 3, te_idx[-1] + 6), tr_idx).any()
+
+    replay = PrecomputedFolds.from_manifest(folds_to_manifest(ranges, n_rows=len(X)))
+    assert list(replay.split_ranges(X)) == ranges
+    with pytest.raises(ValueError):
+        list(replay.split_ranges(X[:-1]))